@@ -1,14 +1,27 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from collections import Counter
+import pyarrow as pa
+import pyarrow.compute as pc
+from collections import namedtuple, OrderedDict
 import re
-import requests
-from bs4 import BeautifulSoup
+import uuid
+import sys
+import os
+import threading
 import time
-from urllib.parse import urljoin
+import io
+import logging
+import cProfile
+import pstats
+from contextlib import contextmanager
+from pipeline_marche_emploi import (
+    EXPORT_EXCLUDED_COLUMNS, EXPORT_FORMATS, RAW_ARCHIVE_DIR, SCRAPE_ACTIVE_STATUSES,
+    SCRAPE_WORKER_POLL_SECONDS, JsonLogFormatter, acquire_pipeline_lock, csv_needs_sync, enqueue_scrape,
+    export_frame, get_dataset_version, frame_memory_report, get_scrape_job, list_scrape_jobs, merge_into_store,
+    prepare_frame, read_dataset_with_descriptions, release_pipeline_lock, reprocess_archive, spawn_scrape_worker,
+    sync_csv_into_dataset
+)
 
 # Configuration de la page
 st.set_page_config(
@@ -33,276 +46,70 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Configuration pour le scraping
-REQUEST_DELAY = 2  # Délai en secondes entre les requêtes
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-    'Accept-Language': 'fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7'
-}
+# Cache des résultats filtrés et des graphiques (partagé entre sessions)
+RESULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
 
-# Fonctions utilitaires pour le scraping
-def detect_work_mode(text):
-    """Détecte le type de contrat (Remote/Hybrid/On-site) depuis le texte"""
-    if not text:
-        return "Non spécifié"
-    
-    text_lower = text.lower()
-    remote_keywords = ['remote', 'télétravail', 'work from home', 'wfh', 'fully remote', '100% remote']
-    hybrid_keywords = ['hybrid', 'hybride', 'partially remote', 'flexible', '2-3 days']
-    onsite_keywords = ['on-site', 'on site', 'onsite', 'office', 'bureau', 'présentiel']
-    
-    remote_count = sum(1 for keyword in remote_keywords if keyword in text_lower)
-    hybrid_count = sum(1 for keyword in hybrid_keywords if keyword in text_lower)
-    onsite_count = sum(1 for keyword in onsite_keywords if keyword in text_lower)
-    
-    if remote_count > 0 and remote_count >= hybrid_count:
-        return "Remote"
-    elif hybrid_count > 0:
-        return "Hybrid"
-    elif onsite_count > 0:
-        return "On-site"
-    else:
-        return "Non spécifié"
-
-def extract_experience_level(text):
-    """Extrait le niveau d'expérience requis depuis le texte"""
-    if not text:
-        return "Non spécifié"
-    
-    text_lower = text.lower()
-    patterns = {
-        "Junior": [r'junior', r'entry level', r'0-2 years', r'1-2 years', r'debutant'],
-        "Mid-level": [r'mid-level', r'mid level', r'2-5 years', r'3-5 years', r'intermediate'],
-        "Senior": [r'senior', r'5\+ years', r'5+ years', r'experienced', r'expérimenté'],
-        "Lead/Principal": [r'lead', r'principal', r'staff', r'architect', r'10\+ years']
-    }
-    
-    for level, pattern_list in patterns.items():
-        for pattern in pattern_list:
-            if re.search(pattern, text_lower):
-                return level
-    
-    return "Non spécifié"
+# Colonnes lues par le dashboard (projection au chargement) ; les descriptions
+# restent sur disque, dans le fichier de descriptions de la version
+DASHBOARD_COLUMNS = (
+    'job_title', 'company_name', 'location', 'work_mode', 'experience_level',
+    'salary_min', 'salary_max', 'avg_salary', 'tech_stack_str', 'job_url', 'scraped_at'
+)
 
-def extract_tech_stack(text):
-    """Extrait les technologies mentionnées dans la description"""
-    if not text:
-        return []
-    
-    tech_keywords = {
-        'Python', 'JavaScript', 'Java', 'TypeScript', 'Go', 'Rust', 'C++', 'C#',
-        'React', 'Vue', 'Angular', 'Node.js', 'Django', 'Flask', 'FastAPI',
-        'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Terraform',
-        'PostgreSQL', 'MongoDB', 'MySQL', 'Redis', 'Elasticsearch',
-        'Git', 'CI/CD', 'Jenkins', 'GitHub Actions',
-        'Machine Learning', 'TensorFlow', 'PyTorch', 'Scikit-learn',
-        'GraphQL', 'REST API', 'Microservices', 'Kafka', 'RabbitMQ'
-    }
-    
-    found_techs = []
-    text_lower = text.lower()
-    
-    for tech in tech_keywords:
-        pattern = r'\b' + re.escape(tech.lower()) + r'\b'
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            found_techs.append(tech)
-    
-    return found_techs
-
-def extract_salary_range(text):
-    """Extrait la fourchette salariale depuis le texte"""
-    if not text:
-        return None, None
-    
-    patterns = [
-        r'\$?(\d+)[kK]?\s*-\s*\$?(\d+)[kK]?',
-        r'€?(\d+)[,.]?\d*\s*-\s*€?(\d+)[,.]?\d*',
-        r'(\d+)\s*to\s*(\d+)\s*k',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text)
-        if match:
-            try:
-                min_sal = int(match.group(1).replace(',', '').replace('.', ''))
-                max_sal = int(match.group(2).replace(',', '').replace('.', ''))
-                if min_sal < 1000:
-                    min_sal *= 1000
-                if max_sal < 1000:
-                    max_sal *= 1000
-                return min_sal, max_sal
-            except:
-                continue
-    
-    return None, None
-
-def extract_job_details_from_aijobs(url, soup=None):
-    """Extrait les détails complets d'une offre d'emploi depuis aijobs.ai"""
-    if soup is None:
-        try:
-            response = requests.get(url, headers=HEADERS, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-        except Exception as e:
-            return None
-    
-    job_data = {
-        'job_title': None,
-        'company_name': None,
-        'location': None,
-        'work_mode': None,
-        'experience_level': None,
-        'salary_min': None,
-        'salary_max': None,
-        'tech_stack': [],
-        'job_description': None,
-        'job_type': None,
-        'job_url': url
-    }
-    
-    title_elem = soup.find("div", class_="post-main-title2")
-    if title_elem:
-        job_data['job_title'] = title_elem.get_text(strip=True)
-    
-    company_elem = soup.find("span", string=lambda x: x and "at" in str(x).lower())
-    if company_elem:
-        company_span = company_elem.find_next_sibling("span")
-        if company_span:
-            job_data['company_name'] = company_span.get_text(strip=True)
-    
-    if not job_data['company_name']:
-        company_link = soup.find("a", href=re.compile(r"/company/"))
-        if company_link:
-            company_name_elem = company_link.find("span", class_="tw-card-title")
-            if company_name_elem:
-                job_data['company_name'] = company_name_elem.get_text(strip=True)
-    
-    job_type_elem = soup.find("span", class_=re.compile(r"tw-bg-\[#0BA02C\]"))
-    if job_type_elem:
-        job_data['job_type'] = job_type_elem.get_text(strip=True)
-    
-    location_elem = soup.find("div", class_="remote")
-    if location_elem:
-        location_p = location_elem.find("p", class_="tw-mb-0")
-        if location_p:
-            job_data['location'] = location_p.get_text(strip=True)
-    
-    desc_container = soup.find("div", class_="job-description-container")
-    if desc_container:
-        description_text = desc_container.get_text(separator=' ', strip=True)
-    else:
-        body = soup.find('body')
-        if body:
-            description_text = body.get_text(separator=' ', strip=True)
-        else:
-            description_text = ""
-    
-    job_data['job_description'] = description_text[:5000]
-    job_data['work_mode'] = detect_work_mode(description_text)
-    job_data['experience_level'] = extract_experience_level(description_text)
-    job_data['tech_stack'] = extract_tech_stack(description_text)
-    
-    min_sal, max_sal = extract_salary_range(description_text)
-    job_data['salary_min'] = min_sal
-    job_data['salary_max'] = max_sal
-    
-    if not min_sal and not max_sal:
-        salary_section = soup.find("div", string=re.compile(r"Salary", re.IGNORECASE))
-        if salary_section:
-            salary_text = salary_section.get_text()
-            min_sal, max_sal = extract_salary_range(salary_text)
-            job_data['salary_min'] = min_sal
-            job_data['salary_max'] = max_sal
-    
-    return job_data
+# Jeu de données chargé : DataFrame, version effectivement lue et descriptions (DescriptionStore)
+LoadedDataset = namedtuple('LoadedDataset', ['df', 'version', 'descriptions'])
 
-def collect_job_urls_from_aijobs(max_pages=3, location="United%20States"):
-    """Collecte les URLs des offres d'emploi depuis aijobs.ai"""
-    BASE_URL = "https://aijobs.ai"
-    job_urls = []
-    
-    for page_num in range(1, max_pages + 1):
-        try:
-            url = f"{BASE_URL}/engineer?location={location}&page={page_num}"
-            response = requests.get(url, headers=HEADERS, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            job_cards = soup.find_all("a", class_="jobcardStyle1")
-            page_job_urls = []
-            
-            for card in job_cards:
-                href = card.get("href")
-                if href:
-                    if href.startswith('/'):
-                        href = urljoin(BASE_URL, href)
-                    if href not in page_job_urls:
-                        page_job_urls.append(href)
-            
-            job_urls.extend(page_job_urls)
-            time.sleep(REQUEST_DELAY)
-            
-        except Exception as e:
-            continue
-    
-    return list(set(job_urls))
+def release_loaded_dataset(loaded):
+    """Ferme le fichier de descriptions d'un jeu de données retiré du cache"""
+    if loaded is not None:
+        loaded.descriptions.close()
 
-@st.cache_data
-def load_and_process_data():
-    """Charge et traite les données d'emplois"""
-    try:
-        df = pd.read_csv('data/donnees_marche_emploi.csv')
-    except FileNotFoundError:
+@st.cache_resource(max_entries=2, on_release=release_loaded_dataset)
+def load_and_process_data(columns=DASHBOARD_COLUMNS, dataset_version=None):
+    """Charge les données d'emplois depuis le stockage Parquet (colonnes projetées)
+
+    Le DataFrame est typé selon FRAME_SCHEMA (catégories, numériques réduits,
+    `tech_count` dérivé) et partagé entre sessions : il ne doit pas être modifié.
+    Les descriptions n'y figurent pas : elles sont lues dans le fichier de
+    descriptions de la version (écrit avec le stockage), indexé par position.
+    `dataset_version` (voir current_dataset_version) invalide le cache quand le stockage
+    change ; la version retournée est celle des partitions lues. Retourne None sans données.
+    """
+    df, version, descriptions = read_dataset_with_descriptions(list(columns), decode_dictionaries=False)
+    if df is None:
         return None
-    
-    # Nettoyer les données
-    df_clean = df.copy()
-    
-    # Nettoyer les salaires
-    if 'salary_min' in df_clean.columns:
-        df_clean['salary_min'] = pd.to_numeric(df_clean['salary_min'], errors='coerce')
-    if 'salary_max' in df_clean.columns:
-        df_clean['salary_max'] = pd.to_numeric(df_clean['salary_max'], errors='coerce')
-    
-    # Calculer le salaire moyen si nécessaire
-    if 'avg_salary' not in df_clean.columns or df_clean['avg_salary'].isna().all():
-        df_clean['avg_salary'] = df_clean.apply(
-            lambda row: (row['salary_min'] + row['salary_max']) / 2 
-            if pd.notna(row['salary_min']) and pd.notna(row['salary_max']) 
-            else None, axis=1
-        )
-    
-    # Nettoyer les colonnes
-    df_clean['work_mode'] = df_clean.get('work_mode', pd.Series()).fillna('Non spécifié')
-    df_clean['experience_level'] = df_clean.get('experience_level', pd.Series()).fillna('Non spécifié')
-    df_clean['location'] = df_clean.get('location', pd.Series()).fillna('Non spécifiée')
-    
-    return df_clean
+    return LoadedDataset(prepare_frame(df), version, descriptions)
 
-def process_scraped_data(jobs_list):
-    """Traite les données scrapées pour les rendre compatibles avec le dashboard"""
-    if not jobs_list:
-        return pd.DataFrame()
-    
-    df = pd.DataFrame(jobs_list)
-    
-    # Convertir tech_stack en string
-    df['tech_stack_str'] = df['tech_stack'].apply(lambda x: ', '.join(x) if isinstance(x, list) else '')
-    
-    # Calculer le salaire moyen
-    df['avg_salary'] = df.apply(
-        lambda row: (row['salary_min'] + row['salary_max']) / 2 
-        if pd.notna(row['salary_min']) and pd.notna(row['salary_max']) 
-        else None, axis=1
-    )
-    
-    # Nettoyer les colonnes
-    df['work_mode'] = df.get('work_mode', pd.Series()).fillna('Non spécifié')
-    df['experience_level'] = df.get('experience_level', pd.Series()).fillna('Non spécifié')
-    df['location'] = df.get('location', pd.Series()).fillna('Non spécifiée')
-    
-    return df
+@contextmanager
+def pipeline_lock_held():
+    """Verrou d'exécution du pipeline (cron, worker) le temps du bloc ; produit False s'il est déjà pris"""
+    acquired = acquire_pipeline_lock()
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            release_pipeline_lock()
+
+def current_dataset_version():
+    """Version du stockage, après import du CSV modifié sous le verrou d'exécution
+
+    Si une collecte détient le verrou, l'import est reporté à une prochaine exécution.
+    """
+    if csv_needs_sync():
+        with pipeline_lock_held() as locked:
+            if locked:
+                sync_csv_into_dataset()
+    return get_dataset_version()
+
+@st.cache_resource(max_entries=4)
+def get_frame_memory_report(dataset_key, _df):
+    """Empreinte mémoire du jeu de données, calculée une fois par version"""
+    report = frame_memory_report(_df)
+    get_perf_logger().info('perf.memory', extra={'fields': {
+        'dataset_key': dataset_key, 'rows': len(_df), 'bytes': int(report['bytes'].sum()),
+        'columns': report['bytes'].to_dict()
+    }})
+    return report
 
 def extract_tech_from_string(tech_str):
     """Extrait les technologies depuis une chaîne séparée par virgules"""
@@ -310,9 +117,590 @@ def extract_tech_from_string(tech_str):
         return []
     return [t.strip() for t in str(tech_str).split(',') if t.strip()]
 
-def create_work_mode_chart(df):
+# Matrice creuse offres x technologies, partagée par toutes les analyses technologiques
+TechMatrix = namedtuple('TechMatrix', ['matrix', 'techs'])
+
+def build_tech_matrix(tech_strs):
+    """Construit la matrice booléenne creuse (CSR) offres x technologies"""
+    from scipy import sparse  # Import différé : scipy n'est chargé qu'à la première construction
+    tech_strs = pd.Series(tech_strs).reset_index(drop=True)
+    exploded = tech_strs.fillna('').astype(str).str.split(',').explode().str.strip()
+    exploded = exploded[exploded != '']
+    pairs = pd.DataFrame({'row': exploded.index, 'tech': exploded.to_numpy()}).drop_duplicates()
+    codes, techs = pd.factorize(pairs['tech'], sort=True)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(codes), dtype=bool), (pairs['row'].to_numpy(), codes)),
+        shape=(len(tech_strs), len(techs))
+    )
+    return TechMatrix(matrix, list(techs))
+
+@st.cache_resource(max_entries=4)
+def get_tech_matrix(dataset_key, _tech_strs):
+    """Matrice des technologies mise en cache avec le jeu de données (clé de version)"""
+    return build_tech_matrix(_tech_strs)
+
+def tech_matrix_rows(tech_matrix, positions):
+    """Restreint la matrice aux offres d'indices positionnels donnés"""
+    return TechMatrix(tech_matrix.matrix[positions], tech_matrix.techs)
+
+def tech_counts_per_job(tech_matrix):
+    """Nombre de technologies par offre (somme des lignes)"""
+    return np.asarray(tech_matrix.matrix.sum(axis=1)).ravel()
+
+def job_counts_per_tech(tech_matrix):
+    """Nombre d'offres par technologie (somme des colonnes)"""
+    return np.asarray(tech_matrix.matrix.sum(axis=0)).ravel()
+
+def jobs_with_any_tech(tech_matrix, selected_techs):
+    """Masque des offres mentionnant au moins une des technologies sélectionnées"""
+    columns = [tech_matrix.techs.index(tech) for tech in selected_techs if tech in tech_matrix.techs]
+    if not columns:
+        return np.zeros(tech_matrix.matrix.shape[0], dtype=bool)
+    return np.asarray(tech_matrix.matrix[:, columns].sum(axis=1)).ravel() > 0
+
+def _resolve_tech_matrix(df, tech_matrix):
+    """Utilise la matrice fournie (alignée sur df) ou la construit à la volée"""
+    if tech_matrix is not None:
+        return tech_matrix
+    return build_tech_matrix(df['tech_stack_str'])
+
+# Index inversé (mot -> offres) pour la recherche textuelle
+SEARCH_COLUMNS = ('job_title', 'company_name', 'job_description')
+SEARCH_TOKEN_RE = re.compile(r'\w+')
+SEARCH_TOKEN_SEPARATOR = r'[^\p{L}\p{N}_]+'  # Complément de \w (syntaxe RE2 de pyarrow.compute)
+SEARCH_INDEX_CHUNK_ROWS = 8192  # Lignes découpées en mots à la fois (sans fichier de descriptions)
+SearchIndex = namedtuple('SearchIndex', ['vocab', 'offsets', 'postings', 'n_rows'])
+SEARCH_INDEX_MAX_VERSIONS = 4  # Index conservés (versions du jeu de données)
+
+def _arrow_text(values):
+    """Colonne texte (chaînes ou catégories) en tableau Arrow de chaînes"""
+    array = pa.Array.from_pandas(values)
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+    return array.cast(pa.string())
+
+def _unique_row_tokens(texts, first_row):
+    """Mots distincts de chaque texte : (mots en tableau Arrow, position de la ligne de chacun)"""
+    words = pc.split_pattern_regex(pc.utf8_lower(texts), SEARCH_TOKEN_SEPARATOR)
+    tokens = pc.list_flatten(words)
+    rows = pc.list_parent_indices(words).to_numpy().astype(np.int64)
+    keep = pc.not_equal(tokens, '')  # Séparateurs en début ou fin de texte
+    encoded = tokens.filter(keep).dictionary_encode()
+    n_words = max(len(encoded.dictionary), 1)
+    pairs = pd.unique(rows[keep.to_numpy(zero_copy_only=False)] * n_words + encoded.indices.to_numpy())
+    return encoded.dictionary.take(pa.array(pairs % n_words)), pairs // n_words + first_row
+
+def build_search_index(df, columns=SEARCH_COLUMNS, description_store=None):
+    """Construit l'index inversé des mots des colonnes texte
+
+    `vocab` est le vocabulaire trié, `postings[offsets[i]:offsets[i + 1]]`
+    les positions (triées) des offres contenant le mot `vocab[i]`. Les mots
+    sont ceux de SEARCH_TOKEN_RE, découpés par lots avec pyarrow.compute.
+    Les descriptions absentes de `df` sont lues lot par lot dans `description_store`.
+    """
+    columns = [col for col in columns if col in df.columns]
+    arrays = [_arrow_text(df[col]) for col in columns]
+    if description_store is not None and 'job_description' not in columns:
+        extra_batches = description_store.iter_batches()
+    else:
+        extra_batches = (None for _ in range(0, len(df), SEARCH_INDEX_CHUNK_ROWS))
+    
+    tokens = []
+    rows = []
+    start = 0
+    for extra in extra_batches:
+        size = len(extra) if extra is not None else min(SEARCH_INDEX_CHUNK_ROWS, len(df) - start)
+        parts = [array.slice(start, size) for array in arrays] + ([extra] if extra is not None else [])
+        if not parts:
+            break
+        texts = pc.binary_join_element_wise(*parts, ' ', null_handling='replace', null_replacement='')
+        chunk_tokens, chunk_rows = _unique_row_tokens(texts, start)
+        tokens.append(chunk_tokens)
+        rows.append(chunk_rows)
+        start += size
+    
+    # Codes des mots dans le vocabulaire trié, puis tri des couples (mot, ligne)
+    encoded = pa.concat_arrays(tokens or [pa.array([], type=pa.string())]).dictionary_encode()
+    order = pc.sort_indices(encoded.dictionary).to_numpy()
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(len(order))
+    n_rows = max(len(df), 1)
+    pairs = np.sort(ranks[encoded.indices.to_numpy()] * n_rows + (np.concatenate(rows) if rows else 0))
+    codes = pairs // n_rows
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(order)))])
+    vocab = np.asarray(encoded.dictionary.take(pa.array(order)).to_pylist(), dtype=object)
+    return SearchIndex(vocab, offsets, (pairs % n_rows).astype(np.int32), len(df))
+
+@st.cache_resource(max_entries=SEARCH_INDEX_MAX_VERSIONS)
+def get_search_index(dataset_key, _df, _description_store=None):
+    """Index de recherche, construit à la première recherche puis mis en cache par version"""
+    return build_search_index(_df, description_store=_description_store)
+
+def search_index_lookup(index, query):
+    """Positions des offres contenant tous les mots de la requête (préfixes acceptés)"""
+    terms = SEARCH_TOKEN_RE.findall(query.lower())
+    result = None
+    for term in terms:
+        # Tous les mots du vocabulaire commençant par le terme (recherche par préfixe)
+        start = np.searchsorted(index.vocab, term, side='left')
+        end = np.searchsorted(index.vocab, term + '\U0010ffff', side='left')
+        if start == end:
+            return np.array([], dtype=np.int32)
+        if end - start == 1:
+            matches = index.postings[index.offsets[start]:index.offsets[end]]
+        else:
+            matches = np.unique(index.postings[index.offsets[start]:index.offsets[end]])
+        result = matches if result is None else np.intersect1d(result, matches, assume_unique=True)
+        if result.size == 0:
+            break
+    if result is None:
+        return np.arange(index.n_rows, dtype=np.int32)
+    return result
+
+# Moteur de filtres : index par valeur (catégories) et index triés (numériques)
+FILTER_CATEGORICAL_COLUMNS = ('work_mode', 'experience_level', 'location')
+FILTER_NUMERIC_COLUMNS = {'avg_salary': True, 'tech_count': False}  # colonne -> conserver les valeurs manquantes
+FilterIndex = namedtuple('FilterIndex', ['n_rows', 'categorical', 'numeric'])
+CategoricalFilter = namedtuple('CategoricalFilter', ['codes', 'categories', 'order', 'offsets'])
+NumericFilter = namedtuple('NumericFilter', ['values', 'order', 'sorted_values', 'na_positions', 'keep_na'])
+
+def build_filter_index(df, tech_counts=None):
+    """Construit les index de filtrage d'un jeu de données
+
+    Colonnes catégorielles : codes par ligne et liste triée des positions de
+    chaque valeur. Colonnes numériques : positions triées par valeur.
+    """
+    categorical = {}
+    for col in FILTER_CATEGORICAL_COLUMNS:
+        if col not in df.columns:
+            continue
+        codes, categories = pd.factorize(df[col], sort=True)
+        order = np.argsort(codes, kind='stable').astype(np.int32)
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(codes[codes >= 0], minlength=len(categories)))])
+        offsets += np.count_nonzero(codes < 0)  # Valeurs manquantes (code -1) en tête de `order`
+        categorical[col] = CategoricalFilter(codes, list(categories), order, offsets)
+    
+    numeric = {}
+    numeric_values = {col: df[col] for col in FILTER_NUMERIC_COLUMNS if col in df.columns}
+    if tech_counts is not None:
+        numeric_values['tech_count'] = tech_counts
+    for col, values in numeric_values.items():
+        values = np.asarray(values, dtype=float)
+        is_na = np.isnan(values)
+        present = np.flatnonzero(~is_na)
+        order = present[np.argsort(values[present], kind='stable')].astype(np.int32)
+        numeric[col] = NumericFilter(values, order, values[order], np.flatnonzero(is_na), FILTER_NUMERIC_COLUMNS[col])
+    
+    return FilterIndex(len(df), categorical, numeric)
+
+@st.cache_resource(max_entries=4)
+def get_filter_index(dataset_key, _df, _tech_counts=None):
+    """Index de filtrage mis en cache par version du jeu de données"""
+    return build_filter_index(_df, _tech_counts)
+
+def _equals_filter(index, col, value):
+    """(taille, candidats, test) pour un filtre d'égalité sur une colonne catégorielle"""
+    column = index.categorical[col]
+    if value not in column.categories:
+        return 0, lambda: np.array([], dtype=np.int32), lambda positions: positions[:0]
+    code = column.categories.index(value)
+    start, end = column.offsets[code], column.offsets[code + 1]
+    return (end - start,
+            lambda: column.order[start:end],
+            lambda positions: column.codes[positions] == code)
+
+def _range_filter(index, col, low, high):
+    """(taille, candidats, test) pour un filtre d'intervalle sur une colonne numérique"""
+    column = index.numeric[col]
+    start = np.searchsorted(column.sorted_values, low, side='left')
+    end = np.searchsorted(column.sorted_values, high, side='right')
+    size = end - start + (len(column.na_positions) if column.keep_na else 0)
+    
+    def candidates():
+        positions = column.order[start:end]
+        if column.keep_na:
+            positions = np.concatenate([positions, column.na_positions])
+        return np.sort(positions)
+    
+    def check(positions):
+        values = column.values[positions]
+        in_range = (values >= low) & (values <= high)
+        return in_range | np.isnan(values) if column.keep_na else in_range
+    
+    return size, candidates, check
+
+def filter_positions(index, equals=None, ranges=None, candidates=None, masks=()):
+    """Intersecte tous les filtres actifs en un seul tableau de positions (trié)
+
+    `equals` : {colonne: valeur}, `ranges` : {colonne: (min, max)},
+    `candidates` : positions déjà retenues (ex: recherche), `masks` : masques booléens.
+    On part du filtre le plus sélectif puis on teste les autres sur ses seules lignes.
+    """
+    filters = []
+    for col, value in (equals or {}).items():
+        filters.append(_equals_filter(index, col, value))
+    for col, (low, high) in (ranges or {}).items():
+        filters.append(_range_filter(index, col, low, high))
+    if candidates is not None:
+        candidates = np.asarray(candidates)
+        
+        def candidates_check(positions, candidates=candidates):
+            mask = np.zeros(index.n_rows, dtype=bool)
+            mask[candidates] = True
+            return mask[positions]
+        
+        filters.append((len(candidates), lambda candidates=candidates: candidates, candidates_check))
+    for mask in masks:
+        filters.append((
+            np.count_nonzero(mask),
+            lambda mask=mask: np.flatnonzero(mask),
+            lambda positions, mask=mask: mask[positions]
+        ))
+    
+    if not filters:
+        return np.arange(index.n_rows)
+    
+    filters.sort(key=lambda f: f[0])
+    positions = filters[0][1]()
+    for _, _, check in filters[1:]:
+        if positions.size == 0:
+            break
+        positions = positions[check(positions)]
+    return positions
+
+# Cube OLAP pré-agrégé : type de contrat x niveau d'expérience x localisation
+CUBE_DIMENSIONS = ('work_mode', 'experience_level', 'location')
+OlapCube = namedtuple('OlapCube', ['cells', 'salary_values', 'salary_sketch'])
+
+def build_olap_cube(df):
+    """Agrège les offres par cellule (contrat, niveau, localisation)
+
+    Chaque cellule porte son nombre d'offres et un histogramme exact des
+    salaires (matrice creuse cellules x valeurs distinctes), fusionnable par
+    simple addition : toute combinaison de filtres catégoriels se calcule en
+    sommant des cellules.
+    """
+    from scipy import sparse
+    dim_codes = []
+    dim_values = []
+    for dim in CUBE_DIMENSIONS:
+        codes, values = pd.factorize(df[dim])
+        dim_codes.append(codes)
+        dim_values.append(np.asarray(values, dtype=object))
+    shape = tuple(max(len(values), 1) for values in dim_values)
+    cell_keys, cell_ids = np.unique(np.ravel_multi_index(dim_codes, shape), return_inverse=True)
+    cell_ids = cell_ids.ravel()
+    cells = pd.DataFrame({
+        dim: values[codes]
+        for dim, values, codes in zip(CUBE_DIMENSIONS, dim_values, np.unravel_index(cell_keys, shape))
+    })
+    cells['count'] = np.bincount(cell_ids, minlength=len(cells))
+    
+    salaries = df['avg_salary'].to_numpy(dtype=float) if 'avg_salary' in df.columns else np.full(len(df), np.nan)
+    has_salary = ~np.isnan(salaries)
+    salary_codes, salary_values = pd.factorize(salaries[has_salary], sort=True)
+    salary_sketch = sparse.csr_matrix(
+        (np.ones(len(salary_codes), dtype=np.int64), (cell_ids[has_salary], salary_codes)),
+        shape=(len(cells), len(salary_values))
+    )
+    return OlapCube(cells, np.asarray(salary_values, dtype=float), salary_sketch)
+
+@st.cache_resource(max_entries=4)
+def get_olap_cube(dataset_key, _df):
+    """Cube OLAP mis en cache par version du jeu de données"""
+    return build_olap_cube(_df)
+
+# Agrégats des offres filtrées, mis en cache avec les résultats filtrés (même clé de filtres)
+FilterAggregates = namedtuple('FilterAggregates', [
+    'filtered_cube', 'full_salary_stats', 'filtered_salary_stats', 'work_mode_counts',
+    'salary_by_work_mode_stats', 'salary_by_experience_stats'
+])
+
+def rollup_cube(cube, equals=None):
+    """Restreint le cube aux cellules correspondant aux filtres catégoriels"""
+    mask = np.ones(len(cube.cells), dtype=bool)
+    for col, value in (equals or {}).items():
+        mask &= (cube.cells[col] == value).to_numpy()
+    return OlapCube(cube.cells[mask].reset_index(drop=True), cube.salary_values, cube.salary_sketch[mask])
+
+def cube_counts(cube, dim):
+    """Nombre d'offres par valeur d'une dimension, trié par ordre décroissant"""
+    counts = cube.cells.groupby(dim, sort=False)['count'].sum()
+    counts = counts[counts > 0].sort_values(ascending=False, kind='stable')
+    counts.index.name = dim
+    counts.name = 'count'
+    return counts
+
+def _histogram_quantile(values, cumulative, q):
+    """Quantile (interpolation linéaire, comme numpy) d'un histogramme exact"""
+    rank = q * (cumulative[-1] - 1)
+    low = values[np.searchsorted(cumulative, np.floor(rank), side='right')]
+    high = values[np.searchsorted(cumulative, np.ceil(rank), side='right')]
+    return low + (high - low) * (rank - np.floor(rank))
+
+def _histogram_stats(values, counts):
+    """Statistiques de boîte à moustaches d'un histogramme exact de salaires"""
+    present = counts > 0
+    values, counts = values[present], counts[present]
+    cumulative = np.cumsum(counts)
+    total = cumulative[-1]
+    mean = float(values @ counts) / total
+    q1, median, q3 = (_histogram_quantile(values, cumulative, q) for q in (0.25, 0.5, 0.75))
+    iqr = q3 - q1
+    within = (values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)
+    return {
+        'count': int(total),
+        'mean': mean,
+        'sd': float(np.sqrt(((values - mean) ** 2) @ counts / total)),
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'lowerfence': values[within].min(),
+        'upperfence': values[within].max(),
+    }
+
+def cube_salary_stats(cube, dim=None):
+    """Statistiques de salaire par valeur d'une dimension (ou globales si dim est None)"""
+    from scipy import sparse
+    if dim is None:
+        groups = pd.Series(0, index=cube.cells.index)
+    else:
+        groups = cube.cells[dim]
+    group_codes, group_values = pd.factorize(groups)
+    indicator = sparse.csr_matrix(
+        (np.ones(len(group_codes), dtype=np.int64), (group_codes, np.arange(len(group_codes)))),
+        shape=(len(group_values), len(group_codes))
+    )
+    histograms = (indicator @ cube.salary_sketch).toarray()
+    
+    stats = {
+        value: _histogram_stats(cube.salary_values, histogram)
+        for value, histogram in zip(group_values, histograms)
+        if histogram.sum() > 0
+    }
+    return pd.DataFrame.from_dict(stats, orient='index')
+
+def _create_salary_box_from_stats(stats, order, title, x_label, color_map):
+    """Crée des boîtes à moustaches à partir de statistiques pré-agrégées"""
+    import plotly.graph_objects as go
+    fig = go.Figure()
+    for category in [x for x in order if x in stats.index]:
+        row = stats.loc[category]
+        fig.add_trace(go.Box(
+            name=category,
+            x=[category],
+            q1=[row['q1']], median=[row['median']], q3=[row['q3']],
+            lowerfence=[row['lowerfence']], upperfence=[row['upperfence']],
+            mean=[row['mean']], sd=[row['sd']],
+            marker_color=color_map.get(category),
+            hovertemplate='<b>%{x}</b><br>Salaire: €%{y:,.0f}<extra></extra>'
+        ))
+    fig.update_layout(
+        title=title,
+        xaxis_title=x_label,
+        yaxis_title='Salaire Moyen (€)',
+        font=dict(family="Arial, sans-serif", size=12),
+        title_font=dict(size=18, color='#1F2937'),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(showgrid=False),
+        yaxis=dict(showgrid=True, gridcolor='rgba(0,0,0,0.1)', tickformat='€,.0f'),
+        showlegend=False,
+        height=450
+    )
+    return fig
+
+# Cache LRU des résultats filtrés et des graphiques, clé = (version des données, filtres, élément)
+class LRUCache:
+    """Cache LRU borné par la taille estimée (en octets) de ses entrées"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """Retourne la valeur en cache ou la calcule, l'insère et évince les plus anciennes"""
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+            self.misses += 1
+        
+        value = compute()
+        size = estimate_size(value)
+        with self.lock:
+            if key in self.entries:
+                self.current_bytes -= self.entries.pop(key)[1]
+            if size <= self.max_bytes:
+                self.entries[key] = (value, size)
+                self.current_bytes += size
+                while self.current_bytes > self.max_bytes:
+                    _, (_, evicted_size) = self.entries.popitem(last=False)
+                    self.current_bytes -= evicted_size
+                    self.evictions += 1
+        return value
+
+    def stats(self):
+        """Compteurs du cache (succès, échecs, évictions, taille)"""
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self.entries),
+                'bytes': self.current_bytes
+            }
+
+# Estimation de la taille d'une figure sans la sérialiser : tableaux de données des traces + forfait
+FIGURE_DATA_PROPERTIES = ('x', 'y', 'z', 'text', 'customdata', 'hovertext')
+FIGURE_BASE_BYTES = 4 * 1024  # Mise en page, styles et options d'une figure
+
+def _figure_size(fig):
+    """Taille estimée d'une figure Plotly : tableaux de données de ses traces et forfait de mise en page"""
+    size = FIGURE_BASE_BYTES
+    for trace in fig.data:
+        for prop in FIGURE_DATA_PROPERTIES:
+            value = trace[prop] if prop in trace else None
+            if isinstance(value, np.ndarray):
+                size += value.nbytes
+            elif isinstance(value, (list, tuple)):
+                nested = len(value) > 0 and isinstance(value[0], (list, tuple, np.ndarray))
+                size += 8 * (sum(len(row) for row in value) if nested else len(value))
+    return size
+
+def estimate_size(value):
+    """Estime la taille mémoire (octets) d'une valeur mise en cache"""
+    if value is None:
+        return 0
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(np.sum(value.memory_usage(index=True)))
+    if isinstance(value, tuple):
+        return sum(estimate_size(item) for item in value)
+    if hasattr(value, 'nnz'):  # Matrice creuse (scipy)
+        return value.data.nbytes + value.indices.nbytes + value.indptr.nbytes
+    # Plotly n'est importé qu'au premier graphique : pas de figure possible avant
+    go = sys.modules.get('plotly.graph_objects')
+    if go is not None and isinstance(value, go.Figure):
+        return _figure_size(value)
+    return sys.getsizeof(value)
+
+@st.cache_resource
+def get_result_cache():
+    """Cache de résultats unique pour le processus (partagé entre sessions)"""
+    return LRUCache(RESULT_CACHE_MAX_BYTES)
+
+def normalize_filter_state(search_query, equals, ranges, selected_techs):
+    """Tuple canonique (hachable) des filtres actifs, indépendant de l'ordre de saisie"""
+    return (
+        search_query.strip() != '',
+        tuple(sorted(set(SEARCH_TOKEN_RE.findall(search_query.lower())))),
+        tuple(sorted(equals.items())),
+        tuple(sorted((col, (float(low), float(high))) for col, (low, high) in ranges.items())),
+        tuple(sorted(selected_techs)),
+    )
+
+# Chronométrage des étapes d'une exécution : panneau « Performance » et lignes JSON
+PERF_LOG_FILE = 'data/perf.log'
+PERF_PROFILE_TOP_N = 25  # Fonctions affichées dans le profil cProfile
+
+class StageTimer:
+    """Durées (ms) des étapes d'une exécution du dashboard, avec profil cProfile optionnel"""
+
+    def __init__(self, profile=False):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.stages = []
+        self.started = time.perf_counter()
+        self.total_ms = None
+        self.profiler = cProfile.Profile() if profile else None
+        self.memory_report = None  # Empreinte du jeu de données affiché (frame_memory_report)
+
+    @contextmanager
+    def stage(self, name):
+        """Chronomètre le bloc et enregistre sa durée sous `name`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, (time.perf_counter() - start) * 1000))
+
+    def start_profiling(self):
+        """Active cProfile ; un seul profileur peut être actif à la fois dans le processus"""
+        if self.profiler is None:
+            return
+        try:
+            self.profiler.enable()
+        except ValueError:
+            self.profiler = None
+
+    def finish(self):
+        """Arrête le profileur et fige la durée totale de l'exécution"""
+        if self.profiler is not None:
+            self.profiler.disable()
+        self.total_ms = (time.perf_counter() - self.started) * 1000
+
+    def emit(self, logger):
+        """Écrit une ligne JSON par étape, puis une ligne pour l'exécution complète"""
+        for name, elapsed_ms in self.stages:
+            logger.info('perf.stage', extra={'fields': {
+                'run_id': self.run_id, 'stage': name, 'ms': round(elapsed_ms, 2)
+            }})
+        logger.info('perf.run', extra={'fields': {
+            'run_id': self.run_id, 'total_ms': round(self.total_ms, 2),
+            'stages': len(self.stages), 'profiled': self.profiler is not None
+        }})
+
+    def profile_report(self, top_n=PERF_PROFILE_TOP_N):
+        """Fonctions les plus coûteuses (temps cumulé) du profil cProfile, ou None"""
+        if self.profiler is None:
+            return None
+        stream = io.StringIO()
+        pstats.Stats(self.profiler, stream=stream).sort_stats('cumulative').print_stats(top_n)
+        return stream.getvalue()
+
+@st.cache_resource
+def get_perf_logger(log_file=PERF_LOG_FILE):
+    """Logger des mesures de performance (lignes JSON ajoutées à `log_file`)"""
+    os.makedirs(os.path.dirname(log_file) or '.', exist_ok=True)
+    perf_logger = logging.getLogger('tableau_bord_marche_emploi.perf')
+    handler = logging.FileHandler(log_file, encoding='utf-8')
+    handler.setFormatter(JsonLogFormatter())
+    perf_logger.addHandler(handler)
+    perf_logger.setLevel(logging.INFO)
+    perf_logger.propagate = False
+    return perf_logger
+
+def render_performance_panel(timer):
+    """Panneau latéral « Performance » : durées par étape et profil cProfile optionnel"""
+    with st.sidebar.expander("⏱️ Performance", expanded=False):
+        stages = pd.DataFrame(timer.stages, columns=['Étape', 'ms'])
+        stages['ms'] = stages['ms'].round(1)
+        st.dataframe(stages.sort_values('ms', ascending=False), hide_index=True, use_container_width=True)
+        st.caption(f"Total : {timer.total_ms:,.0f} ms — exécution {timer.run_id} (détail dans `{PERF_LOG_FILE}`)")
+        st.checkbox(
+            "Profiler les exécutions (cProfile)",
+            key='perf_profile',
+            help="Capture un profil cProfile à chaque exécution tant que la case est cochée"
+        )
+        if timer.memory_report is not None:
+            memory = timer.memory_report.assign(Mo=(timer.memory_report['bytes'] / 1e6).round(2))
+            st.caption(f"Jeu de données : {memory['Mo'].sum():,.1f} Mo en mémoire (partagé entre sessions)")
+            st.dataframe(memory[['dtype', 'Mo']], use_container_width=True)
+        report = timer.profile_report()
+        if report:
+            st.code(report, language=None)
+
+def create_work_mode_chart(df, counts=None):
     """Crée un graphique de la distribution des types de contrats"""
-    work_mode_counts = df['work_mode'].value_counts()
+    import plotly.express as px
+    work_mode_counts = counts if counts is not None else df['work_mode'].value_counts()
     
     # Palette de couleurs moderne
     colors = ['#6366F1', '#8B5CF6', '#EC4899', '#F59E0B', '#10B981']
@@ -340,9 +728,10 @@ def create_work_mode_chart(df):
     )
     return fig
 
-def create_experience_level_chart(df):
+def create_experience_level_chart(df, counts=None):
     """Crée un graphique de la distribution par niveau d'expérience"""
-    exp_counts = df['experience_level'].value_counts()
+    import plotly.express as px
+    exp_counts = counts if counts is not None else df['experience_level'].value_counts()
     
     # Ordre logique des niveaux
     order = ['Junior', 'Mid-level', 'Senior', 'Lead/Principal', 'Non spécifié']
@@ -373,15 +762,15 @@ def create_experience_level_chart(df):
     )
     return fig
 
-def create_salary_by_work_mode(df):
-    """Crée un graphique des salaires par type de contrat"""
+def create_salary_by_work_mode(df, salary_stats=None):
+    """Crée un graphique des salaires par type de contrat
+
+    `salary_stats` (voir cube_salary_stats) évite de reparcourir les lignes.
+    """
+    import plotly.express as px
     if 'avg_salary' not in df.columns:
         return None
     
-    salary_data = df[df['avg_salary'].notna()].copy()
-    if salary_data.empty:
-        return None
-    
     # Palette de couleurs moderne
     color_map = {
         'Remote': '#6366F1',
@@ -390,6 +779,18 @@ def create_salary_by_work_mode(df):
         'Non spécifié': '#94A3B8'
     }
     
+    if salary_stats is not None:
+        if salary_stats.empty:
+            return None
+        return _create_salary_box_from_stats(
+            salary_stats, list(salary_stats.index),
+            'Distribution des Salaires par Type de Contrat', 'Type de Contrat', color_map
+        )
+    
+    salary_data = df[df['avg_salary'].notna()].copy()
+    if salary_data.empty:
+        return None
+    
     fig = px.box(
         salary_data,
         x='work_mode',
@@ -415,23 +816,17 @@ def create_salary_by_work_mode(df):
     )
     return fig
 
-def create_salary_by_experience(df):
-    """Crée un graphique des salaires par niveau d'expérience"""
+def create_salary_by_experience(df, salary_stats=None):
+    """Crée un graphique des salaires par niveau d'expérience
+
+    `salary_stats` (voir cube_salary_stats) évite de reparcourir les lignes.
+    """
+    import plotly.express as px
     if 'avg_salary' not in df.columns:
         return None
     
-    salary_data = df[df['avg_salary'].notna()].copy()
-    if salary_data.empty:
-        return None
-    
     # Ordre logique
     order = ['Junior', 'Mid-level', 'Senior', 'Lead/Principal']
-    salary_data['experience_level'] = pd.Categorical(
-        salary_data['experience_level'], 
-        categories=[x for x in order if x in salary_data['experience_level'].unique()],
-        ordered=True
-    )
-    salary_data = salary_data.sort_values('experience_level')
     
     # Palette de couleurs dégradée moderne
     color_map = {
@@ -441,6 +836,25 @@ def create_salary_by_experience(df):
         'Lead/Principal': '#EC4899'
     }
     
+    if salary_stats is not None:
+        if salary_stats.empty:
+            return None
+        return _create_salary_box_from_stats(
+            salary_stats, order,
+            'Distribution des Salaires par Niveau d\'Expérience', 'Niveau d\'Expérience', color_map
+        )
+    
+    salary_data = df[df['avg_salary'].notna()].copy()
+    if salary_data.empty:
+        return None
+    
+    salary_data['experience_level'] = pd.Categorical(
+        salary_data['experience_level'], 
+        categories=[x for x in order if x in salary_data['experience_level'].unique()],
+        ordered=True
+    )
+    salary_data = salary_data.sort_values('experience_level')
+    
     fig = px.box(
         salary_data,
         x='experience_level',
@@ -466,23 +880,19 @@ def create_salary_by_experience(df):
     )
     return fig
 
-def create_top_tech_chart(df, top_n=15):
+def create_top_tech_chart(df, top_n=15, tech_matrix=None):
     """Crée un graphique des technologies les plus recherchées"""
+    import plotly.express as px
     if 'tech_stack_str' not in df.columns:
         return None
     
-    all_techs = []
-    for tech_str in df['tech_stack_str'].dropna():
-        techs = extract_tech_from_string(tech_str)
-        all_techs.extend(techs)
-    
-    if not all_techs:
+    tech_matrix = _resolve_tech_matrix(df, tech_matrix)
+    techs_df = pd.DataFrame({'Technology': tech_matrix.techs, 'Count': job_counts_per_tech(tech_matrix)})
+    techs_df = techs_df[techs_df['Count'] > 0]
+    if techs_df.empty:
         return None
     
-    tech_counter = Counter(all_techs)
-    top_techs = tech_counter.most_common(top_n)
-    
-    techs_df = pd.DataFrame(top_techs, columns=['Technology', 'Count'])
+    techs_df = techs_df.sort_values('Count', ascending=False, kind='stable').head(top_n)
     
     fig = px.bar(
         techs_df,
@@ -511,9 +921,10 @@ def create_top_tech_chart(df, top_n=15):
     )
     return fig
 
-def create_location_chart(df, top_n=10):
+def create_location_chart(df, top_n=10, counts=None):
     """Crée un graphique des localisations les plus fréquentes"""
-    location_counts = df['location'].value_counts().head(top_n)
+    import plotly.express as px
+    location_counts = (counts if counts is not None else df['location'].value_counts()).head(top_n)
     
     fig = px.bar(
         x=location_counts.values,
@@ -541,30 +952,55 @@ def create_location_chart(df, top_n=10):
     )
     return fig
 
-def create_salary_distribution(df):
-    """Crée un histogramme de la distribution des salaires"""
+# Graphiques grands volumes : taille du JSON envoyé au navigateur bornée quel que soit le nombre d'offres
+SALARY_HISTOGRAM_BINS = 25
+SCATTER_MAX_POINTS = 5000  # Au-delà : échantillon stratifié rendu en WebGL (Scattergl)
+SCATTER_SAMPLE_SEED = 0
+
+def stratified_sample_positions(strata, max_points, seed=SCATTER_SAMPLE_SEED):
+    """Positions (triées) d'un échantillon d'au plus ~`max_points` lignes, stratifié par `strata`
+
+    Chaque strate garde une part proportionnelle à sa taille, et au moins une
+    ligne : les groupes rares restent visibles. Tirage reproductible (`seed`).
+    """
+    _, groups, counts = np.unique(np.asarray(strata), return_inverse=True, return_counts=True)
+    n_rows = len(groups)
+    if n_rows <= max_points:
+        return np.arange(n_rows)
+    quotas = np.maximum(1, counts * max_points // n_rows)
+    # Rang aléatoire de chaque ligne dans sa strate ; on garde les `quota` premières
+    order = np.lexsort((np.random.default_rng(seed).random(n_rows), groups))
+    group_starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    ranks = np.arange(n_rows) - group_starts[groups[order]]
+    return np.sort(order[ranks < quotas[groups[order]]])
+
+def create_salary_distribution(df, nbins=SALARY_HISTOGRAM_BINS):
+    """Crée un histogramme de la distribution des salaires (classes calculées côté serveur)"""
+    import plotly.graph_objects as go
     if 'avg_salary' not in df.columns:
         return None
     
-    salary_data = df[df['avg_salary'].notna()].copy()
-    if salary_data.empty:
+    salaries = df['avg_salary'].to_numpy(dtype=np.float64, na_value=np.nan)
+    salaries = salaries[~np.isnan(salaries)]
+    if salaries.size == 0:
         return None
     
-    median_salary = salary_data['avg_salary'].median()
-    mean_salary = salary_data['avg_salary'].mean()
-    
-    fig = px.histogram(
-        salary_data,
-        x='avg_salary',
-        nbins=25,
-        title='Distribution des Salaires',
-        labels={'avg_salary': 'Salaire Moyen (€)', 'count': 'Nombre d\'Offres'},
-        color_discrete_sequence=['#6366F1']
-    )
-    fig.update_traces(
-        marker=dict(line=dict(color='#FFFFFF', width=1)),
-        hovertemplate='<b>Salaire:</b> €%{x:,.0f}<br><b>Nombre d\'offres:</b> %{y}<extra></extra>'
-    )
+    median_salary = np.median(salaries)
+    mean_salary = salaries.mean()
+    
+    # Seuls les effectifs des classes sont envoyés au navigateur, pas les salaires
+    counts, edges = np.histogram(salaries, bins=nbins)
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        customdata=np.column_stack([edges[:-1], edges[1:]]),
+        marker=dict(color='#6366F1', line=dict(color='#FFFFFF', width=1)),
+        hovertemplate=(
+            '<b>Salaire:</b> €%{customdata[0]:,.0f} – €%{customdata[1]:,.0f}'
+            '<br><b>Nombre d\'offres:</b> %{y}<extra></extra>'
+        )
+    ))
     
     # Ajouter ligne médiane
     fig.add_vline(
@@ -591,43 +1027,59 @@ def create_salary_distribution(df):
     )
     
     fig.update_layout(
+        title='Distribution des Salaires',
         font=dict(family="Arial, sans-serif", size=12),
         title_font=dict(size=20, color='#1F2937'),
         plot_bgcolor='rgba(0,0,0,0)',
         paper_bgcolor='rgba(0,0,0,0)',
-        xaxis=dict(showgrid=True, gridcolor='rgba(0,0,0,0.1)', tickformat='€,.0f'),
-        yaxis=dict(showgrid=True, gridcolor='rgba(0,0,0,0.1)'),
+        xaxis=dict(showgrid=True, gridcolor='rgba(0,0,0,0.1)', tickformat='€,.0f', title='Salaire Moyen (€)'),
+        yaxis=dict(showgrid=True, gridcolor='rgba(0,0,0,0.1)', title='Nombre d\'Offres'),
+        bargap=0,
         height=500
     )
     return fig
 
-def create_salary_vs_tech_count_scatter(df):
+def create_salary_vs_tech_count_scatter(df, tech_matrix=None):
     """Crée un scatter plot Salaire vs Nombre de Technologies"""
+    import plotly.express as px
     if 'avg_salary' not in df.columns or 'tech_stack_str' not in df.columns:
         return None
     
-    salary_data = df[df['avg_salary'].notna()].copy()
+    has_salary = df['avg_salary'].notna().to_numpy()
+    salary_data = df[has_salary].copy()
     if salary_data.empty:
         return None
     
     # Calculer le nombre de technologies par offre
-    salary_data['tech_count'] = salary_data['tech_stack_str'].apply(
-        lambda x: len(extract_tech_from_string(x)) if pd.notna(x) else 0
-    )
+    salary_data['tech_count'] = tech_counts_per_job(_resolve_tech_matrix(df, tech_matrix))[has_salary]
     
     # Filtrer les données avec au moins une technologie
     scatter_data = salary_data[salary_data['tech_count'] > 0].copy()
     if scatter_data.empty:
         return None
     
+    # Grand volume : échantillon stratifié (contrat x nombre de technologies x décile de salaire), en WebGL
+    title = 'Relation entre Salaire et Nombre de Technologies'
+    render_mode = 'auto'
+    n_points = len(scatter_data)
+    if n_points > SCATTER_MAX_POINTS:
+        salary_decile = pd.qcut(scatter_data['avg_salary'], 10, labels=False, duplicates='drop')
+        strata = scatter_data.groupby(
+            ['work_mode', 'tech_count', salary_decile], observed=True, dropna=False, sort=False
+        ).ngroup()
+        scatter_data = scatter_data.iloc[stratified_sample_positions(strata, SCATTER_MAX_POINTS)]
+        title = f"{title}<br><sup>Échantillon de {len(scatter_data):,} offres sur {n_points:,}</sup>"
+        render_mode = 'webgl'
+    
     fig = px.scatter(
         scatter_data,
         x='tech_count',
         y='avg_salary',
         color='work_mode',
         size='tech_count',
-        hover_data=['job_title', 'company_name'],
-        title='Relation entre Salaire et Nombre de Technologies',
+        hover_name='job_title',
+        title=title,
+        render_mode=render_mode,
         labels={'tech_count': 'Nombre de Technologies', 'avg_salary': 'Salaire Moyen (€)'},
         color_discrete_map={
             'Remote': '#6366F1',
@@ -638,8 +1090,7 @@ def create_salary_vs_tech_count_scatter(df):
     )
     fig.update_traces(
         marker=dict(line=dict(color='#FFFFFF', width=1), opacity=0.7),
-        hovertemplate='<b>%{hovertext}</b><br>Technologies: %{x}<br>Salaire: €%{y:,.0f}<extra></extra>',
-        hovertext=scatter_data['job_title']
+        hovertemplate='<b>%{hovertext}</b><br>Technologies: %{x}<br>Salaire: €%{y:,.0f}<extra></extra>'
     )
     fig.update_layout(
         font=dict(family="Arial, sans-serif", size=12),
@@ -655,6 +1106,7 @@ def create_salary_vs_tech_count_scatter(df):
 
 def create_top_companies_chart(df, top_n=10):
     """Crée un graphique des meilleures entreprises par salaire moyen"""
+    import plotly.express as px
     if 'company_name' not in df.columns or 'avg_salary' not in df.columns:
         return None
     
@@ -662,9 +1114,11 @@ def create_top_companies_chart(df, top_n=10):
     if salary_data.empty:
         return None
     
-    company_stats = salary_data.groupby('company_name')['avg_salary'].agg(['mean', 'count']).reset_index()
+    company_stats = salary_data.groupby('company_name', observed=True)['avg_salary'].agg(['mean', 'count']).reset_index()
     company_stats = company_stats[company_stats['count'] >= 1]
     company_stats = company_stats.sort_values('mean', ascending=False).head(top_n)
+    # Libellés en chaînes : l'axe ne reprend pas toutes les catégories du jeu de données
+    company_stats['company_name'] = company_stats['company_name'].astype(str)
     
     fig = px.bar(
         company_stats,
@@ -693,38 +1147,31 @@ def create_top_companies_chart(df, top_n=10):
     )
     return fig
 
-def create_tech_salary_correlation(df, top_n=10):
+def create_tech_salary_correlation(df, top_n=10, tech_matrix=None):
     """Crée un graphique montrant le salaire moyen par technologie"""
+    import plotly.express as px
     if 'tech_stack_str' not in df.columns or 'avg_salary' not in df.columns:
         return None
     
-    salary_data = df[df['avg_salary'].notna()].copy()
-    if salary_data.empty:
+    salaries = df['avg_salary'].to_numpy(dtype=float)
+    has_salary = ~np.isnan(salaries)
+    if not has_salary.any():
         return None
     
-    # Extraire toutes les technologies et leurs salaires
-    tech_salaries = {}
-    for idx, row in salary_data.iterrows():
-        techs = extract_tech_from_string(row.get('tech_stack_str', ''))
-        salary = row['avg_salary']
-        for tech in techs:
-            if tech not in tech_salaries:
-                tech_salaries[tech] = []
-            tech_salaries[tech].append(salary)
-    
-    # Calculer le salaire moyen par technologie
-    tech_avg_salary = {
-        tech: np.mean(salaries) 
-        for tech, salaries in tech_salaries.items() 
-        if len(salaries) >= 2  # Au moins 2 offres
-    }
+    # Salaire moyen par technologie : moyenne masquée sur les colonnes de la matrice
+    tech_matrix = _resolve_tech_matrix(df, tech_matrix)
+    salary_matrix = tech_matrix.matrix[has_salary]
+    counts = np.asarray(salary_matrix.sum(axis=0)).ravel()
+    totals = salary_matrix.T.astype(float) @ salaries[has_salary]
+    techs_df = pd.DataFrame({'Technology': tech_matrix.techs, 'Count': counts, 'Total': totals})
+    techs_df = techs_df[techs_df['Count'] >= 2]  # Au moins 2 offres
     
-    if not tech_avg_salary:
+    if techs_df.empty:
         return None
     
     # Trier et prendre le top N
-    sorted_techs = sorted(tech_avg_salary.items(), key=lambda x: x[1], reverse=True)[:top_n]
-    techs_df = pd.DataFrame(sorted_techs, columns=['Technology', 'AvgSalary'])
+    techs_df['AvgSalary'] = techs_df['Total'] / techs_df['Count']
+    techs_df = techs_df.sort_values('AvgSalary', ascending=False, kind='stable').head(top_n)
     
     fig = px.bar(
         techs_df,
@@ -755,6 +1202,7 @@ def create_tech_salary_correlation(df, top_n=10):
 
 def create_comparison_chart(original_df, filtered_df):
     """Crée un graphique comparant les données avant et après filtres"""
+    import plotly.graph_objects as go
     if original_df.empty or filtered_df.empty:
         return None
     
@@ -808,24 +1256,119 @@ def create_comparison_chart(original_df, filtered_df):
     
     return fig
 
-def get_all_technologies(df):
+# Tableau paginé des offres : ordres de tri pré-calculés par version du jeu de données
+TABLE_PAGE_SIZE = 50
+TABLE_COLUMNS = {
+    'job_title': 'Titre',
+    'company_name': 'Entreprise',
+    'location': 'Localisation',
+    'work_mode': 'Type de Contrat',
+    'experience_level': 'Niveau',
+    'avg_salary': 'Salaire Moyen'
+}
+TableSortKey = namedtuple('TableSortKey', ['order', 'n_valid'])
+
+def build_table_sort_index(df, columns=TABLE_COLUMNS):
+    """Ordre croissant des lignes pour chaque colonne du tableau (valeurs manquantes en dernier)"""
+    sort_index = {}
+    for col in columns:
+        if col not in df.columns:
+            continue
+        if pd.api.types.is_numeric_dtype(df[col]):
+            keys = np.asarray(df[col], dtype=float)
+            is_na = np.isnan(keys)
+        else:
+            keys, _ = pd.factorize(df[col], sort=True)
+            is_na = keys < 0
+        present = np.flatnonzero(~is_na)
+        order = np.concatenate([present[np.argsort(keys[present], kind='stable')], np.flatnonzero(is_na)])
+        sort_index[col] = TableSortKey(order.astype(np.int32), present.size)
+    return sort_index
+
+@st.cache_resource(max_entries=4)
+def get_table_sort_index(dataset_key, _df):
+    """Ordres de tri du tableau, calculés une fois par version du jeu de données"""
+    return build_table_sort_index(_df)
+
+def table_sorted_positions(sort_key, positions, n_rows, descending=False):
+    """Positions filtrées dans l'ordre de la colonne : parcours de l'ordre pré-calculé, sans tri"""
+    order = sort_key.order
+    if descending:
+        order = np.concatenate([order[:sort_key.n_valid][::-1], order[sort_key.n_valid:]])
+    selected = np.zeros(n_rows, dtype=bool)
+    selected[positions] = True
+    return order[selected[order]]
+
+def format_table_page(df, page_positions, columns):
+    """Lignes d'une page du tableau, formatées pour l'affichage"""
+    page_df = df.iloc[page_positions][columns].copy()
+    if 'avg_salary' in page_df.columns:
+        page_df['avg_salary'] = [f"€{x:,.0f}" if pd.notna(x) else "N/A" for x in page_df['avg_salary']]
+    return page_df.rename(columns=TABLE_COLUMNS)
+
+@st.cache_resource
+def get_scrape_worker():
+    """Worker de scraping lancé par ce serveur (partagé entre sessions)"""
+    return {'process': None, 'lock': threading.Lock()}
+
+def ensure_scrape_worker():
+    """Lance le worker de scraping s'il n'est pas (ou plus) en cours d'exécution"""
+    worker = get_scrape_worker()
+    with worker['lock']:
+        if worker['process'] is None or worker['process'].poll() is not None:
+            worker['process'] = spawn_scrape_worker()
+
+@st.fragment(run_every=SCRAPE_WORKER_POLL_SECONDS)
+def render_scrape_progress(job_id):
+    """Progression d'une demande de scraping, rafraîchie sans réexécuter le dashboard"""
+    job = get_scrape_job(job_id)
+    if job is None or job['status'] not in SCRAPE_ACTIVE_STATUSES:
+        # Demande terminée : réexécution complète pour charger les résultats
+        st.rerun()
+    
+    if job['status'] == 'queued':
+        # Le worker lancé par le dashboard s'arrête quand la file reste vide
+        ensure_scrape_worker()
+        st.progress(0.0)
+        st.text("⏳ Demande en attente d'un worker...")
+    elif not job['progress_total']:
+        st.progress(0.1)
+        st.text("🔍 Collecte des URLs d'emplois...")
+    else:
+        st.progress(0.3 + (job['progress_done'] / job['progress_total']) * 0.7)
+        st.text(f"📋 Traitement: {job['progress_done']}/{job['progress_total']} emplois...")
+
+def render_scrape_queue(limit=5):
+    """Dernières demandes de la file de scraping (toutes sessions confondues)"""
+    jobs = list_scrape_jobs(limit)
+    if not jobs:
+        return
+    status_labels = {'queued': '⏳ En attente', 'running': '🔄 En cours', 'done': '✅ Terminé', 'failed': '❌ Échec'}
+    with st.sidebar.expander("📋 File de scraping", expanded=False):
+        for job in jobs:
+            progress = f"{job['progress_done']}/{job['progress_total']}" if job['progress_total'] else ''
+            st.caption(
+                f"#{job['id']} {status_labels.get(job['status'], job['status'])} — "
+                f"{job['params']['location']}, {job['params']['max_jobs']} offres max {progress}"
+            )
+
+def get_all_technologies(df, tech_matrix=None):
     """Extrait toutes les technologies uniques du DataFrame"""
     if 'tech_stack_str' not in df.columns:
         return []
     
-    all_techs = set()
-    for tech_str in df['tech_stack_str'].dropna():
-        techs = extract_tech_from_string(tech_str)
-        all_techs.update(techs)
-    
-    return sorted(list(all_techs))
+    tech_matrix = _resolve_tech_matrix(df, tech_matrix)
+    counts = job_counts_per_tech(tech_matrix)
+    return [tech for tech, count in zip(tech_matrix.techs, counts) if count > 0]
 
-def main():
+def render_dashboard(timer):
+    """Construit le dashboard ; chaque étape est chronométrée par `timer`"""
     st.markdown('<h1 class="main-header">💼 Dashboard Marché Emplois Tech</h1>', unsafe_allow_html=True)
     
     # Initialiser session_state pour stocker les données scrapées
     if 'scraped_data' not in st.session_state:
-        st.session_state.scraped_data = None
+        st.session_state.scraped_data = None  # LoadedDataset lu après le dernier scraping
+        st.session_state.scrape_job_id = None
     
     # Section de choix : Données existantes ou Scraping
     st.sidebar.header("📥 Source de Données")
@@ -835,19 +1378,37 @@ def main():
         help="Utilisez les données sauvegardées ou scrapez de nouvelles données"
     )
     
-    df = None
+    loaded = None
     
     if data_source == "📁 Données existantes":
+        # Rejouer l'extraction sur l'archive des pages brutes (sans réseau)
+        if os.path.exists(os.path.join(RAW_ARCHIVE_DIR, 'index.jsonl')):
+            if st.sidebar.button("♻️ Retraiter l'archive HTML", help="Réapplique les règles d'extraction aux pages archivées, sans requête réseau"):
+                with st.spinner("Retraitement des pages archivées..."), pipeline_lock_held() as locked:
+                    if not locked:
+                        st.sidebar.warning("⏳ Une collecte est en cours d'écriture : réessayez une fois terminée.")
+                    else:
+                        reprocessed, failed = reprocess_archive()
+                        if not reprocessed.empty:
+                            merge_stats = merge_into_store(reprocessed)
+                            load_and_process_data.clear()
+                            st.sidebar.success(
+                                f"♻️ {len(reprocessed)} offres retraitées : "
+                                f"{merge_stats['changed']} modifiées, {merge_stats['new']} nouvelles"
+                            )
+                        if failed:
+                            st.sidebar.warning(f"⚠️ {failed} pages archivées n'ont pas pu être retraitées (voir les logs)")
+        
         # Charger les données existantes
-        with st.spinner('Chargement des données...'):
-            df = load_and_process_data()
+        with st.spinner('Chargement des données...'), timer.stage('load'):
+            loaded = load_and_process_data(dataset_version=current_dataset_version())
         
-        if df is None or df.empty:
+        if loaded is None or loaded.df.empty:
             st.warning("⚠️ Aucune donnée sauvegardée trouvée. Utilisez l'option de scraping pour créer des données.")
             st.info("💡 Vous pouvez aussi exécuter le notebook `Partie1-scraper_emplois.ipynb` pour créer le fichier CSV.")
             return
         
-        st.success(f"✅ {len(df)} offres d'emploi chargées depuis le fichier CSV")
+        st.success(f"✅ {len(loaded.df)} offres d'emploi chargées depuis le stockage")
     
     else:
         # Section de scraping
@@ -890,74 +1451,75 @@ def main():
         if custom_location:
             location = custom_location
         
-        if st.sidebar.button("🚀 Lancer le Scraping", type="primary"):
+        incremental = st.sidebar.checkbox(
+            "Scraping incrémental",
+            value=True,
+            help="Ignore les offres déjà présentes dans le stockage et y ajoute les nouvelles au lieu de l'écraser"
+        )
+        
+        # Le scraping est confié au worker en arrière-plan (file SQLite) : la session reste réactive
+        active_job = None
+        if st.session_state.scrape_job_id is not None:
+            active_job = get_scrape_job(st.session_state.scrape_job_id)
+        scrape_running = active_job is not None and active_job['status'] in SCRAPE_ACTIVE_STATUSES
+        
+        if st.sidebar.button("🚀 Lancer le Scraping", type="primary", disabled=scrape_running):
             if st.session_state.scraped_data is None:
-                # Lancer le scraping
-                progress_bar = st.progress(0)
-                status_text = st.empty()
-                
-                # Collecter les URLs
-                status_text.text("🔍 Collecte des URLs d'emplois...")
-                job_urls = collect_job_urls_from_aijobs(max_pages=max_pages, location=location)
-                progress_bar.progress(0.3)
-                
-                # Extraire les détails
-                status_text.text(f"📋 Extraction des détails de {min(max_jobs, len(job_urls))} emplois...")
-                all_jobs = []
-                
-                for i, job_url in enumerate(job_urls[:max_jobs], 1):
-                    job_data = extract_job_details_from_aijobs(job_url)
-                    if job_data and job_data.get('job_title'):
-                        all_jobs.append(job_data)
-                    
-                    # Mettre à jour la barre de progression
-                    progress = 0.3 + (i / min(max_jobs, len(job_urls))) * 0.7
-                    progress_bar.progress(progress)
-                    status_text.text(f"📋 Traitement: {i}/{min(max_jobs, len(job_urls))} emplois...")
-                    
-                    time.sleep(REQUEST_DELAY)
-                
-                # Traiter les données
-                status_text.text("🔄 Traitement des données...")
-                df = process_scraped_data(all_jobs)
-                
-                # Sauvegarder dans session_state
-                st.session_state.scraped_data = df
-                
-                # Sauvegarder dans le fichier CSV
-                if not df.empty:
-                    columns_to_save = [
-                        'job_title', 'company_name', 'location', 'work_mode', 
-                        'experience_level', 'salary_min', 'salary_max', 'avg_salary',
-                        'tech_stack_str', 'job_description', 'job_url'
-                    ]
-                    save_df = df[[col for col in columns_to_save if col in df.columns]].copy()
-                    save_df.to_csv('data/donnees_marche_emploi.csv', index=False, encoding='utf-8')
-                
-                progress_bar.progress(1.0)
-                status_text.text(f"✅ {len(df)} emplois scrapés et sauvegardés avec succès!")
-                st.success(f"✅ Scraping terminé ! {len(df)} offres d'emploi récupérées.")
+                job_id = enqueue_scrape(max_pages, max_jobs, location, incremental)
+                ensure_scrape_worker()
+                st.session_state.scrape_job_id = job_id
+                active_job = get_scrape_job(job_id)
+                scrape_running = True
             else:
                 st.info("💡 Données déjà scrapées dans cette session. Cliquez sur 'Réinitialiser' pour scraper à nouveau.")
         
+        if active_job is not None:
+            if scrape_running:
+                render_scrape_progress(active_job['id'])
+            elif active_job['status'] == 'done':
+                # Le worker a enregistré les offres : la session lit le stockage mis à jour
+                result = active_job['result']
+                st.session_state.scrape_job_id = None
+                if active_job['params']['incremental']:
+                    st.info(
+                        f"🗂️ Stockage mis à jour : {result['new']} nouvelles offres, "
+                        f"{result['changed']} modifiées"
+                    )
+                if result['scraped']:
+                    st.session_state.scraped_data = load_and_process_data(dataset_version=current_dataset_version())
+                st.success(f"✅ Scraping terminé ! {result['scraped']} offres d'emploi récupérées.")
+                if result.get('aborted'):
+                    st.warning("⚠️ Site indisponible : collecte interrompue, seules les offres déjà extraites ont été enregistrées.")
+            else:
+                st.session_state.scrape_job_id = None
+                st.error(f"❌ Échec du scraping : {active_job['error']}")
+        
+        render_scrape_queue()
+        
         if st.sidebar.button("🔄 Réinitialiser"):
             st.session_state.scraped_data = None
+            st.session_state.scrape_job_id = None
             st.rerun()
         
         # Utiliser les données scrapées ou existantes
         if st.session_state.scraped_data is not None:
-            df = st.session_state.scraped_data
-            st.info(f"📊 Utilisation des données scrapées: {len(df)} offres")
+            loaded = st.session_state.scraped_data
+            st.info(f"📊 Stockage mis à jour par le scraping : {len(loaded.df)} offres au total")
         else:
             # Essayer de charger les données existantes en fallback
-            df = load_and_process_data()
-            if df is None or df.empty:
+            with timer.stage('load'):
+                loaded = load_and_process_data(dataset_version=current_dataset_version())
+            if loaded is None or loaded.df.empty:
                 st.info("👆 Configurez les paramètres ci-dessus et cliquez sur 'Lancer le Scraping' pour commencer.")
                 return
     
-    if df is None or df.empty:
+    if loaded is None or loaded.df.empty:
         st.warning("⚠️ Aucune donnée disponible.")
         return
+    # Les index dérivés sont mis en cache par version effectivement lue
+    df, dataset_key, description_store = loaded
+    
+    timer.memory_report = get_frame_memory_report(dataset_key, df)
     
     # Sidebar - Filtres
     st.sidebar.header("🔍 Filtres")
@@ -965,20 +1527,30 @@ def main():
     # Recherche textuelle
     search_query = st.sidebar.text_input("🔎 Recherche (titre, entreprise)", "")
     
+    # Matrice des technologies et index de filtrage, calculés une fois par version du jeu de données
+    # (`tech_count` est dérivé au chargement : le DataFrame partagé n'est jamais modifié)
+    tech_matrix = None
+    with timer.stage('tech_matrix'):
+        if 'tech_stack_str' in df.columns:
+            tech_matrix = get_tech_matrix(dataset_key, df['tech_stack_str'])
+    with timer.stage('filter_index'):
+        filter_index = get_filter_index(dataset_key, df)
+    
     # Filtre par type de contrat
-    work_modes = ['Tous'] + sorted(df['work_mode'].unique().tolist())
+    work_modes = ['Tous'] + filter_index.categorical['work_mode'].categories
     selected_work_mode = st.sidebar.selectbox("Type de Contrat", work_modes)
     
     # Filtre par niveau d'expérience
-    experience_levels = ['Tous'] + sorted(df['experience_level'].unique().tolist())
+    experience_levels = ['Tous'] + filter_index.categorical['experience_level'].categories
     selected_experience = st.sidebar.selectbox("Niveau d'Expérience", experience_levels)
     
     # Filtre par localisation
-    locations = ['Toutes'] + sorted(df['location'].unique().tolist())
+    locations = ['Toutes'] + filter_index.categorical['location'].categories
     selected_location = st.sidebar.selectbox("Localisation", locations)
     
     # Filtre multi-sélection pour les technologies
-    all_techs = get_all_technologies(df)
+    with timer.stage('get_all_technologies'):
+        all_techs = get_all_technologies(df, tech_matrix)
     if all_techs:
         selected_techs = st.sidebar.multiselect(
             "🔧 Technologies recherchées",
@@ -990,11 +1562,9 @@ def main():
         selected_techs = []
     
     # Filtre par nombre de technologies
-    if 'tech_stack_str' in df.columns:
-        df['tech_count'] = df['tech_stack_str'].apply(
-            lambda x: len(extract_tech_from_string(x)) if pd.notna(x) else 0
-        )
-        max_tech_count = int(df['tech_count'].max()) if 'tech_count' in df.columns else 10
+    max_tech_count = None
+    if 'tech_count' in df.columns:
+        max_tech_count = int(df['tech_count'].max())
         tech_count_range = st.sidebar.slider(
             "Nombre de Technologies",
             min_value=0,
@@ -1006,11 +1576,13 @@ def main():
         tech_count_range = (0, 10)
     
     # Filtre par salaire
+    salary_bounds = None
     if 'avg_salary' in df.columns:
         salary_data = df[df['avg_salary'].notna()]
         if not salary_data.empty:
             min_salary = float(salary_data['avg_salary'].min())
             max_salary = float(salary_data['avg_salary'].max())
+            salary_bounds = (min_salary, max_salary)
             salary_range = st.sidebar.slider(
                 "Plage de Salaire (€)",
                 min_value=min_salary,
@@ -1023,46 +1595,76 @@ def main():
     else:
         salary_range = (0, 200000)
     
-    # Appliquer les filtres
-    filtered_df = df.copy()
-    
-    # Recherche textuelle
-    if search_query:
-        mask = (
-            filtered_df['job_title'].str.contains(search_query, case=False, na=False) |
-            filtered_df['company_name'].str.contains(search_query, case=False, na=False) |
-            filtered_df['job_description'].str.contains(search_query, case=False, na=False)
-        )
-        filtered_df = filtered_df[mask]
-    
+    # Appliquer les filtres : intersection des index, puis une seule matérialisation
+    equals = {}
     if selected_work_mode != 'Tous':
-        filtered_df = filtered_df[filtered_df['work_mode'] == selected_work_mode]
-    
+        equals['work_mode'] = selected_work_mode
     if selected_experience != 'Tous':
-        filtered_df = filtered_df[filtered_df['experience_level'] == selected_experience]
-    
+        equals['experience_level'] = selected_experience
     if selected_location != 'Toutes':
-        filtered_df = filtered_df[filtered_df['location'] == selected_location]
+        equals['location'] = selected_location
+    
+    # Les intervalles laissés à leurs bornes ne filtrent rien : inutile de les évaluer
+    ranges = {}
+    if max_tech_count is not None and tuple(tech_count_range) != (0, max_tech_count):
+        ranges['tech_count'] = tech_count_range
+    if salary_bounds is not None and tuple(salary_range) != salary_bounds:
+        ranges['avg_salary'] = salary_range
+    
+    # Résultats filtrés et graphiques mis en cache par (version des données, état des filtres)
+    result_cache = get_result_cache()
+    filter_state = normalize_filter_state(search_query, equals, ranges, selected_techs)
+    
+    def cached_chart(name, builder):
+        with timer.stage(f"chart.{name}"):
+            return result_cache.get_or_compute((dataset_key, filter_state, name), builder)
+    
+    def compute_positions():
+        # Recherche textuelle (index inversé : tous les mots, par préfixe)
+        search_positions = None
+        if search_query:
+            search_index = get_search_index(dataset_key, df, description_store)
+            search_positions = search_index_lookup(search_index, search_query)
+        
+        # Filtre par technologies (multi-sélection)
+        tech_masks = []
+        if selected_techs:
+            tech_masks.append(jobs_with_any_tech(tech_matrix, selected_techs))
+        
+        return filter_positions(filter_index, equals, ranges, search_positions, tech_masks)
     
-    # Filtre par technologies (multi-sélection)
-    if selected_techs:
-        tech_mask = filtered_df['tech_stack_str'].apply(
-            lambda x: any(tech in str(x) for tech in selected_techs) if pd.notna(x) else False
+    with timer.stage('filters'):
+        positions = result_cache.get_or_compute((dataset_key, filter_state, 'positions'), compute_positions)
+        # Sans filtre actif, pas de copie du jeu de données complet
+        filtered_df = df if len(positions) == len(df) else df.iloc[positions]
+        
+        # Lignes de la matrice des technologies correspondant aux offres filtrées
+        filtered_tech_matrix = None
+        if tech_matrix is not None:
+            filtered_tech_matrix = tech_matrix_rows(tech_matrix, positions)
+    
+    # Agrégats par contrat / niveau / localisation : cumul de cellules du cube
+    # si seuls des filtres catégoriels sont actifs, sinon cube des lignes filtrées
+    def compute_aggregates():
+        if not search_query and not selected_techs and not ranges:
+            filtered_cube = rollup_cube(full_cube, equals)
+        else:
+            filtered_cube = build_olap_cube(filtered_df)
+        return FilterAggregates(
+            filtered_cube,
+            cube_salary_stats(full_cube),
+            cube_salary_stats(filtered_cube),
+            cube_counts(filtered_cube, 'work_mode'),
+            cube_salary_stats(filtered_cube, 'work_mode'),
+            cube_salary_stats(filtered_cube, 'experience_level')
         )
-        filtered_df = filtered_df[tech_mask]
     
-    # Filtre par nombre de technologies
-    if 'tech_count' in filtered_df.columns:
-        filtered_df = filtered_df[
-            (filtered_df['tech_count'] >= tech_count_range[0]) & 
-            (filtered_df['tech_count'] <= tech_count_range[1])
-        ]
-    
-    if 'avg_salary' in filtered_df.columns:
-        filtered_df = filtered_df[
-            (filtered_df['avg_salary'].isna()) | 
-            ((filtered_df['avg_salary'] >= salary_range[0]) & (filtered_df['avg_salary'] <= salary_range[1]))
-        ]
+    with timer.stage('olap_cube'):
+        full_cube = get_olap_cube(dataset_key, df)
+        (
+            filtered_cube, full_salary_stats, filtered_salary_stats, work_mode_counts,
+            salary_by_work_mode_stats, salary_by_experience_stats
+        ) = result_cache.get_or_compute((dataset_key, filter_state, 'aggregates'), compute_aggregates)
     
     # Statistiques principales
     st.header("📊 Statistiques Clés")
@@ -1078,13 +1680,12 @@ def main():
     
     with col2:
         if 'avg_salary' in filtered_df.columns:
-            salary_data = filtered_df[filtered_df['avg_salary'].notna()]
-            if not salary_data.empty:
-                median_salary = salary_data['avg_salary'].median()
+            if not filtered_salary_stats.empty:
+                median_salary = filtered_salary_stats['median'].iloc[0]
                 st.metric(
                     label="Salaire Médian",
                     value=f"€{median_salary:,.0f}",
-                    delta=f"€{median_salary - df[df['avg_salary'].notna()]['avg_salary'].median():,.0f}" if len(filtered_df) != len(df) else None
+                    delta=f"€{median_salary - full_salary_stats['median'].iloc[0]:,.0f}" if len(filtered_df) != len(df) else None
                 )
             else:
                 st.metric(label="Salaire Médian", value="N/A")
@@ -1100,17 +1701,17 @@ def main():
         )
     
     with col4:
-        remote_count = len(filtered_df[filtered_df['work_mode'] == 'Remote'])
+        remote_count = int(work_mode_counts.get('Remote', 0))
         st.metric(
             label="Offres Remote",
             value=f"{remote_count:,}",
-            delta=f"{remote_count - len(df[df['work_mode'] == 'Remote']):,}" if len(filtered_df) != len(df) else None
+            delta=f"{remote_count - int(cube_counts(full_cube, 'work_mode').get('Remote', 0)):,}" if len(filtered_df) != len(df) else None
         )
     
     # Section de comparaison avant/après filtres
     if len(filtered_df) != len(df):
         st.header("📊 Impact des Filtres")
-        comparison_chart = create_comparison_chart(df, filtered_df)
+        comparison_chart = cached_chart('comparison_chart', lambda: create_comparison_chart(df, filtered_df))
         if comparison_chart:
             st.plotly_chart(comparison_chart, use_container_width=True, key="comparison_chart")
     
@@ -1130,19 +1731,24 @@ def main():
     with tab1:
         st.subheader("Analyse des Types de Contrats")
         if len(filtered_df) > 0:
-            work_mode_chart = create_work_mode_chart(filtered_df)
+            work_mode_chart = cached_chart(
+                'work_mode_pie', lambda: create_work_mode_chart(filtered_df, counts=work_mode_counts)
+            )
             st.plotly_chart(work_mode_chart, use_container_width=True, key="work_mode_pie")
             
             # Statistiques détaillées
             col1, col2 = st.columns(2)
             with col1:
                 st.write("**Répartition par type de contrat :**")
-                work_mode_stats = filtered_df['work_mode'].value_counts()
+                work_mode_stats = work_mode_counts
                 st.dataframe(work_mode_stats, use_container_width=True)
             
             with col2:
                 if 'avg_salary' in filtered_df.columns:
-                    salary_by_mode = create_salary_by_work_mode(filtered_df)
+                    salary_by_mode = cached_chart(
+                        'salary_by_mode',
+                        lambda: create_salary_by_work_mode(filtered_df, salary_stats=salary_by_work_mode_stats)
+                    )
                     if salary_by_mode:
                         st.plotly_chart(salary_by_mode, use_container_width=True, key="salary_by_mode_tab1")
         else:
@@ -1151,11 +1757,19 @@ def main():
     with tab2:
         st.subheader("Analyse par Niveau d'Expérience")
         if len(filtered_df) > 0:
-            exp_chart = create_experience_level_chart(filtered_df)
+            exp_chart = cached_chart(
+                'exp_level_bar',
+                lambda: create_experience_level_chart(
+                    filtered_df, counts=cube_counts(filtered_cube, 'experience_level')
+                )
+            )
             st.plotly_chart(exp_chart, use_container_width=True, key="exp_level_bar")
             
             if 'avg_salary' in filtered_df.columns:
-                salary_by_exp = create_salary_by_experience(filtered_df)
+                salary_by_exp = cached_chart(
+                    'salary_by_exp',
+                    lambda: create_salary_by_experience(filtered_df, salary_stats=salary_by_experience_stats)
+                )
                 if salary_by_exp:
                     st.plotly_chart(salary_by_exp, use_container_width=True, key="salary_by_exp_tab2")
         else:
@@ -1164,7 +1778,9 @@ def main():
     with tab3:
         st.subheader("Technologies les Plus Recherchées")
         if len(filtered_df) > 0:
-            tech_chart = create_top_tech_chart(filtered_df)
+            tech_chart = cached_chart(
+                'top_tech_chart', lambda: create_top_tech_chart(filtered_df, tech_matrix=filtered_tech_matrix)
+            )
             if tech_chart:
                 st.plotly_chart(tech_chart, use_container_width=True, key="top_tech_chart")
             else:
@@ -1175,20 +1791,26 @@ def main():
     with tab4:
         st.subheader("Analyse des Salaires")
         if len(filtered_df) > 0:
-            salary_dist = create_salary_distribution(filtered_df)
+            salary_dist = cached_chart('salary_dist_hist', lambda: create_salary_distribution(filtered_df))
             if salary_dist:
                 st.plotly_chart(salary_dist, use_container_width=True, key="salary_dist_hist")
             
             col1, col2 = st.columns(2)
             with col1:
                 if 'avg_salary' in filtered_df.columns:
-                    salary_by_mode = create_salary_by_work_mode(filtered_df)
+                    salary_by_mode = cached_chart(
+                        'salary_by_mode',
+                        lambda: create_salary_by_work_mode(filtered_df, salary_stats=salary_by_work_mode_stats)
+                    )
                     if salary_by_mode:
                         st.plotly_chart(salary_by_mode, use_container_width=True, key="salary_by_mode_tab4")
             
             with col2:
                 if 'avg_salary' in filtered_df.columns:
-                    salary_by_exp = create_salary_by_experience(filtered_df)
+                    salary_by_exp = cached_chart(
+                        'salary_by_exp',
+                        lambda: create_salary_by_experience(filtered_df, salary_stats=salary_by_experience_stats)
+                    )
                     if salary_by_exp:
                         st.plotly_chart(salary_by_exp, use_container_width=True, key="salary_by_exp_tab4")
         else:
@@ -1197,7 +1819,10 @@ def main():
     with tab5:
         st.subheader("Analyse Géographique")
         if len(filtered_df) > 0:
-            location_chart = create_location_chart(filtered_df)
+            location_chart = cached_chart(
+                'location_chart',
+                lambda: create_location_chart(filtered_df, counts=cube_counts(filtered_cube, 'location'))
+            )
             st.plotly_chart(location_chart, use_container_width=True, key="location_chart")
         else:
             st.warning("Aucune donnée disponible pour les filtres sélectionnés.")
@@ -1209,7 +1834,10 @@ def main():
             
             with col1:
                 st.write("**📊 Relation Salaire vs Technologies**")
-                scatter_chart = create_salary_vs_tech_count_scatter(filtered_df)
+                scatter_chart = cached_chart(
+                    'salary_tech_scatter',
+                    lambda: create_salary_vs_tech_count_scatter(filtered_df, tech_matrix=filtered_tech_matrix)
+                )
                 if scatter_chart:
                     st.plotly_chart(scatter_chart, use_container_width=True, key="salary_tech_scatter")
                 else:
@@ -1217,14 +1845,17 @@ def main():
             
             with col2:
                 st.write("**🏢 Top Entreprises**")
-                companies_chart = create_top_companies_chart(filtered_df)
+                companies_chart = cached_chart('top_companies', lambda: create_top_companies_chart(filtered_df))
                 if companies_chart:
                     st.plotly_chart(companies_chart, use_container_width=True, key="top_companies")
                 else:
                     st.info("Données insuffisantes pour cette analyse.")
             
             st.write("**💰 Technologies les Mieux Payées**")
-            tech_salary_chart = create_tech_salary_correlation(filtered_df)
+            tech_salary_chart = cached_chart(
+                'tech_salary_corr',
+                lambda: create_tech_salary_correlation(filtered_df, tech_matrix=filtered_tech_matrix)
+            )
             if tech_salary_chart:
                 st.plotly_chart(tech_salary_chart, use_container_width=True, key="tech_salary_corr")
             else:
@@ -1232,67 +1863,113 @@ def main():
         else:
             st.warning("Aucune donnée disponible pour les filtres sélectionnés.")
     
-    # Tableau des emplois
+    # Tableau des emplois : seule la page visible est ordonnée, formatée et envoyée au navigateur
     st.header("📋 Liste des Offres d'Emploi")
     
-    display_columns = []
-    if 'job_title' in filtered_df.columns:
-        display_columns.append('job_title')
-    if 'company_name' in filtered_df.columns:
-        display_columns.append('company_name')
-    if 'location' in filtered_df.columns:
-        display_columns.append('location')
-    if 'work_mode' in filtered_df.columns:
-        display_columns.append('work_mode')
-    if 'experience_level' in filtered_df.columns:
-        display_columns.append('experience_level')
-    if 'avg_salary' in filtered_df.columns:
-        display_columns.append('avg_salary')
-    
-    if display_columns:
-        display_df = filtered_df[display_columns].copy()
-        
-        # Formater le salaire
-        if 'avg_salary' in display_df.columns:
-            display_df['avg_salary'] = display_df['avg_salary'].apply(
-                lambda x: f"€{x:,.0f}" if pd.notna(x) else "N/A"
+    with timer.stage('table'):
+        table_columns = [col for col in TABLE_COLUMNS if col in filtered_df.columns]
+        if table_columns:
+            table_sort_index = get_table_sort_index(dataset_key, df)
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                sort_column = st.selectbox(
+                    "Trier par",
+                    table_columns,
+                    index=table_columns.index('avg_salary') if 'avg_salary' in table_columns else 0,
+                    format_func=TABLE_COLUMNS.get
+                )
+            with col2:
+                descending = st.radio("Ordre", ["Décroissant", "Croissant"], horizontal=True) == "Décroissant"
+            n_pages = max(1, (len(filtered_df) + TABLE_PAGE_SIZE - 1) // TABLE_PAGE_SIZE)
+            with col3:
+                # Retour à la première page quand les filtres ou le tri changent
+                page = st.number_input(
+                    f"Page (sur {n_pages})", min_value=1, max_value=n_pages, value=1, step=1,
+                    key=f"table_page_{hash((filter_state, sort_column, descending))}"
+                )
+            
+            ordered_positions = result_cache.get_or_compute(
+                (dataset_key, filter_state, 'table_order', sort_column, descending),
+                lambda: table_sorted_positions(table_sort_index[sort_column], positions, len(df), descending)
             )
-        
-        # Renommer les colonnes
-        column_mapping = {
-            'job_title': 'Titre',
-            'company_name': 'Entreprise',
-            'location': 'Localisation',
-            'work_mode': 'Type de Contrat',
-            'experience_level': 'Niveau',
-            'avg_salary': 'Salaire Moyen'
-        }
-        display_df = display_df.rename(columns=column_mapping)
-        
-        # Trier par salaire si disponible
-        if 'Salaire Moyen' in display_df.columns:
-            # Trier par valeur numérique
-            sort_df = filtered_df[display_columns].copy()
-            sort_df = sort_df.sort_values('avg_salary', ascending=False, na_position='last')
-            sort_df['avg_salary'] = sort_df['avg_salary'].apply(
-                lambda x: f"€{x:,.0f}" if pd.notna(x) else "N/A"
+            start = (page - 1) * TABLE_PAGE_SIZE
+            page_positions = ordered_positions[start:start + TABLE_PAGE_SIZE]
+            page_df = format_table_page(df, page_positions, table_columns)
+            table_event = st.dataframe(
+                page_df, use_container_width=True, hide_index=True, on_select='rerun',
+                selection_mode='single-row', key=f"table_rows_{hash((filter_state, sort_column, descending, page))}"
             )
-            sort_df = sort_df.rename(columns=column_mapping)
-            st.dataframe(sort_df, use_container_width=True, height=400)
+            if len(page_df):
+                st.caption(
+                    f"Offres {start + 1:,}–{start + len(page_df):,} sur {len(filtered_df):,} "
+                    "· sélectionnez une ligne pour afficher la description"
+                )
+            
+            # Détail de l'offre sélectionnée : seule sa description est lue dans le fichier de descriptions
+            if table_event.selection.rows:
+                position = int(page_positions[table_event.selection.rows[0]])
+                job = df.iloc[position]
+                st.subheader(f"{job['job_title']} — {job['company_name']}")
+                if 'job_url' in df.columns and pd.notna(job['job_url']):
+                    st.markdown(f"[Voir l'offre]({job['job_url']})")
+                description = description_store.get([position])[0] if description_store is not None else None
+                st.text(description or "Description non disponible.")
         else:
-            st.dataframe(display_df, use_container_width=True, height=400)
-    else:
-        st.warning("Aucune colonne à afficher.")
-    
-    # Bouton de téléchargement
-    csv = filtered_df.to_csv(index=False)
-    st.download_button(
-        label="📥 Télécharger les données filtrées (CSV)",
-        data=csv,
-        file_name="emplois_filtres.csv",
-        mime="text/csv"
+            st.warning("Aucune colonne à afficher.")
+    
+    # Bouton de téléchargement : fichier généré au clic (thread séparé), sans réexécuter le script
+    with st.expander("📥 Exporter les données filtrées"):
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            export_format = st.radio(
+                "Format", list(EXPORT_FORMATS), format_func=lambda fmt: EXPORT_FORMATS[fmt][0]
+            )
+        with col2:
+            export_options = list(filtered_df.columns)
+            if description_store is not None:
+                export_options.append('job_description')
+            export_columns = st.multiselect(
+                "Colonnes exportées",
+                options=export_options,
+                default=[col for col in export_options if col not in EXPORT_EXCLUDED_COLUMNS]
+            )
+        
+        def export_filtered():
+            # Descriptions lues au clic, pour les seules offres filtrées (index = identifiant de ligne)
+            export_df = filtered_df
+            if 'job_description' in export_columns:
+                export_df = filtered_df[[col for col in export_columns if col != 'job_description']].assign(
+                    job_description=description_store.get(filtered_df.index.to_numpy())
+                )
+            return export_frame(export_df, export_format, export_columns)
+        
+        st.download_button(
+            label="📥 Télécharger les données filtrées",
+            data=export_filtered,
+            file_name=f"emplois_filtres.{export_format}",
+            mime=EXPORT_FORMATS[export_format][1],
+            on_click='ignore',
+            disabled=not export_columns
+        )
+
+    # Compteurs du cache de résultats
+    cache_stats = result_cache.stats()
+    st.sidebar.caption(
+        f"⚡ Cache : {cache_stats['hits']} succès / {cache_stats['misses']} échecs, "
+        f"{cache_stats['entries']} entrées ({cache_stats['bytes'] / 1e6:.1f} Mo)"
     )
 
+def main():
+    # Profil cProfile à la demande (case du panneau « Performance », lue à l'exécution suivante)
+    timer = StageTimer(profile=st.session_state.get('perf_profile', False))
+    timer.start_profiling()
+    try:
+        render_dashboard(timer)
+    finally:
+        timer.finish()
+        timer.emit(get_perf_logger())
+    render_performance_panel(timer)
+
 if __name__ == "__main__":
     main()
 
@@ -0,0 +1,86 @@
+"""Benchmark de démarrage : temps d'import à froid et modules chargés
+
+Chaque mesure lance un interpréteur neuf avec `python -X importtime` et relève
+le temps cumulé d'import du module. Le code de sortie vaut 1 si un budget est
+dépassé ou si un module censé être importé à la demande est chargé.
+
+    python benchmarks/bench_startup.py [--runs 5] [--budget-scale 1.5]
+
+tests/test_startup.py applique les mêmes budgets sous pytest.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budget de temps d'import (ms) par module, mesuré par -X importtime
+STARTUP_BUDGETS_MS = {
+    'pipeline_marche_emploi': 1000,
+    'Partie2_tableau_bord_marche_emploi': 2000,
+}
+# Modules qui ne doivent pas être chargés par le simple import
+DEFERRED_MODULES = {
+    'pipeline_marche_emploi': ('streamlit', 'plotly', 'requests', 'bs4', 'lxml'),
+    'Partie2_tableau_bord_marche_emploi': ('requests', 'bs4', 'lxml', 'plotly.express', 'scipy'),
+}
+
+def parse_importtime(stderr):
+    """Lignes de -X importtime : liste de (profondeur, nom, cumul en µs)"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((depth, name.strip(), int(cumulative)))
+    return entries
+
+def measure_import(module, deferred):
+    """Importe `module` dans un interpréteur neuf : (cumul en ms, dépendances, modules différés chargés)"""
+    code = (
+        f"import sys, json; import {module}; "
+        f"print(json.dumps([m for m in {list(deferred)!r} if m in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+    )
+    entries = parse_importtime(result.stderr)
+    total_us = next(cumulative for depth, name, cumulative in entries if name == module and depth == 0)
+    dependencies = [(name, cumulative) for depth, name, cumulative in entries if depth == 1]
+    loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    return total_us / 1000, dependencies, loaded
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark du temps d'import à froid")
+    parser.add_argument('--runs', type=int, default=5, help="Nombre d'interpréteurs lancés par module")
+    parser.add_argument('--budget-scale', type=float, default=1.0, help="Multiplie les budgets (machine lente)")
+    args = parser.parse_args(argv)
+    
+    failures = []
+    for module, budget_ms in STARTUP_BUDGETS_MS.items():
+        timings = []
+        for _ in range(args.runs):
+            elapsed_ms, dependencies, loaded = measure_import(module, DEFERRED_MODULES[module])
+            timings.append(elapsed_ms)
+        median_ms = statistics.median(timings)
+        budget_ms *= args.budget_scale
+        status = 'OK' if median_ms <= budget_ms else 'DÉPASSÉ'
+        print(f"{module}: médiane {median_ms:.0f} ms (budget {budget_ms:.0f} ms) {status}")
+        for name, cumulative in sorted(dependencies, key=lambda dep: -dep[1])[:8]:
+            print(f"    {cumulative / 1000:8.1f} ms  {name}")
+        if median_ms > budget_ms:
+            failures.append(f"{module} : {median_ms:.0f} ms > {budget_ms:.0f} ms")
+        if loaded:
+            failures.append(f"{module} charge des modules différés : {', '.join(loaded)}")
+    
+    for failure in failures:
+        print(f"ÉCHEC {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""Suite de benchmarks sur corpus synthétique, avec références et seuils de régression
+
+Mesure le parsing HTML (pages d'offres et de résultats, backends lxml et
+bs4), l'extraction (technologies, salaires), le chargement du stockage, le
+bloc de filtres du dashboard et chaque fonction create_* sur des corpus
+générés par generate_corpus.py. Le code de sortie vaut 1 si une mesure
+dépasse sa référence (baselines.json) de plus de la tolérance.
+
+    python benchmarks/bench_suite.py --sizes 10k 100k
+    python benchmarks/bench_suite.py --sizes 10k --update-baselines
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import Partie2_tableau_bord_marche_emploi as app  # noqa: E402
+import pipeline_marche_emploi as pipeline  # noqa: E402
+from generate_corpus import CORPUS_SIZES, generate_jobs, render_job_page, render_listing_page  # noqa: E402
+
+BASELINES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+REGRESSION_TOLERANCE = 0.25  # Écart relatif toléré par rapport à la référence
+REGRESSION_MIN_DELTA_MS = 5.0  # En dessous, l'écart est considéré comme du bruit
+
+BENCH_PARSE_PAGES = 200  # Pages d'offres parsées (indépendant de la taille du corpus)
+BENCH_LISTING_PAGE_SIZE = 20  # Cartes par page de résultats, comme sur aijobs.ai
+
+# Filtres représentatifs d'une session (mêmes étapes que le bloc de filtres de main())
+BENCH_FILTERS = {
+    'search_query': 'engineer',
+    'equals': {'work_mode': 'Remote'},
+    'ranges': {'avg_salary': (60000.0, 150000.0)},
+    'selected_techs': ['Python', 'AWS'],
+}
+
+def time_call(func, repeats):
+    """Médiane (ms) de `repeats` appels, après un appel d'échauffement"""
+    func()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def build_filter_state(df, description_store=None):
+    """Index du bloc de filtres (matrice des technologies, index de filtres et de recherche)"""
+    tech_matrix = app.build_tech_matrix(df['tech_stack_str'])
+    filter_index = app.build_filter_index(df)
+    search_index = app.build_search_index(df, description_store=description_store)
+    return tech_matrix, filter_index, search_index
+
+def apply_filters(df, tech_matrix, filter_index, search_index):
+    """Application des filtres de référence : offres filtrées et leurs agrégats"""
+    search_positions = app.search_index_lookup(search_index, BENCH_FILTERS['search_query'])
+    tech_masks = [app.jobs_with_any_tech(tech_matrix, BENCH_FILTERS['selected_techs'])]
+    positions = app.filter_positions(
+        filter_index, BENCH_FILTERS['equals'], BENCH_FILTERS['ranges'], search_positions, tech_masks
+    )
+    filtered_df = df.iloc[positions]
+    filtered_cube = app.build_olap_cube(filtered_df)
+    return positions, filtered_df, filtered_cube
+
+def run_benchmarks(n_rows, repeats):
+    """Génère un corpus de `n_rows` offres et mesure chaque étape ; retourne {nom: ms}"""
+    results = {}
+    corpus = generate_jobs(n_rows)
+    texts = corpus['job_description']
+
+    # Parsing HTML : pages rendues depuis le corpus, pour chaque backend disponible
+    jobs = corpus.head(BENCH_PARSE_PAGES).to_dict('records')
+    job_pages = [render_job_page(job) for job in jobs]
+    urls = [job['job_url'] for job in jobs]
+    listing_pages = [
+        render_listing_page(urls[start:start + BENCH_LISTING_PAGE_SIZE])
+        for start in range(0, len(urls), BENCH_LISTING_PAGE_SIZE)
+    ]
+    backends = ['lxml', 'bs4'] if pipeline.HTML_PARSER_BACKEND == 'lxml' else ['bs4']
+    for backend in backends:
+        results[f'parse_job_page_{backend}'] = time_call(
+            lambda: [pipeline.parse_job_page(html, backend=backend) for html in job_pages], repeats)
+        results[f'parse_job_listing_{backend}'] = time_call(
+            lambda: [pipeline.parse_job_listing(html, backend=backend) for html in listing_pages], repeats)
+
+    results['extract_tech_stack'] = time_call(lambda: [pipeline.extract_tech_stack(t) for t in texts], repeats)
+    results['extract_salary_range'] = time_call(lambda: [pipeline.extract_salary_range(t) for t in texts], repeats)
+    results['extract_tech_stack_batch'] = time_call(lambda: pipeline.extract_tech_stack_batch(texts), repeats)
+    results['extract_salary_range_batch'] = time_call(lambda: pipeline.extract_salary_range_batch(texts), repeats)
+
+    # Le dashboard lit data/dataset (et son fichier de descriptions) relativement au répertoire courant
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            pipeline.write_dataset(corpus, pipeline.DATASET_DIR)
+
+            def load():
+                app.load_and_process_data.clear()
+                return app.load_and_process_data(dataset_version=n_rows)
+            results['load_and_process_data'] = time_call(load, repeats)
+            # L'index de recherche lit les descriptions dans le fichier de la version chargée
+            df, _, description_store = load()
+            results['filter_indexes'] = time_call(lambda: build_filter_state(df, description_store), repeats)
+            tech_matrix, filter_index, search_index = build_filter_state(df, description_store)
+        finally:
+            os.chdir(previous_dir)
+
+    results['filter_query'] = time_call(lambda: apply_filters(df, tech_matrix, filter_index, search_index), repeats)
+    positions, filtered_df, filtered_cube = apply_filters(df, tech_matrix, filter_index, search_index)
+    results['olap_cube'] = time_call(lambda: app.build_olap_cube(df), repeats)
+
+    filtered_tech_matrix = app.tech_matrix_rows(tech_matrix, positions)
+    charts = {
+        'create_work_mode_chart': lambda: app.create_work_mode_chart(
+            filtered_df, counts=app.cube_counts(filtered_cube, 'work_mode')),
+        'create_experience_level_chart': lambda: app.create_experience_level_chart(
+            filtered_df, counts=app.cube_counts(filtered_cube, 'experience_level')),
+        'create_salary_by_work_mode': lambda: app.create_salary_by_work_mode(
+            filtered_df, salary_stats=app.cube_salary_stats(filtered_cube, 'work_mode')),
+        'create_salary_by_experience': lambda: app.create_salary_by_experience(
+            filtered_df, salary_stats=app.cube_salary_stats(filtered_cube, 'experience_level')),
+        'create_top_tech_chart': lambda: app.create_top_tech_chart(filtered_df, tech_matrix=filtered_tech_matrix),
+        'create_location_chart': lambda: app.create_location_chart(
+            filtered_df, counts=app.cube_counts(filtered_cube, 'location')),
+        'create_salary_distribution': lambda: app.create_salary_distribution(filtered_df),
+        'create_salary_vs_tech_count_scatter': lambda: app.create_salary_vs_tech_count_scatter(
+            filtered_df, tech_matrix=filtered_tech_matrix),
+        'create_top_companies_chart': lambda: app.create_top_companies_chart(filtered_df),
+        'create_tech_salary_correlation': lambda: app.create_tech_salary_correlation(
+            filtered_df, tech_matrix=filtered_tech_matrix),
+        'create_comparison_chart': lambda: app.create_comparison_chart(df, filtered_df),
+    }
+    for name, build_chart in charts.items():
+        results[name] = time_call(build_chart, repeats)
+    return results
+
+def load_baselines(path=BASELINES_FILE):
+    """Charge les références enregistrées ({taille: {benchmark: ms}})"""
+    if not os.path.exists(path):
+        return {'machine': {}, 'results': {}}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_baselines(baselines, path=BASELINES_FILE):
+    """Enregistre les références avec une description de la machine de mesure"""
+    baselines['machine'] = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.machine(),
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Liste des régressions : (benchmark, ms mesurées, ms de référence)"""
+    regressions = []
+    for name, elapsed_ms in results.items():
+        reference_ms = baseline.get(name)
+        if reference_ms is None:
+            continue
+        if elapsed_ms > reference_ms * (1 + tolerance) and elapsed_ms - reference_ms > REGRESSION_MIN_DELTA_MS:
+            regressions.append((name, elapsed_ms, reference_ms))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks du pipeline et du dashboard sur corpus synthétique")
+    parser.add_argument('--sizes', nargs='+', default=['10k'], choices=list(CORPUS_SIZES), help="Tailles de corpus")
+    parser.add_argument('--repeats', type=int, default=3, help="Répétitions par mesure (médiane)")
+    parser.add_argument('--tolerance', type=float, default=REGRESSION_TOLERANCE, help="Écart relatif toléré")
+    parser.add_argument('--update-baselines', action='store_true', help="Enregistre les mesures comme références")
+    args = parser.parse_args(argv)
+
+    baselines = load_baselines()
+    failures = []
+    for size in args.sizes:
+        results = run_benchmarks(CORPUS_SIZES[size], args.repeats)
+        baseline = baselines['results'].get(size, {})
+        print(f"\n== Corpus {size} ==")
+        for name, elapsed_ms in results.items():
+            reference = baseline.get(name)
+            reference_text = f"  (référence {reference:10.1f} ms, {elapsed_ms / reference:4.2f}x)" if reference else ''
+            print(f"{name:38s} {elapsed_ms:10.1f} ms{reference_text}")
+        if args.update_baselines:
+            baselines['results'][size] = {name: round(elapsed_ms, 2) for name, elapsed_ms in results.items()}
+        else:
+            failures.extend((size, *regression) for regression in compare_to_baseline(results, baseline, args.tolerance))
+
+    if args.update_baselines:
+        save_baselines(baselines)
+        print(f"\nRéférences enregistrées dans {BASELINES_FILE}")
+    for size, name, elapsed_ms, reference_ms in failures:
+        print(f"RÉGRESSION [{size}] {name} : {elapsed_ms:.1f} ms > {reference_ms:.1f} ms (+{args.tolerance:.0%})")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""Générateur de corpus synthétique d'offres d'emploi (10k, 100k, 1M lignes...)
+
+Les descriptions contiennent des technologies (alias de tech_aliases.json), des
+fourchettes salariales, des indices de mode de travail et de niveau
+d'expérience ; les champs dérivés sont calculés par les règles du pipeline.
+Des pages HTML au format aijobs.ai peuvent aussi être produites.
+
+    python benchmarks/generate_corpus.py --rows 100000 --dataset-dir data/bench/dataset
+    python benchmarks/generate_corpus.py --rows 1000 --html-dir data/bench/html
+"""
+import argparse
+import html
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from pipeline_marche_emploi import (  # noqa: E402
+    TECH_ALIASES_FILE, compute_content_hash, enrich_jobs_frame, write_dataset
+)
+
+CORPUS_SIZES = {'10k': 10_000, '100k': 100_000, '1M': 1_000_000}
+
+ROLES = [
+    'Machine Learning Engineer', 'Data Scientist', 'Data Engineer', 'Backend Engineer',
+    'Frontend Developer', 'Full Stack Developer', 'DevOps Engineer', 'MLOps Engineer',
+    'AI Research Scientist', 'Software Engineer', 'Cloud Architect', 'Data Analyst',
+]
+# Niveau -> (préfixe du titre, indices d'expérience dans la description)
+SENIORITY_CUES = {
+    'Non spécifié': ('', ['']),
+    'Junior': ('Junior', ['entry level', '0-2 years', '1-2 years']),
+    'Mid-level': ('', ['mid-level', 'mid level', '2-5 years', '3-5 years', 'intermediate']),
+    'Senior': ('Senior', ['5+ years', 'experienced']),
+    'Lead/Principal': ('Lead', ['principal', 'staff', '10+ years']),
+}
+WORK_MODE_CUES = {
+    'Remote': ['This is a fully remote position.', 'Work from home anywhere in the country.', '100% remote.'],
+    'Hybrid': ['Hybrid setup with two days per week in the office.', 'Flexible hybrid schedule.'],
+    'On-site': ['This role is on-site in our headquarters.', 'You will work onsite with the team.'],
+    'Non spécifié': [''],
+}
+CITIES = [
+    'Paris, France', 'Lyon, France', 'Bordeaux, France', 'Nantes, France', 'Lille, France',
+    'Toulouse, France', 'Marseille, France', 'London, United Kingdom', 'Manchester, United Kingdom',
+    'Berlin, Germany', 'Munich, Germany', 'Amsterdam, Netherlands', 'Brussels, Belgium',
+    'Madrid, Spain', 'Barcelona, Spain', 'Milan, Italy', 'Montreal, Canada', 'Toronto, Canada',
+    'New York, United States', 'San Francisco, United States', 'Seattle, United States',
+    'Austin, United States', 'Boston, United States', 'Chicago, United States', 'Remote',
+]
+SALARY_TEMPLATES = [
+    'Salary: ${low}k - ${high}k per year.',
+    'Compensation between {low}k-{high}k depending on experience.',
+    'We offer {low}000 - {high}000 EUR gross per year.',
+    'Pay range: {low} to {high} k plus equity.',
+]
+FILLER_SENTENCES = [
+    'You will collaborate with product managers and designers to ship features.',
+    'Our team values ownership, curiosity and clear written communication.',
+    'We process billions of events per day for customers around the world.',
+    'You will mentor engineers and contribute to our technical roadmap.',
+    'Benefits include health insurance, learning budget and stock options.',
+    'We are an equal opportunity employer and welcome all applicants.',
+    'You will design, build and operate reliable services in production.',
+    'Our mission is to make machine learning accessible to every business.',
+]
+COMPANY_PREFIXES = ['Data', 'Neuro', 'Quant', 'Cloud', 'Deep', 'Hyper', 'Open', 'Meta', 'Nova', 'Blue']
+COMPANY_SUFFIXES = ['Labs', 'AI', 'Systems', 'Works', 'Analytics', 'Robotics', 'Cloud', 'Tech']
+
+def load_tech_aliases(aliases_file=TECH_ALIASES_FILE):
+    """Liste à plat des alias de technologies (forme canonique incluse)"""
+    with open(aliases_file, encoding='utf-8') as f:
+        aliases = json.load(f)
+    return sorted({alias for tech, names in aliases.items() for alias in [tech.lower(), *names]})
+
+def generate_jobs(n_rows, seed=42, start_date='2025-01-01', n_days=30):
+    """Génère un DataFrame de `n_rows` offres synthétiques, enrichies par les règles du pipeline"""
+    rng = np.random.default_rng(seed)
+    tech_aliases = np.array(load_tech_aliases())
+    # Popularité des technologies et des entreprises en loi de Zipf
+    tech_weights = 1 / np.arange(1, len(tech_aliases) + 1)
+    tech_weights /= tech_weights.sum()
+    companies = np.array([
+        f"{COMPANY_PREFIXES[i % len(COMPANY_PREFIXES)]}{COMPANY_SUFFIXES[i % len(COMPANY_SUFFIXES)]} {i}"
+        for i in range(max(n_rows // 50, 10))
+    ])
+    company_weights = 1 / np.arange(1, len(companies) + 1)
+    company_weights /= company_weights.sum()
+
+    seniorities = list(SENIORITY_CUES)
+    work_modes = list(WORK_MODE_CUES)
+    seniority_idx = rng.choice(len(seniorities), n_rows, p=[0.3, 0.15, 0.2, 0.25, 0.1])
+    work_mode_idx = rng.choice(len(work_modes), n_rows, p=[0.3, 0.25, 0.25, 0.2])
+    role_idx = rng.integers(0, len(ROLES), n_rows)
+    company_idx = rng.choice(len(companies), n_rows, p=company_weights)
+    city_idx = rng.integers(0, len(CITIES), n_rows)
+    tech_n = rng.integers(0, 9, n_rows)
+    tech_picks = rng.choice(len(tech_aliases), (n_rows, 8), p=tech_weights)
+    has_salary = rng.random(n_rows) < 0.6
+    salary_low = rng.integers(35, 160, n_rows)
+    salary_high = salary_low + rng.integers(5, 60, n_rows)
+    salary_template = rng.integers(0, len(SALARY_TEMPLATES), n_rows)
+    filler_n = rng.integers(1, 12, n_rows)
+    filler_picks = rng.integers(0, len(FILLER_SENTENCES), (n_rows, 12))
+    cue_picks = rng.integers(0, 8, (n_rows, 2))
+
+    titles, descriptions = [], []
+    for i in range(n_rows):
+        title_prefix, cues = SENIORITY_CUES[seniorities[seniority_idx[i]]]
+        mode_cues = WORK_MODE_CUES[work_modes[work_mode_idx[i]]]
+        role = ROLES[role_idx[i]]
+        titles.append(f"{title_prefix} {role}".strip())
+
+        parts = [f"We are hiring a {role} to join {companies[company_idx[i]]}."]
+        if tech_n[i]:
+            parts.append(f"Our stack: {', '.join(tech_aliases[tech_picks[i, :tech_n[i]]])}.")
+        if has_salary[i]:
+            parts.append(SALARY_TEMPLATES[salary_template[i]].format(low=salary_low[i], high=salary_high[i]))
+        experience_cue = cues[cue_picks[i, 0] % len(cues)]
+        if experience_cue:
+            parts.append(f"Profile: {experience_cue}.")
+        parts.append(mode_cues[cue_picks[i, 1] % len(mode_cues)])
+        parts.extend(FILLER_SENTENCES[k] for k in filler_picks[i, :filler_n[i]])
+        descriptions.append(' '.join(part for part in parts if part))
+
+    dates = pd.date_range(start_date, periods=n_days, freq='D').strftime('%Y-%m-%d').to_numpy()
+    df = pd.DataFrame({
+        'job_title': titles,
+        'company_name': companies[company_idx],
+        'location': np.array(CITIES)[city_idx],
+        'job_description': descriptions,
+        'job_url': [f"https://aijobs.ai/job/synthetic-{seed}-{i}" for i in range(n_rows)],
+        'scraped_at': dates[rng.integers(0, n_days, n_rows)],
+    })
+    df = enrich_jobs_frame(df)
+    df['content_hash'] = [compute_content_hash(job) for job in df.to_dict('records')]
+    return df
+
+def render_job_page(job):
+    """Page HTML d'une offre au format aijobs.ai (mêmes sélecteurs que parse_job_page)"""
+    paragraphs = ''.join(f"<p>{html.escape(sentence)}.</p>" for sentence in job['job_description'].split('. '))
+    return (
+        '<!DOCTYPE html><html><head><title>{title}</title>'
+        '<script>window.dataLayer = [];</script></head><body>'
+        '<nav><a href="/">AI Jobs</a><a href="/engineer">Engineer</a></nav>'
+        '<div class="tw-flex"><div class="post-main-title2">{title}</div>'
+        '<span>at</span><span class="tw-font-bold">{company}</span></div>'
+        '<span class="tw-text-white tw-bg-[#0BA02C] tw-rounded">Full Time</span>'
+        '<div class="remote"><i class="icon"></i><p class="tw-mb-0">{location}</p></div>'
+        '<div class="job-description-container">{description}</div>'
+        '<footer><div class="tw-footer"><span>© AI Jobs</span></div></footer>'
+        '</body></html>'
+    ).format(
+        title=html.escape(job['job_title']),
+        company=html.escape(job['company_name']),
+        location=html.escape(job['location']),
+        description=paragraphs,
+    )
+
+def render_listing_page(job_urls):
+    """Page de résultats contenant une carte `a.jobcardStyle1` par offre"""
+    cards = ''.join(
+        f'<a class="jobcardStyle1 tw-block" href="{html.escape(url)}"><div>Offre</div></a>' for url in job_urls
+    )
+    return f'<!DOCTYPE html><html><body><div class="tw-grid">{cards}</div></body></html>'
+
+def write_html_pages(df, html_dir, page_size=20):
+    """Écrit les pages d'offres et de résultats d'un corpus dans `html_dir`"""
+    os.makedirs(os.path.join(html_dir, 'jobs'), exist_ok=True)
+    for i, job in enumerate(df.to_dict('records')):
+        with open(os.path.join(html_dir, 'jobs', f"{i}.html"), 'w', encoding='utf-8') as f:
+            f.write(render_job_page(job))
+    urls = df['job_url'].tolist()
+    for page, start in enumerate(range(0, len(urls), page_size), 1):
+        with open(os.path.join(html_dir, f"listing-{page}.html"), 'w', encoding='utf-8') as f:
+            f.write(render_listing_page(urls[start:start + page_size]))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère un corpus synthétique d'offres d'emploi")
+    parser.add_argument('--rows', default='10k', help="Nombre de lignes (10k, 100k, 1M ou un entier)")
+    parser.add_argument('--seed', type=int, default=42, help="Graine aléatoire (corpus reproductible)")
+    parser.add_argument('--dataset-dir', help="Écrit le corpus au format du stockage Parquet")
+    parser.add_argument('--csv', help="Écrit le corpus en CSV")
+    parser.add_argument('--html-dir', help="Écrit les pages HTML des offres et des résultats")
+    args = parser.parse_args(argv)
+
+    n_rows = CORPUS_SIZES.get(args.rows) or int(args.rows)
+    df = generate_jobs(n_rows, seed=args.seed)
+    if args.dataset_dir:
+        write_dataset(df, args.dataset_dir)
+    if args.csv:
+        df.to_csv(args.csv, index=False, encoding='utf-8')
+    if args.html_dir:
+        write_html_pages(df, args.html_dir)
+    print(f"{len(df)} offres générées")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
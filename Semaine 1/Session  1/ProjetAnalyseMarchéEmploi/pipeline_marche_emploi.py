@@ -0,0 +1,2093 @@
+"""Pipeline de collecte des offres d'emploi, sans Streamlit ni Plotly
+
+Collecte -> extraction -> traitement -> stockage Parquet. Utilisable comme
+bibliothèque (le dashboard l'importe) ou en ligne de commande, par exemple
+depuis cron :
+
+    python pipeline_marche_emploi.py scrape --max-pages 3 --max-jobs 50
+
+ou comme worker de la file de scraping alimentée par le dashboard :
+
+    python pipeline_marche_emploi.py worker
+"""
+import argparse
+import logging
+import sys
+import pandas as pd
+import numpy as np
+import re
+import os
+import json
+import io
+import gzip
+import hashlib
+import shutil
+import functools
+import importlib.util
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import sqlite3
+import subprocess
+import time
+import random
+from datetime import date, datetime, timezone
+from email.utils import parsedate_to_datetime
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait
+from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+try:
+    import fcntl  # Verrous de fichiers (POSIX) : verrou d'exécution, fichiers de descriptions ouverts
+    msvcrt = None
+except ImportError:
+    fcntl = None  # Windows : un fichier mappé en mémoire ne peut de toute façon pas être supprimé
+    import msvcrt  # Verrou d'exécution
+
+# Configuration pour le scraping
+REQUESTS_PER_SECOND = 0.5  # Débit par hôte (requêtes/s) : une requête toutes les 2 s, plafond sans directive robots.txt
+MIN_REQUESTS_PER_SECOND = 0.2  # Plancher des baisses AIMD (sauf Crawl-delay plus long)
+MAX_REQUESTS_PER_SECOND = 8.0  # Plafond absolu, même si le Crawl-delay / Request-rate de robots.txt autorise davantage
+RATE_INCREASE_STEP = 0.1  # Hausse additive après chaque réponse rapide (requêtes/s)
+RATE_DECREASE_FACTOR = 0.5  # Baisse multiplicative sur 429, 5xx, erreur réseau ou pic de latence
+RATE_DECREASE_INTERVAL = 2.0  # Une seule baisse par intervalle (s) : une rafale d'erreurs compte une fois
+LATENCY_SPIKE_FACTOR = 3.0  # Pic de latence : réponse plus lente que 3x la moyenne glissante...
+LATENCY_SPIKE_MIN_SECONDS = 1.0  # ... et que 1 s (les variations de quelques ms ne comptent pas)
+LATENCY_EWMA_ALPHA = 0.2
+RATE_LIMIT_BURST = 1  # Nombre de requêtes autorisées en rafale par hôte
+FETCH_MAX_RETRIES = 4  # Nouvelles tentatives sur erreur transitoire (réseau, 429, 5xx)
+RETRY_BACKOFF_BASE = 1.0  # Attente maximale avant la 1re nouvelle tentative (s), doublée ensuite
+RETRY_BACKOFF_MAX = 60.0
+RETRY_AFTER_MAX_SECONDS = 300.0  # Retry-After plus long : l'hôte est suspendu pour cette durée et la requête abandonnée
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+CIRCUIT_FAILURE_THRESHOLD = 8  # Requêtes consécutives en échec (tentatives épuisées) avant d'ouvrir le disjoncteur
+CIRCUIT_COOLDOWN_SECONDS = 120.0  # Durée d'ouverture avant une requête d'essai
+ROBOTS_TXT_TIMEOUT = 10
+MAX_CONCURRENT_REQUESTS = 4  # Nombre de requêtes simultanées en vol
+LISTING_MAX_KNOWN_PAGES = 1  # Pages de résultats consécutives sans nouvelle offre avant d'arrêter la découverte
+LISTING_STATE_FILE = '_listing_state.json'  # Dans le stockage : la dernière collecte a-t-elle atteint la fin des résultats ?
+HTTP_CACHE_DIR = 'data/http_cache'  # Cache disque des pages (revalidation ETag/Last-Modified)
+RAW_ARCHIVE_DIR = 'data/raw_html'  # Archive des pages brutes (zstd, adressée par contenu)
+# La pile de scraping (requests, bs4, lxml) est importée à la demande, dans les
+# fonctions qui l'utilisent : lire le stockage ne la charge pas.
+HTML_PARSER_BACKEND = 'lxml' if importlib.util.find_spec('lxml') else 'bs4'  # 'lxml' (XPath, en C) ou 'bs4' (référence)
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7'
+}
+
+# Dictionnaire alias -> technologie canonique pour l'extraction de la stack technique
+TECH_ALIASES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tech_aliases.json')
+
+# Stockage des données : Parquet partitionné par date de collecte, CSV en import/export
+DATA_FILE = 'data/donnees_marche_emploi.csv'
+DATASET_DIR = 'data/dataset'
+STORE_COLUMNS = [
+    'job_title', 'company_name', 'location', 'work_mode',
+    'experience_level', 'salary_min', 'salary_max', 'avg_salary',
+    'tech_stack_str', 'job_description', 'job_url', 'content_hash', 'scraped_at'
+]
+DATASET_SCHEMA = pa.schema([
+    ('job_title', pa.string()),
+    ('company_name', pa.dictionary(pa.int32(), pa.string())),
+    ('location', pa.dictionary(pa.int32(), pa.string())),
+    ('work_mode', pa.dictionary(pa.int8(), pa.string())),
+    ('experience_level', pa.dictionary(pa.int8(), pa.string())),
+    ('salary_min', pa.float64()),
+    ('salary_max', pa.float64()),
+    ('avg_salary', pa.float64()),
+    ('tech_stack_str', pa.string()),
+    ('job_description', pa.string()),
+    ('job_url', pa.string()),
+    ('content_hash', pa.string()),
+])
+
+# Descriptions des offres, hors du DataFrame analytique : fichier Arrow IPC compressé par
+# lots (zstd), mappé en mémoire, écrit une fois par version du stockage
+DESCRIPTION_STORE_DIRNAME = '_descriptions'  # Dans le stockage
+DESCRIPTION_BATCH_ROWS = 1024  # Lignes par lot : seuls les lots des lignes demandées sont décompressés
+DESCRIPTION_STORE_KEEP = 4  # Versions récentes conservées même sans session ouverte dessus
+DATASET_READ_ATTEMPTS = 5  # Lectures du stockage refaites si une écriture concurrente le modifie
+
+# Contrat de types du DataFrame servi au dashboard (mémoire compacte, appliqué au chargement)
+try:
+    TEXT_DTYPE = pd.StringDtype('pyarrow', na_value=np.nan)  # Chaînes Arrow (dtype `str` de pandas 3)
+except TypeError:
+    TEXT_DTYPE = object  # pandas < 2.3 : chaînes Python
+FRAME_SCHEMA = {
+    'job_title': TEXT_DTYPE,
+    'company_name': 'category',
+    'location': 'category',
+    'work_mode': 'category',
+    'experience_level': 'category',
+    'salary_min': 'float32',
+    'salary_max': 'float32',
+    'avg_salary': 'float32',
+    'tech_stack_str': TEXT_DTYPE,
+    'job_description': TEXT_DTYPE,
+    'job_url': TEXT_DTYPE,
+    'content_hash': TEXT_DTYPE,
+    'scraped_at': 'category',
+    'tech_count': 'uint16',
+}
+
+# Limitation du débit par hôte (token bucket)
+class TokenBucket:
+    """Seau à jetons : autorise `rate` requêtes/s avec une rafale de `capacity`"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Bloque jusqu'à ce qu'un jeton soit disponible puis le consomme"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class CircuitOpenError(Exception):
+    """Disjoncteur ouvert : l'hôte échoue durablement, aucune requête n'est envoyée"""
+
+class HostController:
+    """Débit adaptatif d'un hôte (AIMD) et disjoncteur
+
+    Le débit du seau à jetons augmente de RATE_INCREASE_STEP après chaque
+    réponse rapide et est multiplié par RATE_DECREASE_FACTOR sur 429, 5xx,
+    erreur réseau ou pic de latence, entre MIN_REQUESTS_PER_SECOND et
+    `max_rate` (voir read_robots_max_rate). Après CIRCUIT_FAILURE_THRESHOLD
+    requêtes consécutives en échec (nouvelles tentatives épuisées), le
+    disjoncteur s'ouvre pendant CIRCUIT_COOLDOWN_SECONDS, puis une seule
+    requête d'essai est autorisée : son succès le referme, son échec le rouvre.
+    """
+
+    def __init__(self, host, max_rate=REQUESTS_PER_SECOND):
+        self.host = host
+        self.max_rate = max_rate
+        self.min_rate = min(MIN_REQUESTS_PER_SECOND, max_rate)  # Un Crawl-delay plus long reste respecté
+        self.bucket = TokenBucket(min(REQUESTS_PER_SECOND, max_rate), RATE_LIMIT_BURST)
+        self.latency = None  # Moyenne glissante (EWMA) des temps de réponse
+        self.last_decrease = 0.0
+        self.failures = 0  # Requêtes consécutives en échec
+        self.opened_at = None
+        self.cooldown = CIRCUIT_COOLDOWN_SECONDS  # Durée d'ouverture en cours (Retry-After long : plus)
+        self.trial_at = None  # Début de la requête d'essai en cours (disjoncteur semi-ouvert)
+        self.resume_at = 0.0  # Pause demandée par Retry-After, pour toutes les requêtes de l'hôte
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Attend la fin d'une pause Retry-After puis un jeton ; lève CircuitOpenError si le disjoncteur est ouvert"""
+        with self.lock:
+            now = time.monotonic()
+            if self.opened_at is not None:
+                # Semi-ouvert après le délai : une seule requête d'essai à la fois
+                trial_pending = self.trial_at is not None and now - self.trial_at < self.cooldown
+                if trial_pending or now - self.opened_at < self.cooldown:
+                    raise CircuitOpenError(f"{self.host} : disjoncteur ouvert après {self.failures} échecs")
+                self.trial_at = now
+            pause = self.resume_at - now
+        if pause > 0:
+            time.sleep(pause)
+        self.bucket.acquire()
+
+    def _set_rate(self, rate):
+        with self.bucket.lock:
+            self.bucket.rate = min(self.max_rate, max(self.min_rate, rate))
+            return self.bucket.rate
+
+    def record_success(self, latency):
+        """Réponse exploitable : referme le disjoncteur, puis hausse additive ou baisse sur pic de latence"""
+        with self.lock:
+            self.failures = 0
+            if self.opened_at is not None:
+                self.opened_at = None
+                self.trial_at = None
+                log_event('circuit.closed', host=self.host)
+            spike = (
+                self.latency is not None and latency > LATENCY_SPIKE_MIN_SECONDS
+                and latency > LATENCY_SPIKE_FACTOR * self.latency
+            )
+            self.latency = latency if self.latency is None else (
+                LATENCY_EWMA_ALPHA * latency + (1 - LATENCY_EWMA_ALPHA) * self.latency
+            )
+        if spike:
+            self._decrease('latency', latency=round(latency, 3))
+        else:
+            self._set_rate(self.bucket.rate + RATE_INCREASE_STEP)
+
+    def record_failure(self, reason):
+        """Tentative en erreur transitoire : baisse multiplicative ; l'échec d'une requête d'essai rouvre le disjoncteur"""
+        with self.lock:
+            if self.opened_at is not None:
+                self._open(CIRCUIT_COOLDOWN_SECONDS)
+        self._decrease(reason)
+
+    def record_exhausted(self):
+        """Requête abandonnée après ses nouvelles tentatives : compte un échec pour le disjoncteur"""
+        with self.lock:
+            self.failures += 1
+            if self.opened_at is None and self.failures >= CIRCUIT_FAILURE_THRESHOLD:
+                self._open(CIRCUIT_COOLDOWN_SECONDS)
+
+    def defer(self, seconds):
+        """Retry-After : suspend toutes les requêtes de l'hôte pendant `seconds`"""
+        with self.lock:
+            self.resume_at = max(self.resume_at, time.monotonic() + seconds)
+
+    def suspend(self, seconds):
+        """Retry-After trop long : ouvre le disjoncteur pour au moins `seconds`"""
+        with self.lock:
+            self._open(max(CIRCUIT_COOLDOWN_SECONDS, seconds))
+
+    def _open(self, cooldown):
+        """Ouvre (ou rouvre) le disjoncteur ; appelé sous self.lock"""
+        if self.opened_at is None:
+            log_event('circuit.open', logging.WARNING, host=self.host, failures=self.failures,
+                      cooldown=round(cooldown, 1))
+        self.opened_at = time.monotonic()
+        self.cooldown = cooldown
+        self.trial_at = None
+
+    def _decrease(self, reason, **fields):
+        with self.lock:
+            now = time.monotonic()
+            if now - self.last_decrease < RATE_DECREASE_INTERVAL:
+                return
+            self.last_decrease = now
+        rate = self._set_rate(self.bucket.rate * RATE_DECREASE_FACTOR)
+        log_event('rate.decrease', logging.WARNING, host=self.host, rate=round(rate, 3), reason=reason, **fields)
+
+def read_robots_max_rate(base_url, user_agent=HEADERS['User-Agent']):
+    """Débit maximal de l'hôte d'après robots.txt (Crawl-delay, Request-rate), en requêtes/s
+
+    Sans directive explicite (fichier absent, illisible ou muet), le débit reste
+    plafonné à REQUESTS_PER_SECOND. Une directive peut l'abaisser ou le relever,
+    jusqu'à MAX_REQUESTS_PER_SECOND.
+    """
+    parser = RobotFileParser()
+    try:
+        response = get_http_session().get(urljoin(base_url, '/robots.txt'), timeout=ROBOTS_TXT_TIMEOUT)
+    except Exception as e:
+        log_event('robots.unavailable', logging.WARNING, url=base_url, error=repr(e))
+        return REQUESTS_PER_SECOND
+    if response.status_code != 200:
+        return REQUESTS_PER_SECOND
+    parser.parse(response.text.splitlines())
+    allowed = []
+    crawl_delay = parser.crawl_delay(user_agent)
+    if crawl_delay:
+        allowed.append(1 / float(crawl_delay))
+    request_rate = parser.request_rate(user_agent)
+    if request_rate and request_rate.seconds:
+        allowed.append(request_rate.requests / request_rate.seconds)
+    if not allowed:
+        return REQUESTS_PER_SECOND
+    return min(MAX_REQUESTS_PER_SECOND, *allowed)
+
+# Contrôleurs par hôte : {hôte: {'lock', 'controller'}} ; le verrou de l'hôte couvre la lecture
+# de robots.txt, sans bloquer les requêtes vers les autres hôtes
+_host_controllers = {}
+_host_controllers_lock = threading.Lock()
+
+def get_host_controller(url):
+    """Contrôleur de débit de l'hôte de l'URL (robots.txt lu à la première requête)"""
+    parts = urlparse(url)
+    with _host_controllers_lock:
+        entry = _host_controllers.setdefault(parts.netloc, {'lock': threading.Lock(), 'controller': None})
+    with entry['lock']:
+        if entry['controller'] is None:
+            max_rate = read_robots_max_rate(f"{parts.scheme}://{parts.netloc}")
+            entry['controller'] = HostController(parts.netloc, max_rate)
+            log_event('rate.init', host=parts.netloc, rate=entry['controller'].bucket.rate,
+                      max_rate=round(max_rate, 3))
+    return entry['controller']
+
+def parse_retry_after(value):
+    """Durée (s) d'un en-tête Retry-After (secondes ou date HTTP), None si absent ou illisible"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def retry_delay(attempt, retry_after=None):
+    """Attente avant la nouvelle tentative `attempt` (0, 1...) : backoff exponentiel à gigue complète
+
+    `retry_after` (secondes, voir parse_retry_after) sert de minimum et n'est jamais raccourci.
+    """
+    delay = random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** attempt))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+def request_with_retries(url, headers=None, timeout=10):
+    """GET via la session partagée, sous le contrôle de débit de l'hôte
+
+    Les erreurs transitoires (erreurs requests, 429, 5xx) sont retentées
+    jusqu'à FETCH_MAX_RETRIES fois ; la dernière est levée. Un Retry-After
+    suspend tout l'hôte pour sa durée complète ; au-delà de
+    RETRY_AFTER_MAX_SECONDS, le disjoncteur de l'hôte s'ouvre pour cette durée
+    et CircuitOpenError est levée. Les autres réponses (2xx, 304, 404...) sont
+    retournées telles quelles.
+    """
+    import requests
+    controller = get_host_controller(url)
+    for attempt in range(FETCH_MAX_RETRIES + 1):
+        controller.acquire()
+        retry_after = None
+        started_at = time.monotonic()
+        try:
+            response = get_http_session().get(url, headers=headers, timeout=timeout)
+        except requests.RequestException as e:
+            if isinstance(e, ValueError):
+                raise  # URL ou en-tête invalide (MissingSchema, InvalidURL...) : pas transitoire
+            controller.record_failure(type(e).__name__)
+            error = e
+        else:
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                controller.record_success(time.monotonic() - started_at)
+                return response
+            controller.record_failure(f"http_{response.status_code}")
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            error = requests.HTTPError(f"{response.status_code} pour {url}", response=response)
+        if retry_after is not None and retry_after > RETRY_AFTER_MAX_SECONDS:
+            controller.record_exhausted()
+            controller.suspend(retry_after)
+            log_event('fetch.suspended', logging.WARNING, url=url, retry_after=round(retry_after, 1))
+            raise CircuitOpenError(f"{controller.host} : Retry-After de {retry_after:.0f} s") from error
+        if attempt == FETCH_MAX_RETRIES:
+            controller.record_exhausted()
+            raise error
+        if retry_after is not None:
+            controller.defer(retry_after)
+        delay = retry_delay(attempt, retry_after)
+        log_event('fetch.retry', url=url, attempt=attempt + 1, delay=round(delay, 2), error=repr(error))
+        time.sleep(delay)
+
+# Session HTTP partagée (keep-alive) et cache disque conditionnel
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def get_http_session():
+    """Retourne la session HTTP partagée, avec un pool de connexions persistantes"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONCURRENT_REQUESTS)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _http_session = session
+    return _http_session
+
+def _http_cache_paths(url):
+    """Chemins (métadonnées, corps) de l'entrée de cache d'une URL"""
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    return (os.path.join(HTTP_CACHE_DIR, f"{key}.json"),
+            os.path.join(HTTP_CACHE_DIR, f"{key}.html"))
+
+def _write_atomic(path, content):
+    """Écrit un fichier texte de manière atomique (sûr entre threads)"""
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+def fetch_page(url, timeout=10, kind='page'):
+    """Télécharge une page via la session partagée et le cache HTTP conditionnel
+
+    Si la page est en cache, envoie If-None-Match / If-Modified-Since ; une
+    réponse 304 renvoie le corps en cache et enregistre la revalidation.
+    Débit et nouvelles tentatives : voir request_with_retries.
+    Chaque page obtenue est archivée (voir archive_page) avec son type `kind`.
+    """
+    meta_path, body_path = _http_cache_paths(url)
+    meta = None
+    if os.path.exists(meta_path) and os.path.exists(body_path):
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = None
+    
+    headers = {}
+    if meta:
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+    
+    response = request_with_retries(url, headers=headers, timeout=timeout)
+    
+    if response.status_code == 304 and meta:
+        with open(body_path, encoding='utf-8') as f:
+            text = f.read()
+        meta['revalidated_at'] = time.time()
+        meta['revalidations'] = meta.get('revalidations', 0) + 1
+        _write_atomic(meta_path, json.dumps(meta))
+        archive_page(url, text, kind)
+        return text
+    
+    response.raise_for_status()
+    text = response.text
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if etag or last_modified:
+        os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+        _write_atomic(body_path, text)
+        _write_atomic(meta_path, json.dumps({
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': time.time(),
+            'revalidations': 0
+        }))
+    archive_page(url, text, kind)
+    return text
+
+# Archive des pages brutes : objets zstd nommés par leur SHA-256 (dédupliqués),
+# index en lignes JSON (URL, empreinte, type, date de collecte)
+_archive_lock = threading.Lock()
+
+def _archive_object_path(digest, archive_dir=RAW_ARCHIVE_DIR):
+    """Chemin de l'objet compressé d'une page archivée"""
+    return os.path.join(archive_dir, 'objects', digest[:2], f"{digest}.html.zst")
+
+def archive_page(url, html, kind='page', archive_dir=RAW_ARCHIVE_DIR):
+    """Archive une page brute (compressée, adressée par contenu) et l'indexe par URL et date"""
+    content = html.encode('utf-8')
+    digest = hashlib.sha256(content).hexdigest()
+    path = _archive_object_path(digest, archive_dir)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with pa.CompressedOutputStream(tmp_path, 'zstd') as out:
+            out.write(content)
+        os.replace(tmp_path, path)
+    
+    entry = {'url': url, 'sha256': digest, 'kind': kind, 'size': len(content), 'fetched_at': time.time()}
+    with _archive_lock:
+        with open(os.path.join(archive_dir, 'index.jsonl'), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+    return digest
+
+def read_archived_page(digest, archive_dir=RAW_ARCHIVE_DIR):
+    """Relit le HTML d'une page archivée à partir de son empreinte"""
+    with pa.CompressedInputStream(pa.OSFile(_archive_object_path(digest, archive_dir)), 'zstd') as f:
+        return f.read().decode('utf-8')
+
+def load_archive_index(kind=None, latest=True, archive_dir=RAW_ARCHIVE_DIR):
+    """Charge l'index de l'archive (dernière version de chaque URL par défaut)"""
+    index_path = os.path.join(archive_dir, 'index.jsonl')
+    if not os.path.exists(index_path):
+        return pd.DataFrame(columns=['url', 'sha256', 'kind', 'size', 'fetched_at'])
+    index = pd.read_json(index_path, lines=True, dtype={'sha256': str}, convert_dates=False)
+    if kind is not None:
+        index = index[index['kind'] == kind]
+    if latest:
+        index = index.sort_values('fetched_at', kind='stable').drop_duplicates('url', keep='last')
+    return index.reset_index(drop=True)
+
+# Fonctions utilitaires pour le scraping
+# Règles d'enrichissement partagées par les versions unitaires et vectorisées
+REMOTE_KEYWORDS = ['remote', 'télétravail', 'work from home', 'wfh', 'fully remote', '100% remote']
+HYBRID_KEYWORDS = ['hybrid', 'hybride', 'partially remote', 'flexible', '2-3 days']
+ONSITE_KEYWORDS = ['on-site', 'on site', 'onsite', 'office', 'bureau', 'présentiel']
+EXPERIENCE_PATTERNS = {
+    "Junior": [r'junior', r'entry level', r'0-2 years', r'1-2 years', r'debutant'],
+    "Mid-level": [r'mid-level', r'mid level', r'2-5 years', r'3-5 years', r'intermediate'],
+    "Senior": [r'senior', r'5\+ years', r'5+ years', r'experienced', r'expérimenté'],
+    "Lead/Principal": [r'lead', r'principal', r'staff', r'architect', r'10\+ years']
+}
+SALARY_PATTERNS = [
+    r'\$?(\d+)[kK]?\s*-\s*\$?(\d+)[kK]?',
+    r'€?(\d+)[,.]?\d*\s*-\s*€?(\d+)[,.]?\d*',
+    r'(\d+)\s*to\s*(\d+)\s*k',
+]
+
+def _as_text(text):
+    """Texte d'une description ('' si absente : None, NaN), comme fillna('') côté batch"""
+    if text is None or (isinstance(text, float) and np.isnan(text)):
+        return ''
+    return str(text)
+
+def detect_work_mode(text):
+    """Détecte le type de contrat (Remote/Hybrid/On-site) depuis le texte"""
+    text = _as_text(text)
+    if not text:
+        return "Non spécifié"
+    
+    text_lower = text.lower()
+    remote_keywords = REMOTE_KEYWORDS
+    hybrid_keywords = HYBRID_KEYWORDS
+    onsite_keywords = ONSITE_KEYWORDS
+    
+    remote_count = sum(1 for keyword in remote_keywords if keyword in text_lower)
+    hybrid_count = sum(1 for keyword in hybrid_keywords if keyword in text_lower)
+    onsite_count = sum(1 for keyword in onsite_keywords if keyword in text_lower)
+    
+    if remote_count > 0 and remote_count >= hybrid_count:
+        return "Remote"
+    elif hybrid_count > 0:
+        return "Hybrid"
+    elif onsite_count > 0:
+        return "On-site"
+    else:
+        return "Non spécifié"
+
+def extract_experience_level(text):
+    """Extrait le niveau d'expérience requis depuis le texte"""
+    text = _as_text(text)
+    if not text:
+        return "Non spécifié"
+    
+    text_lower = text.lower()
+    
+    for level, pattern_list in EXPERIENCE_PATTERNS.items():
+        for pattern in pattern_list:
+            if re.search(pattern, text_lower):
+                return level
+    
+    return "Non spécifié"
+
+def _trie_to_regex(node):
+    """Convertit un trie de caractères en expression régulière factorisée"""
+    alternatives = []
+    optional = False
+    for char in sorted(node):
+        if char == '':
+            optional = True
+        else:
+            alternatives.append(re.escape(char) + _trie_to_regex(node[char]))
+    if not alternatives:
+        return ''
+    if len(alternatives) == 1 and not optional:
+        return alternatives[0]
+    return '(?:' + '|'.join(alternatives) + ')' + ('?' if optional else '')
+
+@functools.lru_cache(maxsize=None)
+def get_tech_matcher(aliases_file=TECH_ALIASES_FILE):
+    """Compile (une fois par processus) le dictionnaire d'alias en une seule regex
+
+    Les alias sont factorisés en trie pour qu'un seul passage sur le texte
+    suffise, quelle que soit la taille du dictionnaire. Retourne le motif
+    compilé, la table alias -> technologie et l'ordre des technologies.
+    """
+    with open(aliases_file, encoding='utf-8') as f:
+        aliases = json.load(f)
+    
+    alias_to_tech = {}
+    trie = {}
+    for tech, tech_aliases in aliases.items():
+        for alias in tech_aliases:
+            alias = alias.lower()
+            alias_to_tech[alias] = tech
+            node = trie
+            for char in alias:
+                node = node.setdefault(char, {})
+            node[''] = {}
+    
+    pattern = re.compile(r'(?<!\w)' + _trie_to_regex(trie) + r'(?!\w)')
+    tech_order = {tech: i for i, tech in enumerate(aliases)}
+    return pattern, alias_to_tech, tech_order
+
+def extract_tech_stack(text):
+    """Extrait les technologies mentionnées dans la description"""
+    text = _as_text(text)
+    if not text:
+        return []
+    
+    pattern, alias_to_tech, tech_order = get_tech_matcher()
+    found_techs = {alias_to_tech[match] for match in pattern.findall(text.lower())}
+    return sorted(found_techs, key=tech_order.get)
+
+def extract_salary_range(text):
+    """Extrait la fourchette salariale depuis le texte"""
+    text = _as_text(text)
+    if not text:
+        return None, None
+    
+    for pattern in SALARY_PATTERNS:
+        match = re.search(pattern, text)
+        if match:
+            try:
+                min_sal = int(match.group(1).replace(',', '').replace('.', ''))
+                max_sal = int(match.group(2).replace(',', '').replace('.', ''))
+                if min_sal < 1000:
+                    min_sal *= 1000
+                if max_sal < 1000:
+                    max_sal *= 1000
+                return min_sal, max_sal
+            except:
+                continue
+    
+    return None, None
+
+# Versions vectorisées : enrichissent une colonne entière de descriptions
+def detect_work_mode_batch(texts):
+    """Version vectorisée de detect_work_mode sur une Series de textes"""
+    texts_lower = texts.fillna('').astype(str).str.lower()
+    
+    def keyword_count(keywords):
+        return sum(texts_lower.str.contains(keyword, regex=False).astype(int) for keyword in keywords)
+    
+    remote_count = keyword_count(REMOTE_KEYWORDS)
+    hybrid_count = keyword_count(HYBRID_KEYWORDS)
+    onsite_count = keyword_count(ONSITE_KEYWORDS)
+    
+    modes = np.select(
+        [(remote_count > 0) & (remote_count >= hybrid_count), hybrid_count > 0, onsite_count > 0],
+        ["Remote", "Hybrid", "On-site"],
+        default="Non spécifié"
+    )
+    return pd.Series(modes, index=texts.index, dtype=object)
+
+def extract_experience_level_batch(texts):
+    """Version vectorisée de extract_experience_level sur une Series de textes"""
+    texts_lower = texts.fillna('').astype(str).str.lower()
+    conditions = [
+        texts_lower.str.contains('|'.join(f'(?:{pattern})' for pattern in pattern_list), regex=True)
+        for pattern_list in EXPERIENCE_PATTERNS.values()
+    ]
+    levels = np.select(conditions, list(EXPERIENCE_PATTERNS), default="Non spécifié")
+    return pd.Series(levels, index=texts.index, dtype=object)
+
+def extract_tech_stack_batch(texts):
+    """Version vectorisée de extract_tech_stack (une liste de technologies par texte)"""
+    pattern, alias_to_tech, tech_order = get_tech_matcher()
+    matches = texts.fillna('').astype(str).str.lower().str.findall(pattern)
+    return matches.map(
+        lambda found: sorted({alias_to_tech[match] for match in found}, key=tech_order.get)
+    )
+
+def extract_salary_range_batch(texts):
+    """Version vectorisée de extract_salary_range : DataFrame (salary_min, salary_max)"""
+    texts = texts.fillna('').astype(str)
+    salaries = pd.DataFrame(np.nan, index=texts.index, columns=['salary_min', 'salary_max'])
+    
+    # Le premier motif qui correspond l'emporte, comme dans la version unitaire
+    for pattern in SALARY_PATTERNS:
+        missing = salaries['salary_min'].isna()
+        if not missing.any():
+            break
+        extracted = texts[missing].str.extract(pattern)
+        matched = extracted[0].notna()
+        extracted = extracted[matched].astype(float)
+        salaries.loc[extracted.index, 'salary_min'] = extracted[0]
+        salaries.loc[extracted.index, 'salary_max'] = extracted[1]
+    
+    # Montants exprimés en milliers (ex: 80k)
+    return salaries.where(salaries >= 1000, salaries * 1000)
+
+def enrich_jobs_frame(df, text_column='job_description'):
+    """Recalcule tous les champs dérivés d'un corpus depuis ses descriptions
+
+    Permet de rejouer les règles d'extraction sur les données stockées
+    sans re-scraper (les descriptions stockées sont tronquées à 5000 caractères).
+    """
+    enriched = df.copy()
+    texts = enriched[text_column]
+    enriched['work_mode'] = detect_work_mode_batch(texts)
+    enriched['experience_level'] = extract_experience_level_batch(texts)
+    enriched['tech_stack_str'] = extract_tech_stack_batch(texts).map(', '.join)
+    salaries = extract_salary_range_batch(texts)
+    enriched['salary_min'] = salaries['salary_min']
+    enriched['salary_max'] = salaries['salary_max']
+    enriched['avg_salary'] = (salaries['salary_min'] + salaries['salary_max']) / 2
+    return enriched
+
+# Parsing HTML : backend lxml (arbre construit en C, requêtes XPath ciblées) ou
+# BeautifulSoup (référence). Les deux renvoient exactement les mêmes champs.
+def _has_class_xpath(tag, class_name):
+    """Expression XPath : éléments `tag` portant la classe CSS `class_name`"""
+    # Le premier contains() (sous-chaîne brute, peu coûteux) écarte la plupart des éléments
+    return (f"//{tag}[contains(@class, '{class_name}') and "
+            f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]")
+
+@functools.lru_cache(maxsize=None)
+def _lxml_xpath(expression):
+    """Expression XPath compilée une seule fois"""
+    import lxml.etree
+    return lxml.etree.XPath(expression)
+
+def _lxml_parse(html):
+    """Construit l'arbre lxml d'un document complet (décodage UTF-8 explicite)"""
+    import lxml.etree
+    parser = lxml.etree.HTMLParser(encoding='utf-8')
+    root = lxml.etree.fromstring(html.encode('utf-8'), parser)
+    if root is None:  # document vide
+        root = lxml.etree.fromstring(b'<html></html>', parser)
+    return root
+
+def _lxml_text(elem, separator=''):
+    """Équivalent lxml de get_text(separator, strip=True) de BeautifulSoup"""
+    texts = _lxml_xpath('.//text()[not(ancestor::script or ancestor::style or ancestor::template)]')(elem)
+    return separator.join(text.strip() for text in texts if text.strip())
+
+def _lxml_string(elem):
+    """Équivalent lxml de Tag.string : le texte unique du sous-arbre, sinon None"""
+    while True:
+        children = list(elem)
+        if not children:
+            return elem.text
+        if len(children) > 1 or elem.text or children[0].tail:
+            return None
+        elem = children[0]
+        if not isinstance(elem.tag, str):  # commentaire
+            return elem.text
+
+def _lxml_first(root, xpath):
+    """Premier élément correspondant à une expression XPath, ou None"""
+    matches = _lxml_xpath(f"({xpath})[1]")(root)
+    return matches[0] if matches else None
+
+def _parse_job_page_bs4(html):
+    """Champs bruts d'une page d'offre avec BeautifulSoup (html.parser)"""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    fields = {}
+    
+    title_elem = soup.find("div", class_="post-main-title2")
+    fields['job_title'] = title_elem.get_text(strip=True) if title_elem else None
+    
+    fields['company_name'] = None
+    company_elem = soup.find("span", string=lambda x: x and "at" in str(x).lower())
+    if company_elem:
+        company_span = company_elem.find_next_sibling("span")
+        if company_span:
+            fields['company_name'] = company_span.get_text(strip=True)
+    
+    if not fields['company_name']:
+        company_link = soup.find("a", href=re.compile(r"/company/"))
+        if company_link:
+            company_name_elem = company_link.find("span", class_="tw-card-title")
+            if company_name_elem:
+                fields['company_name'] = company_name_elem.get_text(strip=True)
+    
+    job_type_elem = soup.find("span", class_=re.compile(r"tw-bg-\[#0BA02C\]"))
+    fields['job_type'] = job_type_elem.get_text(strip=True) if job_type_elem else None
+    
+    fields['location'] = None
+    location_elem = soup.find("div", class_="remote")
+    if location_elem:
+        location_p = location_elem.find("p", class_="tw-mb-0")
+        if location_p:
+            fields['location'] = location_p.get_text(strip=True)
+    
+    desc_container = soup.find("div", class_="job-description-container") or soup.find('body')
+    fields['description_text'] = (
+        desc_container.get_text(separator=' ', strip=True) if desc_container else ""
+    )
+    
+    salary_section = soup.find("div", string=re.compile(r"Salary", re.IGNORECASE))
+    fields['salary_text'] = salary_section.get_text() if salary_section else None
+    return fields
+
+def _parse_job_page_lxml(html):
+    """Champs bruts d'une page d'offre avec lxml (mêmes règles que la version BeautifulSoup)"""
+    root = _lxml_parse(html)
+    fields = {}
+    
+    title_elem = _lxml_first(root, _has_class_xpath('div', 'post-main-title2'))
+    fields['job_title'] = _lxml_text(title_elem) if title_elem is not None else None
+    
+    fields['company_name'] = None
+    for span in root.iter('span'):
+        string = _lxml_string(span)
+        if string and "at" in string.lower():
+            company_span = next(span.itersiblings('span'), None)
+            if company_span is not None:
+                fields['company_name'] = _lxml_text(company_span)
+            break
+    
+    if not fields['company_name']:
+        company_link = _lxml_first(root, "//a[contains(@href, '/company/')]")
+        if company_link is not None:
+            company_name_elem = _lxml_first(company_link, '.' + _has_class_xpath('span', 'tw-card-title'))
+            if company_name_elem is not None:
+                fields['company_name'] = _lxml_text(company_name_elem)
+    
+    job_type_elem = _lxml_first(root, "//span[contains(@class, 'tw-bg-[#0BA02C]')]")
+    fields['job_type'] = _lxml_text(job_type_elem) if job_type_elem is not None else None
+    
+    fields['location'] = None
+    location_elem = _lxml_first(root, _has_class_xpath('div', 'remote'))
+    if location_elem is not None:
+        location_p = _lxml_first(location_elem, '.' + _has_class_xpath('p', 'tw-mb-0'))
+        if location_p is not None:
+            fields['location'] = _lxml_text(location_p)
+    
+    desc_container = _lxml_first(root, _has_class_xpath('div', 'job-description-container'))
+    if desc_container is None and re.search(r'<body\b', html, re.IGNORECASE):
+        # lxml ajoute toujours un <body> : ne l'utiliser que s'il existe dans la page
+        desc_container = _lxml_first(root, '//body')
+    fields['description_text'] = (
+        _lxml_text(desc_container, separator=' ') if desc_container is not None else ""
+    )
+    
+    fields['salary_text'] = None
+    for div in root.iter('div'):
+        string = _lxml_string(div)
+        if string and re.search(r"Salary", string, re.IGNORECASE):
+            fields['salary_text'] = string
+            break
+    return fields
+
+def parse_job_page(html, backend=HTML_PARSER_BACKEND):
+    """Extrait les champs bruts d'une page d'offre (titre, entreprise, lieu, description...)"""
+    if backend == 'lxml':
+        return _parse_job_page_lxml(html)
+    return _parse_job_page_bs4(html)
+
+class _JobCardLinks:
+    """Cible du parseur lxml : relève le href des cartes d'offres sans construire d'arbre"""
+
+    def __init__(self):
+        self.hrefs = []
+
+    def start(self, tag, attrib):
+        if tag == 'a' and 'jobcardStyle1' in attrib.get('class', '').split() and attrib.get('href'):
+            self.hrefs.append(attrib['href'])
+
+    def close(self):
+        return self.hrefs
+
+def parse_job_listing(html, backend=HTML_PARSER_BACKEND):
+    """Liens des cartes d'offres (`a.jobcardStyle1`) d'une page de résultats, dans l'ordre
+
+    Parsing restreint : seules les cartes sont construites (SoupStrainer pour
+    BeautifulSoup) ; avec lxml, le parseur appelle une cible (_JobCardLinks)
+    au lieu de construire l'arbre du document.
+    """
+    if backend == 'lxml':
+        import lxml.etree
+        if not html.strip():
+            return []
+        parser = lxml.etree.HTMLParser(encoding='utf-8', target=_JobCardLinks())
+        return lxml.etree.fromstring(html.encode('utf-8'), parser)
+    from bs4 import BeautifulSoup, SoupStrainer
+    # Pendant le parsing, l'attribut class n'est pas encore découpé en liste
+    strainer = SoupStrainer(
+        "a", class_=lambda c: bool(c) and "jobcardStyle1" in (c if isinstance(c, list) else c.split())
+    )
+    soup = BeautifulSoup(html, 'html.parser', parse_only=strainer)
+    return [card.get("href") for card in soup.find_all("a") if card.get("href")]
+
+def compare_parser_backends(pages):
+    """Vérifie la parité des backends : liste des (index, champ, bs4, lxml) divergents"""
+    mismatches = []
+    for i, html in enumerate(pages):
+        reference = parse_job_page(html, backend='bs4')
+        candidate = parse_job_page(html, backend='lxml')
+        for field, value in reference.items():
+            if candidate.get(field) != value:
+                mismatches.append((i, field, value, candidate.get(field)))
+        if parse_job_listing(html, backend='bs4') != parse_job_listing(html, backend='lxml'):
+            mismatches.append((i, 'job_urls', None, None))
+    return mismatches
+
+def extract_job_details_from_aijobs(url, html=None, backend=HTML_PARSER_BACKEND):
+    """Extrait les détails complets d'une offre d'emploi depuis aijobs.ai"""
+    if html is None:
+        try:
+            html = fetch_page(url, kind='job')
+        except CircuitOpenError:
+            raise  # Hôte indisponible : inutile de tenter les offres suivantes
+        except Exception as e:
+            log_event('fetch.failed', logging.WARNING, url=url, error=repr(e))
+            return None
+    
+    fields = parse_job_page(html, backend=backend)
+    description_text = fields['description_text']
+    
+    job_data = {
+        'job_title': fields['job_title'],
+        'company_name': fields['company_name'],
+        'location': fields['location'],
+        'work_mode': None,
+        'experience_level': None,
+        'salary_min': None,
+        'salary_max': None,
+        'tech_stack': [],
+        'job_description': None,
+        'job_type': fields['job_type'],
+        'job_url': url
+    }
+    
+    job_data['job_description'] = description_text[:5000]
+    job_data['work_mode'] = detect_work_mode(description_text)
+    job_data['experience_level'] = extract_experience_level(description_text)
+    job_data['tech_stack'] = extract_tech_stack(description_text)
+    
+    min_sal, max_sal = extract_salary_range(description_text)
+    job_data['salary_min'] = min_sal
+    job_data['salary_max'] = max_sal
+    
+    if not min_sal and not max_sal and fields['salary_text']:
+        min_sal, max_sal = extract_salary_range(fields['salary_text'])
+        job_data['salary_min'] = min_sal
+        job_data['salary_max'] = max_sal
+    
+    return job_data
+
+def iter_job_urls_from_aijobs(max_pages=3, location="United%20States", max_jobs=None, known_urls=None,
+                              stop_on_known=True):
+    """Génère les URLs des offres d'emploi d'aijobs.ai au fil des pages de résultats, dans l'ordre du site
+
+    Chaque URL n'est générée qu'une fois (ensemble des URLs vues) et celles de
+    `known_urls` sont ignorées. La découverte s'arrête dès que `max_jobs` URLs
+    ont été générées, à la première page vide, ou, si `stop_on_known`, après
+    LISTING_MAX_KNOWN_PAGES pages consécutives sans nouvelle offre (les plus
+    récentes sont en tête : les suivantes sont déjà connues si la collecte
+    précédente a atteint la fin des résultats, voir read_listing_complete).
+    Le générateur retourne le bilan de la découverte (pages lues et en échec,
+    URLs listées, URLs générées, motif d'arrêt).
+    """
+    BASE_URL = "https://aijobs.ai"
+    known_urls = known_urls or set()
+    seen = set()
+    pages = failed_pages = listed = yielded = pages_without_new = 0
+    stopped = 'max_pages'
+    
+    for page_num in range(1, max_pages + 1):
+        url = f"{BASE_URL}/engineer?location={location}&page={page_num}"
+        try:
+            hrefs = parse_job_listing(fetch_page(url, kind='listing'))
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            log_event('fetch.failed', logging.WARNING, url=url, error=repr(e))
+            failed_pages += 1
+            continue
+        pages += 1
+        if not hrefs:
+            stopped = 'empty_page'
+            break
+        
+        new_on_page = 0
+        for href in hrefs:
+            if href.startswith('/'):
+                href = urljoin(BASE_URL, href)
+            if href in seen:
+                continue
+            seen.add(href)
+            listed += 1
+            if href in known_urls:
+                continue
+            new_on_page += 1
+            yielded += 1
+            yield href
+            if max_jobs is not None and yielded >= max_jobs:
+                stopped = 'max_jobs'
+                break
+        if stopped == 'max_jobs':
+            break
+        
+        pages_without_new = 0 if new_on_page else pages_without_new + 1
+        if known_urls and stop_on_known and pages_without_new >= LISTING_MAX_KNOWN_PAGES:
+            stopped = 'known_urls'
+            break
+    
+    log_event('scrape.collected', pages=pages, urls=listed, to_extract=yielded, stopped=stopped)
+    return {'pages': pages, 'failed_pages': failed_pages, 'listed': listed, 'yielded': yielded, 'stopped': stopped}
+
+def collect_job_urls_from_aijobs(max_pages=3, location="United%20States"):
+    """Collecte les URLs des offres d'emploi depuis aijobs.ai (sans doublon, dans l'ordre du site)"""
+    return list(iter_job_urls_from_aijobs(max_pages=max_pages, location=location))
+
+def fetch_job_details_concurrently(job_urls, max_workers=MAX_CONCURRENT_REQUESTS):
+    """Extrait les détails des offres en parallèle, dans l'ordre de complétion
+
+    `job_urls` peut être un générateur (voir iter_job_urls_from_aijobs) : chaque
+    offre est soumise dès sa découverte, avec au plus 2 x `max_workers` offres
+    en attente. La politesse est assurée par le seau à jetons de chaque hôte.
+    Génère des tuples (url, job_data).
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+        for url in job_urls:
+            pending[executor.submit(extract_job_details_from_aijobs, url)] = url
+            # Offres terminées pendant la découverte ; attente si la file est pleine
+            done = {future for future in pending if future.done()}
+            if len(pending) >= 2 * max_workers and not done:
+                done = wait(pending, return_when=FIRST_COMPLETED).done
+            for future in done:
+                yield pending.pop(future), future.result()
+        for future in as_completed(pending):
+            yield pending[future], future.result()
+
+def _reextract_archived(snapshot):
+    """Ré-extrait une offre depuis sa page archivée (exécuté dans un processus de travail)
+
+    Retourne (job_data, erreur) : l'erreur est journalisée par le processus principal.
+    """
+    url, digest, archive_dir = snapshot
+    try:
+        return extract_job_details_from_aijobs(url, html=read_archived_page(digest, archive_dir)), None
+    except Exception as e:
+        return None, repr(e)
+
+def reprocess_archive(max_workers=None, archive_dir=RAW_ARCHIVE_DIR):
+    """Rejoue l'extraction sur la dernière page archivée de chaque offre, sans réseau
+
+    Les pages sont traitées en parallèle sur plusieurs processus ; chaque offre
+    garde la date de collecte de sa page. Retourne (DataFrame des offres, nombre
+    de pages en échec : erreur de lecture ou d'extraction, offre sans titre).
+    """
+    snapshots = load_archive_index(kind='job', archive_dir=archive_dir)
+    if snapshots.empty:
+        return pd.DataFrame(), 0
+    items = [(url, digest, archive_dir) for url, digest in zip(snapshots['url'], snapshots['sha256'])]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(_reextract_archived, items, chunksize=16))
+    
+    jobs = []
+    for (url, _, _), (job, error) in zip(items, results):
+        if error is not None:
+            log_event('reprocess.failed', logging.WARNING, url=url, error=error)
+        jobs.append(job)
+    fetched_at = snapshots['fetched_at'].tolist()
+    kept = [i for i, job in enumerate(jobs) if job and job.get('job_title')]
+    failed = len(jobs) - len(kept)
+    log_event('reprocess.extracted', jobs=len(kept), failed=failed)
+    df = process_scraped_data([jobs[i] for i in kept])
+    if not df.empty:
+        df['scraped_at'] = [date.fromtimestamp(fetched_at[i]).isoformat() for i in kept]
+    return df, failed
+
+def clean_jobs_frame(df):
+    """Nettoie et type un DataFrame d'offres (salaires numériques, valeurs par défaut)"""
+    df_clean = df.copy()
+    
+    # Nettoyer les salaires
+    for col in ('salary_min', 'salary_max', 'avg_salary'):
+        if col in df_clean.columns:
+            df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce')
+        else:
+            df_clean[col] = np.nan
+    
+    # Calculer le salaire moyen si nécessaire
+    if df_clean['avg_salary'].isna().all():
+        df_clean['avg_salary'] = (df_clean['salary_min'] + df_clean['salary_max']) / 2
+    
+    # Nettoyer les colonnes
+    df_clean['work_mode'] = df_clean.get('work_mode', pd.Series()).fillna('Non spécifié')
+    df_clean['experience_level'] = df_clean.get('experience_level', pd.Series()).fillna('Non spécifié')
+    df_clean['location'] = df_clean.get('location', pd.Series()).fillna('Non spécifiée')
+    
+    if 'content_hash' not in df_clean.columns:
+        df_clean['content_hash'] = [compute_content_hash(row) for row in df_clean.to_dict('records')]
+    
+    return df_clean
+
+def _to_arrow_table(df):
+    """Convertit un DataFrame d'offres en table Arrow typée (sans la colonne de partition)"""
+    columns = {}
+    for field in DATASET_SCHEMA:
+        values = df[field.name] if field.name in df.columns else pd.Series([None] * len(df))
+        if pa.types.is_floating(field.type):
+            values = pd.to_numeric(values, errors='coerce')
+        else:
+            values = values.astype(object).where(values.notna(), None)
+        columns[field.name] = pa.array(values.tolist(), type=pa.string() if pa.types.is_dictionary(field.type) else field.type)
+    table = pa.table(columns)
+    return table.cast(DATASET_SCHEMA)
+
+def _partition_path(scraped_at, dataset_dir=DATASET_DIR):
+    """Chemin du fichier Parquet d'une partition (une par date de collecte)"""
+    return os.path.join(dataset_dir, f"scraped_at={scraped_at}", "part-0.parquet")
+
+def _write_partition(df, scraped_at, dataset_dir=DATASET_DIR):
+    """Écrit (ou remplace) la partition d'une date de collecte"""
+    path = _partition_path(scraped_at, dataset_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    pq.write_table(_to_arrow_table(df), tmp_path, compression='zstd')
+    os.replace(tmp_path, path)
+
+def _read_partition(scraped_at, dataset_dir=DATASET_DIR):
+    """Lit la partition d'une date de collecte, ou None si elle n'existe pas"""
+    path = _partition_path(scraped_at, dataset_dir)
+    if not os.path.exists(path):
+        return None
+    df = pq.read_table(path).to_pandas()
+    df['scraped_at'] = scraped_at
+    return df
+
+def _dataset_partitions(dataset_dir=DATASET_DIR):
+    """Partitions présentes, triées : liste de (nom, chemin, taille, date de modification en ns)"""
+    partitions = []
+    for name in sorted(os.listdir(dataset_dir)):
+        if not name.startswith('scraped_at='):
+            continue
+        path = _partition_path(name.split('=', 1)[-1], dataset_dir)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        partitions.append((name, path, stat.st_size, stat.st_mtime_ns))
+    return partitions
+
+def _partitions_version(partitions):
+    """Empreinte d'un ensemble de partitions (noms, tailles et dates de modification)"""
+    entries = [f"{name}:{size}:{mtime_ns}" for name, _, size, mtime_ns in partitions]
+    return hashlib.sha1('|'.join(entries).encode('utf-8')).hexdigest()
+
+def _read_partitions(partitions, columns, dataset_dir, decode_dictionaries):
+    """Lit exactement les fichiers de `partitions` (les fichiers .tmp en cours d'écriture sont ignorés)"""
+    dataset = ds.dataset(
+        [path for _, path, _, _ in partitions],
+        format='parquet',
+        partitioning=ds.partitioning(pa.schema([('scraped_at', pa.string())]), flavor='hive'),
+        partition_base_dir=dataset_dir
+    )
+    if columns is not None:
+        columns = [col for col in columns if col in dataset.schema.names]
+    table = dataset.to_table(columns=columns)
+    if not decode_dictionaries:
+        # Dictionnaires propres à chaque partition : les unifier avant conversion
+        return table.unify_dictionaries().to_pandas()
+    
+    # Décoder les colonnes catégorielles (encodées en dictionnaire sur disque)
+    decoded = [
+        table[name].cast(pa.string()) if pa.types.is_dictionary(table.schema.field(name).type) else table[name]
+        for name in table.schema.names
+    ]
+    return pa.table(decoded, names=table.schema.names).to_pandas()
+
+def read_dataset_with_version(columns=None, dataset_dir=DATASET_DIR, decode_dictionaries=True):
+    """Lit le stockage et retourne (DataFrame, version) ; (None, None) s'il est vide ou absent
+
+    La version (voir get_dataset_version) décrit exactement les partitions lues :
+    si une écriture concurrente les modifie pendant la lecture, celle-ci est refaite.
+    """
+    if not os.path.isdir(dataset_dir):
+        return None, None
+    for _ in range(DATASET_READ_ATTEMPTS):
+        partitions = _dataset_partitions(dataset_dir)
+        if not partitions:
+            return None, None
+        try:
+            df = _read_partitions(partitions, columns, dataset_dir, decode_dictionaries)
+        except OSError:
+            continue  # Partition supprimée pendant la lecture (réécriture complète du stockage)
+        if _dataset_partitions(dataset_dir) == partitions:
+            return df, _partitions_version(partitions)
+    raise RuntimeError(f"Stockage {dataset_dir} modifié pendant chacune des {DATASET_READ_ATTEMPTS} lectures")
+
+def read_dataset(columns=None, dataset_dir=DATASET_DIR, decode_dictionaries=True):
+    """Lit le stockage Parquet en ne chargeant que les colonnes demandées
+
+    Retourne None si le stockage n'existe pas encore. Avec
+    `decode_dictionaries=False`, les colonnes encodées en dictionnaire
+    deviennent des catégories pandas au lieu de chaînes.
+    """
+    return read_dataset_with_version(columns, dataset_dir, decode_dictionaries)[0]
+
+def count_techs(tech_strs):
+    """Nombre de technologies distinctes de chaque offre (chaînes séparées par des virgules)"""
+    tech_strs = pd.Series(tech_strs).reset_index(drop=True)
+    exploded = tech_strs.fillna('').astype(str).str.split(',').explode().str.strip()
+    exploded = exploded[exploded != '']
+    pairs = pd.DataFrame({'row': exploded.index, 'tech': exploded.to_numpy()}).drop_duplicates()
+    return np.bincount(pairs['row'].to_numpy(dtype=np.int64), minlength=len(tech_strs))
+
+def apply_frame_schema(df, schema=FRAME_SCHEMA):
+    """Applique le contrat de types aux colonnes présentes (catégories triées, numériques réduits)"""
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        dtype = schema.get(col)
+        if dtype == 'category':
+            if not isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype('category')
+            # Catégories triées : les index de filtre et de tri du dashboard reposent sur cet ordre
+            values = values.cat.remove_unused_categories()
+            values = values.cat.reorder_categories(sorted(values.cat.categories))
+        elif dtype is not None:
+            values = values.astype(dtype)
+        columns[col] = values
+    return pd.DataFrame(columns, index=df.index)
+
+def prepare_frame(df, schema=FRAME_SCHEMA):
+    """Colonnes dérivées (calculées une seule fois) puis contrat de types ; retourne un nouveau DataFrame"""
+    df = df.reset_index(drop=True)
+    if 'tech_stack_str' in df.columns and 'tech_count' not in df.columns:
+        df = df.assign(tech_count=count_techs(df['tech_stack_str']))
+    return apply_frame_schema(df, schema)
+
+def frame_memory_report(df):
+    """Empreinte mémoire (octets, chaînes comprises) et type de chaque colonne"""
+    usage = df.memory_usage(index=True, deep=True)
+    return pd.DataFrame({
+        'dtype': [str(df[col].dtype) if col in df.columns else 'index' for col in usage.index],
+        'bytes': usage.to_numpy()
+    }, index=usage.index).sort_values('bytes', ascending=False)
+
+class DescriptionStore:
+    """Descriptions des offres indexées par position (identifiant de ligne du DataFrame analytique)
+
+    Tant que le fichier est ouvert, un verrou partagé le protège : une version
+    ouverte par une session (de n'importe quel processus) n'est pas supprimée.
+    close() libère le fichier ; il est rouvert à la lecture suivante.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock_file = None
+        self.source = None
+        self.reader = None
+        self._open()
+        self.batch_rows = int(self.reader.schema.metadata[b'batch_rows'])
+        self.n_rows = int(self.reader.schema.metadata[b'n_rows'])
+
+    def _open(self):
+        """Ouvre le fichier (verrou partagé puis mappage en mémoire) s'il est fermé"""
+        if self.reader is not None:
+            return
+        self.lock_file = open(self.path, 'rb')
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.lock_file, fcntl.LOCK_SH)
+            self.source = pa.memory_map(self.path)
+            self.reader = pa.ipc.open_file(self.source)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        """Libère le verrou (le fichier redevient supprimable) et le mappage
+
+        Le mappage n'est pas fermé explicitement : une lecture en cours (index
+        de recherche en construction) le garde jusqu'à sa fin.
+        """
+        self.reader = None
+        self.source = None
+        if self.lock_file is not None:
+            self.lock_file.close()  # Libère aussi le verrou partagé
+            self.lock_file = None
+
+    @staticmethod
+    def write(chunks, path, n_rows, batch_rows=DESCRIPTION_BATCH_ROWS):
+        """Écrit les descriptions (tableaux Arrow, dans l'ordre des lignes) en lots compressés de `batch_rows`"""
+        schema = pa.schema([('job_description', pa.string())]).with_metadata({
+            'batch_rows': str(batch_rows), 'n_rows': str(n_rows)
+        })
+        options = pa.ipc.IpcWriteOptions(compression='zstd')
+        with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, schema, options=options) as writer:
+            pending = pa.array([], type=pa.string())
+            for chunk in chunks:
+                pending = pa.concat_arrays([pending, chunk.cast(pa.string())])
+                while len(pending) >= batch_rows:
+                    writer.write_batch(pa.record_batch([pending.slice(0, batch_rows)], schema=schema))
+                    pending = pending.slice(batch_rows)
+            if len(pending):
+                writer.write_batch(pa.record_batch([pending], schema=schema))
+
+    def get(self, positions):
+        """Descriptions des lignes `positions` (None si absente), en ne lisant que leurs lots"""
+        self._open()
+        positions = np.asarray(positions, dtype=np.int64)
+        result = np.empty(len(positions), dtype=object)
+        batch_ids = positions // self.batch_rows
+        for batch_id in np.unique(batch_ids):
+            selected = batch_ids == batch_id
+            batch = self.reader.get_batch(int(batch_id)).column(0)
+            result[selected] = batch.take(pa.array(positions[selected] - batch_id * self.batch_rows)).to_pylist()
+        return result.tolist()
+
+    def iter_batches(self):
+        """Toutes les descriptions, dans l'ordre des lignes : un tableau Arrow par lot"""
+        self._open()
+        reader = self.reader
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i).column(0)
+
+    def iter_descriptions(self):
+        """Toutes les descriptions, dans l'ordre des lignes, lot par lot"""
+        for batch in self.iter_batches():
+            yield from batch.to_pylist()
+
+def description_store_path(dataset_version, dataset_dir=DATASET_DIR):
+    """Chemin du fichier de descriptions d'une version du stockage"""
+    return os.path.join(dataset_dir, DESCRIPTION_STORE_DIRNAME, f"{dataset_version}.arrow")
+
+def _remove_unreferenced(path):
+    """Supprime un fichier de descriptions si aucun DescriptionStore ne l'a ouvert ; retourne True si supprimé"""
+    try:
+        if fcntl is None:
+            os.remove(path)  # Échoue (PermissionError) tant qu'un processus le garde mappé
+            return True
+        with open(path, 'rb') as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+            os.remove(path)
+        return True
+    except (FileNotFoundError, PermissionError):
+        return False
+
+def _prune_description_stores(dataset_dir=DATASET_DIR):
+    """Au-delà des DESCRIPTION_STORE_KEEP versions récentes, supprime celles qu'aucune session n'a ouvertes"""
+    versions = []
+    for entry in os.scandir(os.path.join(dataset_dir, DESCRIPTION_STORE_DIRNAME)):
+        try:
+            if entry.name.endswith('.arrow'):
+                versions.append((entry.stat().st_mtime, entry.path))
+        except FileNotFoundError:  # Supprimée entre-temps par un autre processus
+            continue
+    for _, old_path in sorted(versions, reverse=True)[DESCRIPTION_STORE_KEEP:]:
+        _remove_unreferenced(old_path)
+
+def write_description_store(dataset_dir=DATASET_DIR):
+    """Écrit le fichier de descriptions de la version courante du stockage s'il n'existe pas encore
+
+    Les descriptions sont lues partition par partition, dans l'ordre de
+    lecture du stockage (voir read_dataset_with_version) : la position d'une
+    ligne est son identifiant dans les deux. Appelée après chaque écriture du
+    stockage, une seule fois par version. Retourne la version, ou None si le
+    stockage est vide ou a été modifié pendant la lecture.
+    """
+    partitions = _dataset_partitions(dataset_dir) if os.path.isdir(dataset_dir) else []
+    if not partitions:
+        return None
+    version = _partitions_version(partitions)
+    path = description_store_path(version, dataset_dir)
+    if os.path.exists(path):
+        return version  # Le fichier d'une version n'est jamais réécrit (il peut être ouvert)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        n_rows = sum(pq.read_metadata(part_path).num_rows for _, part_path, _, _ in partitions)
+        chunks = (
+            chunk
+            for _, part_path, _, _ in partitions
+            for chunk in pq.read_table(part_path, columns=['job_description']).column(0).chunks
+        )
+        DescriptionStore.write(chunks, tmp_path, n_rows)
+        if _dataset_partitions(dataset_dir) != partitions:
+            return None
+        if not os.path.exists(path):
+            os.replace(tmp_path, path)
+    except FileNotFoundError:
+        return None  # Partition supprimée pendant la lecture (réécriture complète du stockage)
+    except PermissionError:
+        pass  # Windows : le fichier vient d'être écrit et ouvert par un autre processus
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    _prune_description_stores(dataset_dir)
+    return version
+
+def open_description_store(dataset_version, dataset_dir=DATASET_DIR):
+    """Ouvre le fichier de descriptions d'une version, en l'écrivant s'il manque (stockage antérieur)
+
+    Retourne None si `dataset_version` n'est plus la version courante du stockage.
+    """
+    path = description_store_path(dataset_version, dataset_dir)
+    for _ in range(2):
+        try:
+            return DescriptionStore(path)
+        except FileNotFoundError:
+            if write_description_store(dataset_dir) != dataset_version:
+                return None
+    return None
+
+def read_dataset_with_descriptions(columns, dataset_dir=DATASET_DIR, decode_dictionaries=True):
+    """Lit les colonnes demandées (sans `job_description`) et ouvre les descriptions de la même version
+
+    Retourne (DataFrame, version, DescriptionStore) ; (None, None, None) sans données.
+    Les positions du DataFrame servent d'identifiants dans le DescriptionStore.
+    """
+    columns = [col for col in columns if col != 'job_description']
+    for _ in range(DATASET_READ_ATTEMPTS):
+        df, version = read_dataset_with_version(columns, dataset_dir, decode_dictionaries)
+        if df is None:
+            return None, None, None
+        store = open_description_store(version, dataset_dir)
+        if store is not None:
+            return df.reset_index(drop=True), version, store
+    raise RuntimeError(f"Stockage {dataset_dir} modifié pendant chacune des {DATASET_READ_ATTEMPTS} lectures")
+
+def write_dataset(df, dataset_dir=DATASET_DIR):
+    """Remplace toutes les partitions du stockage Parquet par les offres du DataFrame
+
+    Écrit aussi le fichier de descriptions de la nouvelle version (write_description_store).
+    """
+    if os.path.isdir(dataset_dir):
+        for name in os.listdir(dataset_dir):
+            if name.startswith('scraped_at='):
+                shutil.rmtree(os.path.join(dataset_dir, name))
+    df = clean_jobs_frame(df)
+    if 'scraped_at' not in df.columns:
+        df['scraped_at'] = date.today().isoformat()
+    for scraped_at, partition in df.groupby('scraped_at'):
+        _write_partition(partition, scraped_at, dataset_dir)
+    write_description_store(dataset_dir)
+
+def merge_into_store(new_df, dataset_dir=DATASET_DIR):
+    """Fusionne les nouvelles offres dans le stockage Parquet au lieu de l'écraser
+
+    Les offres existantes sont remplacées par leur version la plus récente ;
+    seules les partitions concernées sont réécrites, puis le fichier de
+    descriptions de la nouvelle version (write_description_store). Une offre n'est comptée
+    « modifiée » que si elle figure dans `new_df` : en collecte incrémentale,
+    les offres déjà connues ne sont pas retéléchargées.
+    Retourne un dictionnaire de compteurs (nouvelles, modifiées, inchangées).
+    """
+    new_rows = clean_jobs_frame(new_df[[col for col in STORE_COLUMNS if col in new_df.columns]])
+    if 'scraped_at' not in new_rows.columns:
+        new_rows['scraped_at'] = date.today().isoformat()
+    
+    store = read_dataset(['job_url', 'content_hash', 'scraped_at'], dataset_dir)
+    if store is None:
+        store = pd.DataFrame(columns=['job_url', 'content_hash', 'scraped_at'])
+    
+    # Une URL collectée plusieurs fois n'est comptée qu'une fois (dernière version)
+    new_rows = new_rows.drop_duplicates(subset='job_url', keep='last')
+    previous_hashes = dict(zip(store['job_url'], store['content_hash']))
+    stats = {'new': 0, 'changed': 0, 'unchanged': 0}
+    for url, content_hash in zip(new_rows['job_url'], new_rows['content_hash']):
+        if url not in previous_hashes:
+            stats['new'] += 1
+        elif previous_hashes[url] != content_hash:
+            stats['changed'] += 1
+        else:
+            stats['unchanged'] += 1
+    
+    new_urls = set(new_rows['job_url'])
+    affected = set(store.loc[store['job_url'].isin(new_urls), 'scraped_at']) | set(new_rows['scraped_at'])
+    for scraped_at in sorted(affected):
+        partition = _read_partition(scraped_at, dataset_dir)
+        if partition is not None:
+            partition = partition[~partition['job_url'].isin(new_urls)]
+        partition = pd.concat(
+            [partition, new_rows[new_rows['scraped_at'] == scraped_at]],
+            ignore_index=True
+        )
+        _write_partition(partition, scraped_at, dataset_dir)
+    write_description_store(dataset_dir)
+    return stats
+
+def reenrich_dataset(dataset_dir=DATASET_DIR):
+    """Rejoue les règles d'extraction sur tout le stockage et le réécrit"""
+    df = read_dataset(None, dataset_dir)
+    if df is None:
+        return None
+    enriched = enrich_jobs_frame(df)
+    write_dataset(enriched, dataset_dir)
+    return len(enriched)
+
+def import_csv_to_dataset(csv_path=DATA_FILE, dataset_dir=DATASET_DIR):
+    """Importe un CSV d'offres dans le stockage Parquet (fusion par URL)
+
+    Les lignes sans date de collecte prennent la date de modification du CSV.
+    """
+    df = pd.read_csv(csv_path)
+    if 'scraped_at' not in df.columns:
+        df['scraped_at'] = None
+    csv_date = date.fromtimestamp(os.path.getmtime(csv_path)).isoformat()
+    df['scraped_at'] = df['scraped_at'].fillna(csv_date)
+    return merge_into_store(df, dataset_dir)
+
+def export_dataset_to_csv(csv_path=DATA_FILE, columns=None, dataset_dir=DATASET_DIR):
+    """Exporte le stockage Parquet au format CSV
+
+    Le CSV exporté est marqué comme déjà importé (voir sync_csv_into_dataset) :
+    il n'est pas réimporté au chargement suivant du dashboard.
+    """
+    df = read_dataset(columns, dataset_dir)
+    if df is None:
+        return None
+    df.to_csv(csv_path, index=False, encoding='utf-8')
+    _mark_csv_synced(csv_path, dataset_dir)
+    return csv_path
+
+# Export à la demande (bouton de téléchargement) : écrit par blocs, compressé à la volée
+EXPORT_FORMATS = {  # format -> (libellé, type MIME)
+    'csv.gz': ('CSV compressé (gzip)', 'application/gzip'),
+    'parquet': ('Parquet', 'application/vnd.apache.parquet'),
+}
+EXPORT_CHUNK_ROWS = 50_000
+EXPORT_GZIP_LEVEL = 6  # Compromis vitesse / taille (9, le défaut de gzip, est nettement plus lent)
+EXPORT_EXCLUDED_COLUMNS = ('job_description',)  # Colonnes exclues par défaut (volumineuses)
+
+def _export_schema(df):
+    """Schéma Arrow de l'export, déduit des types de toutes les colonnes de `df`
+
+    Une colonne sans type Arrow déductible (objets, vide ou entièrement
+    manquante) prend le type de DATASET_SCHEMA, ou chaîne à défaut.
+    """
+    schema = pa.Schema.from_pandas(df.head(0), preserve_index=False)
+    for i, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            known = DATASET_SCHEMA.field(field.name).type if field.name in DATASET_SCHEMA.names else pa.string()
+            if pa.types.is_dictionary(known):
+                known = known.value_type
+            schema = schema.set(i, field.with_type(known))
+    return schema
+
+def export_frame(df, fmt='csv.gz', columns=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Sérialise `df` au format `fmt` par blocs de `chunk_rows` lignes ; retourne les octets
+
+    Le découpage borne la mémoire de la sérialisation (le CSV complet n'est
+    jamais construit en une seule chaîne), pas celle du résultat : le fichier
+    compressé est retourné en entier, et Streamlit le garde en mémoire pour
+    le servir.
+    """
+    if columns is not None:
+        df = df[list(columns)]
+    buffer = io.BytesIO()
+    if fmt == 'csv.gz':
+        with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=EXPORT_GZIP_LEVEL) as gz, io.TextIOWrapper(gz, encoding='utf-8', newline='') as text:
+            for start in range(0, max(len(df), 1), chunk_rows):
+                df.iloc[start:start + chunk_rows].to_csv(text, index=False, header=start == 0)
+    elif fmt == 'parquet':
+        # Schéma de tout le DataFrame, imposé à chaque bloc (un groupe de lignes par bloc)
+        schema = _export_schema(df)
+        with pq.ParquetWriter(buffer, schema, compression='zstd') as writer:
+            for start in range(0, max(len(df), 1), chunk_rows):
+                writer.write_table(pa.Table.from_pandas(
+                    df.iloc[start:start + chunk_rows], schema=schema, preserve_index=False
+                ))
+    else:
+        raise ValueError(f"Format d'export inconnu : {fmt}")
+    return buffer.getvalue()
+
+def _read_csv_marker(dataset_dir=DATASET_DIR):
+    """Dates de modification des CSV déjà synchronisés avec le stockage ({chemin absolu: mtime})"""
+    try:
+        with open(os.path.join(dataset_dir, '_csv_import.json'), encoding='utf-8') as f:
+            return json.load(f).get('csv_mtimes', {})
+    except (OSError, ValueError):
+        return {}
+
+def _mark_csv_synced(csv_path, dataset_dir=DATASET_DIR):
+    """Enregistre la version courante du CSV comme synchronisée avec le stockage"""
+    marker = _read_csv_marker(dataset_dir)
+    marker[os.path.abspath(csv_path)] = os.path.getmtime(csv_path)
+    os.makedirs(dataset_dir, exist_ok=True)
+    _write_atomic(os.path.join(dataset_dir, '_csv_import.json'), json.dumps({'csv_mtimes': marker}))
+
+def _read_listing_state(dataset_dir=DATASET_DIR):
+    """Fin des résultats atteinte par la dernière collecte, par localisation ({localisation: bool})"""
+    try:
+        with open(os.path.join(dataset_dir, LISTING_STATE_FILE), encoding='utf-8') as f:
+            return json.load(f).get('complete', {})
+    except (OSError, ValueError):
+        return {}
+
+def read_listing_complete(location, dataset_dir=DATASET_DIR):
+    """Vrai si la dernière collecte pour `location` a parcouru les résultats jusqu'à la fin"""
+    return bool(_read_listing_state(dataset_dir).get(location))
+
+def mark_listing_complete(location, complete, dataset_dir=DATASET_DIR):
+    """Enregistre si la collecte pour `location` a atteint la fin des résultats"""
+    state = _read_listing_state(dataset_dir)
+    state[location] = bool(complete)
+    os.makedirs(dataset_dir, exist_ok=True)
+    _write_atomic(os.path.join(dataset_dir, LISTING_STATE_FILE), json.dumps({'complete': state}))
+
+def csv_needs_sync(csv_path=DATA_FILE, dataset_dir=DATASET_DIR):
+    """Vrai si le CSV existe et a été modifié depuis le dernier import ou export"""
+    if not os.path.exists(csv_path):
+        return False
+    return _read_csv_marker(dataset_dir).get(os.path.abspath(csv_path)) != os.path.getmtime(csv_path)
+
+def sync_csv_into_dataset(csv_path=DATA_FILE, dataset_dir=DATASET_DIR):
+    """Importe le CSV dans le stockage s'il a été modifié depuis le dernier import ou export
+
+    Permet de continuer à produire le CSV avec le notebook de la Partie 1.
+    Un CSV écrit par export_dataset_to_csv n'est pas réimporté.
+    """
+    if not csv_needs_sync(csv_path, dataset_dir):
+        return
+    import_csv_to_dataset(csv_path, dataset_dir)
+    _mark_csv_synced(csv_path, dataset_dir)
+
+def load_known_job_urls(dataset_dir=DATASET_DIR):
+    """Charge l'ensemble des URLs d'offres déjà présentes dans le stockage"""
+    known = read_dataset(['job_url'], dataset_dir)
+    if known is None:
+        return set()
+    return set(known['job_url'].dropna())
+
+def get_dataset_version(dataset_dir=DATASET_DIR):
+    """Empreinte de la version du stockage (partitions, tailles et dates de modification)
+
+    Sert de clé aux caches dérivés du stockage. Lecture seule : le CSV modifié
+    est importé au préalable (sync_csv_into_dataset), sous le verrou d'exécution.
+    """
+    if not os.path.isdir(dataset_dir):
+        return None
+    return _partitions_version(_dataset_partitions(dataset_dir))
+
+def process_scraped_data(jobs_list):
+    """Traite les données scrapées pour les rendre compatibles avec le dashboard"""
+    if not jobs_list:
+        return pd.DataFrame()
+    
+    df = pd.DataFrame(jobs_list)
+    
+    # Convertir tech_stack en string
+    df['tech_stack_str'] = df['tech_stack'].apply(lambda x: ', '.join(x) if isinstance(x, list) else '')
+    
+    # Empreinte du contenu et date de collecte (scraping incrémental)
+    df['content_hash'] = [compute_content_hash(job) for job in jobs_list]
+    df['scraped_at'] = date.today().isoformat()
+    
+    # Salaires typés, salaire moyen et valeurs par défaut
+    return clean_jobs_frame(df)
+
+def compute_content_hash(job_data):
+    """Calcule l'empreinte du contenu d'une offre (détecte les offres modifiées)"""
+    parts = [job_data.get(field) for field in ('job_title', 'company_name', 'location', 'job_description')]
+    content = '\x1f'.join('' if pd.isna(part) else str(part) for part in parts)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+# Orchestration : collecte -> extraction -> traitement -> stockage
+def scrape_jobs(max_pages=3, max_jobs=50, location="United%20States", incremental=True, on_progress=None):
+    """Collecte les URLs, extrait les offres et retourne (DataFrame traité, bilan)
+
+    La découverte des URLs et l'extraction se chevauchent : chaque offre est
+    extraite dès que sa page de résultats a été lue. En mode incrémental, les
+    URLs déjà présentes dans le stockage sont ignorées : une offre connue dont
+    le contenu a changé n'est détectée (`content_hash`) que par une collecte
+    complète (`incremental=False`) ou par reprocess_archive. La découverte ne
+    s'arrête sur les offres connues que si la collecte précédente a atteint la
+    fin des résultats : une collecte interrompue par `max_jobs` est reprise au
+    delà des pages déjà vues. Si le disjoncteur du
+    site s'ouvre (voir HostController), la collecte s'arrête et les offres
+    déjà extraites sont conservées (`aborted` dans le bilan).
+    Le bilan compte aussi les pages de résultats lues (`listing_pages`), les URLs
+    listées (`listed`), celles à extraire (`discovered`) et les échecs (`failed`).
+    `on_progress(done, total)` est appelé à chaque offre (total : URLs découvertes jusqu'ici).
+    """
+    known_urls = load_known_job_urls() if incremental else None
+    stop_on_known = read_listing_complete(location)
+    discovered = []
+    listing = {'pages': 0, 'failed_pages': 0, 'listed': 0, 'stopped': None}
+    
+    def discover():
+        urls = iter_job_urls_from_aijobs(
+            max_pages, location, max_jobs=max_jobs, known_urls=known_urls, stop_on_known=stop_on_known
+        )
+        while True:
+            try:
+                url = next(urls)
+            except StopIteration as stop:
+                listing.update(stop.value)  # Bilan retourné par le générateur
+                return
+            discovered.append(url)
+            yield url
+    
+    all_jobs = []
+    failed = 0
+    aborted = False
+    try:
+        for i, (job_url, job_data) in enumerate(fetch_job_details_concurrently(discover()), 1):
+            if job_data and job_data.get('job_title'):
+                all_jobs.append(job_data)
+            else:
+                failed += 1
+            if on_progress:
+                on_progress(i, len(discovered))
+    except CircuitOpenError as e:
+        aborted = True
+        log_event('scrape.aborted', logging.WARNING, error=str(e), jobs=len(all_jobs))
+    log_event('scrape.extracted', jobs=len(all_jobs), failed=failed)
+    # Fin des résultats atteinte : page vide, ou offres connues alors que la collecte précédente l'avait atteinte
+    complete = not aborted and not listing['failed_pages'] and (
+        listing['stopped'] == 'empty_page' or (listing['stopped'] == 'known_urls' and stop_on_known)
+    )
+    mark_listing_complete(location, complete)
+    report = {
+        'listing_pages': listing['pages'], 'listed': listing['listed'], 'discovered': len(discovered),
+        'failed': failed, 'aborted': aborted
+    }
+    return process_scraped_data(all_jobs), report
+
+def persist_jobs(df, incremental=True):
+    """Enregistre les offres dans le stockage Parquet (fusion ou remplacement complet)
+
+    Retourne les compteurs de merge_into_store (nouvelles, modifiées, inchangées).
+    """
+    if incremental:
+        return merge_into_store(df)
+    # Absorber d'abord le CSV pour qu'il ne soit pas réimporté ensuite
+    sync_csv_into_dataset()
+    write_dataset(df[[col for col in STORE_COLUMNS if col in df.columns]])
+    return {'new': len(df), 'changed': 0, 'unchanged': 0}
+
+# Ligne de commande (cron) : logs JSON sur stderr et codes de sortie
+EXIT_OK = 0
+EXIT_FAILURE = 1  # Erreur inattendue (2 : arguments invalides, via argparse)
+EXIT_NO_DATA = 3  # Aucune offre obtenue (site inaccessible, structure modifiée...)
+EXIT_LOCKED = 4  # Une autre exécution est déjà en cours
+EXIT_ABORTED = 5  # Collecte interrompue par le disjoncteur (offres déjà extraites enregistrées)
+PIPELINE_LOCK_FILE = 'data/pipeline.lock'  # Verrou du système : libéré même si le processus est tué
+SCRAPE_STALE_SECONDS = 6 * 3600  # Demande restée « running » (worker tué) abandonnée au-delà de ce délai
+
+logger = logging.getLogger('pipeline_marche_emploi')
+
+class JsonLogFormatter(logging.Formatter):
+    """Formate chaque événement en une ligne JSON (horodatage, niveau, événement, champs)"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'event': record.getMessage()
+        }
+        entry.update(getattr(record, 'fields', {}))
+        if record.exc_info:
+            entry['error'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+def log_event(event, level=logging.INFO, **fields):
+    """Émet un événement de log structuré"""
+    logger.log(level, event, extra={'fields': fields})
+
+_held_pipeline_locks = {}  # Chemin absolu -> fichier ouvert portant le verrou
+
+def acquire_pipeline_lock(lock_path=PIPELINE_LOCK_FILE):
+    """Pose le verrou d'exécution ; retourne False si une autre exécution le détient
+
+    Verrou exclusif du système sur le fichier (flock, ou msvcrt sous Windows),
+    gardé tant que le fichier reste ouvert : il est libéré par le système si le
+    processus meurt (SIGKILL, manque de mémoire), sans délai d'expiration.
+    Le fichier contient le PID du détenteur, pour information. Deux acquisitions
+    dans le même processus (sessions du dashboard) s'excluent aussi.
+    """
+    os.makedirs(os.path.dirname(lock_path) or '.', exist_ok=True)
+    f = open(lock_path, 'a+')
+    try:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:  # BlockingIOError (flock) ou PermissionError (msvcrt) : verrou déjà pris
+        f.close()
+        return False
+    f.seek(0)
+    f.truncate()
+    f.write(json.dumps({'pid': os.getpid(), 'started_at': time.time()}))
+    f.flush()
+    _held_pipeline_locks[os.path.abspath(lock_path)] = f
+    return True
+
+def release_pipeline_lock(lock_path=PIPELINE_LOCK_FILE):
+    """Libère le verrou d'exécution (le fichier est conservé : le supprimer dédoublerait le verrou)"""
+    f = _held_pipeline_locks.pop(os.path.abspath(lock_path), None)
+    if f is None:
+        return
+    f.seek(0)
+    f.truncate()
+    if fcntl is None:
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    f.close()  # Libère aussi le flock
+
+# File de scraping persistante (SQLite) : le dashboard y dépose des demandes,
+# un worker en arrière-plan les exécute et y publie la progression
+SCRAPE_QUEUE_DB = 'data/scrape_queue.sqlite'
+SCRAPE_WORKER_LOG = 'data/scrape_worker.log'
+SCRAPE_WORKER_POLL_SECONDS = 2.0  # Intervalle de consultation de la file quand elle est vide
+SCRAPE_WORKER_IDLE_TIMEOUT = 300  # Arrêt du worker lancé par le dashboard après 5 min sans demande
+SCRAPE_ACTIVE_STATUSES = ('queued', 'running')
+
+SCRAPE_QUEUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scrape_queue (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    status TEXT NOT NULL DEFAULT 'queued',
+    params TEXT NOT NULL,
+    progress_done INTEGER NOT NULL DEFAULT 0,
+    progress_total INTEGER,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    worker_pid INTEGER
+)
+"""
+
+def _queue_connect(db_path=SCRAPE_QUEUE_DB):
+    """Connexion à la file (mode WAL : lectures concurrentes pendant les écritures du worker)"""
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute(SCRAPE_QUEUE_SCHEMA)
+    return conn
+
+def _scrape_job_from_row(row):
+    """Demande de scraping sous forme de dict (paramètres et résultat décodés)"""
+    if row is None:
+        return None
+    job = dict(row)
+    job['params'] = json.loads(job['params'])
+    job['result'] = json.loads(job['result']) if job['result'] else None
+    return job
+
+def enqueue_scrape(max_pages, max_jobs, location, incremental=True, db_path=SCRAPE_QUEUE_DB):
+    """Ajoute une demande de scraping à la file ; retourne son identifiant"""
+    params = {'max_pages': max_pages, 'max_jobs': max_jobs, 'location': location, 'incremental': incremental}
+    conn = _queue_connect(db_path)
+    try:
+        cursor = conn.execute(
+            'INSERT INTO scrape_queue (params, created_at) VALUES (?, ?)', (json.dumps(params), time.time())
+        )
+        return cursor.lastrowid
+    finally:
+        conn.close()
+
+def get_scrape_job(job_id, db_path=SCRAPE_QUEUE_DB):
+    """État d'une demande de scraping (statut, progression, résultat), ou None"""
+    conn = _queue_connect(db_path)
+    try:
+        return _scrape_job_from_row(conn.execute('SELECT * FROM scrape_queue WHERE id = ?', (job_id,)).fetchone())
+    finally:
+        conn.close()
+
+def list_scrape_jobs(limit=10, db_path=SCRAPE_QUEUE_DB):
+    """Dernières demandes de scraping, de la plus récente à la plus ancienne"""
+    conn = _queue_connect(db_path)
+    try:
+        rows = conn.execute('SELECT * FROM scrape_queue ORDER BY id DESC LIMIT ?', (limit,)).fetchall()
+        return [_scrape_job_from_row(row) for row in rows]
+    finally:
+        conn.close()
+
+def claim_next_scrape(db_path=SCRAPE_QUEUE_DB):
+    """Réserve la plus ancienne demande en attente (atomique entre workers), ou None"""
+    conn = _queue_connect(db_path)
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        row = conn.execute("SELECT * FROM scrape_queue WHERE status = 'queued' ORDER BY id LIMIT 1").fetchone()
+        if row is not None:
+            conn.execute(
+                "UPDATE scrape_queue SET status = 'running', started_at = ?, worker_pid = ? WHERE id = ?",
+                (time.time(), os.getpid(), row['id'])
+            )
+        conn.execute('COMMIT')
+        return _scrape_job_from_row(row)
+    except sqlite3.Error:
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
+        raise
+    finally:
+        conn.close()
+
+def update_scrape_job(job_id, db_path=SCRAPE_QUEUE_DB, **fields):
+    """Met à jour les colonnes d'une demande (statut, progression, résultat...)"""
+    if 'result' in fields and fields['result'] is not None:
+        fields['result'] = json.dumps(fields['result'])
+    assignments = ', '.join(f"{column} = ?" for column in fields)
+    conn = _queue_connect(db_path)
+    try:
+        conn.execute(f"UPDATE scrape_queue SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+    finally:
+        conn.close()
+
+def fail_stale_scrapes(max_age=SCRAPE_STALE_SECONDS, db_path=SCRAPE_QUEUE_DB):
+    """Marque en échec les demandes restées « running » (worker tué) au-delà de `max_age` secondes"""
+    conn = _queue_connect(db_path)
+    try:
+        cursor = conn.execute(
+            "UPDATE scrape_queue SET status = 'failed', error = 'worker interrompu', finished_at = ? "
+            "WHERE status = 'running' AND started_at < ?",
+            (time.time(), time.time() - max_age)
+        )
+        return cursor.rowcount
+    finally:
+        conn.close()
+
+def process_scrape_job(job, db_path=SCRAPE_QUEUE_DB):
+    """Exécute une demande réservée : collecte, stockage, puis statut final dans la file"""
+    params = job['params']
+    
+    def on_progress(done, total):
+        update_scrape_job(job['id'], db_path, progress_done=done, progress_total=total)
+    
+    log_event('worker.job.start', job_id=job['id'], **params)
+    try:
+        df, report = scrape_jobs(
+            params['max_pages'], params['max_jobs'], params['location'], params['incremental'],
+            on_progress=on_progress
+        )
+        incremental = params['incremental'] or report['aborted']  # Résultat partiel : fusion
+        stats = persist_jobs(df, incremental) if not df.empty else {'new': 0, 'changed': 0, 'unchanged': 0}
+    except Exception as e:
+        logger.exception('worker.job.failed', extra={'fields': {'job_id': job['id']}})
+        update_scrape_job(job['id'], db_path, status='failed', error=repr(e), finished_at=time.time())
+        return False
+    result = {'scraped': len(df), 'aborted': report['aborted'], **stats}
+    update_scrape_job(job['id'], db_path, status='done', result=result, finished_at=time.time())
+    log_event('worker.job.done', job_id=job['id'], **result)
+    return True
+
+def run_worker_loop(poll_interval=SCRAPE_WORKER_POLL_SECONDS, idle_timeout=None, once=False, db_path=SCRAPE_QUEUE_DB):
+    """Traite les demandes de la file une à une ; retourne le nombre de demandes traitées
+
+    `once` vide la file puis s'arrête ; `idle_timeout` arrête le worker après
+    autant de secondes sans demande. Le verrou d'exécution est pris demande
+    par demande, pour ne pas bloquer les exécutions cron entre deux scrapings.
+    """
+    stale = fail_stale_scrapes(db_path=db_path)
+    if stale:
+        log_event('worker.stale', logging.WARNING, jobs=stale)
+    processed = 0
+    idle_since = time.monotonic()
+    while True:
+        job = claim_next_scrape(db_path)
+        if job is None:
+            if once or (idle_timeout is not None and time.monotonic() - idle_since > idle_timeout):
+                return processed
+            time.sleep(poll_interval)
+            continue
+        
+        if not acquire_pipeline_lock():
+            # Une exécution cron écrit dans le stockage : rendre la demande et réessayer
+            update_scrape_job(job['id'], db_path, status='queued', started_at=None, worker_pid=None)
+            log_event('worker.locked', logging.WARNING, job_id=job['id'], lock=PIPELINE_LOCK_FILE)
+            time.sleep(poll_interval)
+            continue
+        try:
+            process_scrape_job(job, db_path)
+        finally:
+            release_pipeline_lock()
+        processed += 1
+        idle_since = time.monotonic()
+
+def spawn_scrape_worker(idle_timeout=SCRAPE_WORKER_IDLE_TIMEOUT, log_file=SCRAPE_WORKER_LOG):
+    """Lance un worker dans un processus séparé (logs JSON ajoutés à `log_file`)"""
+    os.makedirs(os.path.dirname(log_file) or '.', exist_ok=True)
+    with open(log_file, 'a', encoding='utf-8') as log:
+        return subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), 'worker', '--idle-timeout', str(idle_timeout)],
+            stdin=subprocess.DEVNULL, stdout=log, stderr=log, cwd=os.getcwd()
+        )
+
+def run_scrape(args):
+    """Commande `scrape` : collecte, extraction, traitement et stockage"""
+    incremental = not args.full
+    df, report = scrape_jobs(args.max_pages, args.max_jobs, args.location, incremental)
+    if not df.empty:
+        # Collecte interrompue : fusion, pour ne pas remplacer le stockage par un résultat partiel
+        stats = persist_jobs(df, incremental or report['aborted'])
+        log_event('scrape.persisted', jobs=len(df), incremental=incremental, **stats)
+    if report['aborted']:
+        return EXIT_ABORTED
+    if not df.empty:
+        return EXIT_OK
+    if incremental and report['listed'] and not report['discovered']:
+        # Toutes les offres listées sont déjà dans le stockage : rien à faire
+        log_event('scrape.up_to_date', listed=report['listed'])
+        return EXIT_OK
+    log_event('scrape.empty', logging.WARNING, **report)
+    return EXIT_NO_DATA
+
+def run_reprocess(args):
+    """Commande `reprocess` : ré-extraction de l'archive HTML, sans réseau"""
+    df, failed = reprocess_archive(max_workers=args.workers)
+    if df.empty:
+        log_event('reprocess.empty', logging.WARNING, failed=failed)
+        return EXIT_NO_DATA
+    stats = merge_into_store(df)
+    log_event('reprocess.persisted', jobs=len(df), failed=failed, **stats)
+    return EXIT_OK
+
+def run_export_csv(args):
+    """Commande `export-csv` : régénère le CSV depuis le stockage Parquet"""
+    sync_csv_into_dataset()
+    path = export_dataset_to_csv(args.output)
+    if path is None:
+        log_event('export.empty', logging.WARNING)
+        return EXIT_NO_DATA
+    log_event('export.done', path=path)
+    return EXIT_OK
+
+def run_worker(args):
+    """Commande `worker` : exécute les demandes de la file de scraping"""
+    processed = run_worker_loop(args.poll_interval, args.idle_timeout, args.once)
+    log_event('worker.stopped', processed=processed)
+    return EXIT_OK
+
+def build_arg_parser():
+    """Analyseur des arguments de la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Pipeline de collecte des offres d'emploi (sans interface)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    scrape = subparsers.add_parser('scrape', help="Collecte, extrait et enregistre de nouvelles offres")
+    scrape.add_argument('--max-pages', type=int, default=3, help="Nombre de pages de résultats à parcourir")
+    scrape.add_argument('--max-jobs', type=int, default=50, help="Nombre maximum d'offres à extraire")
+    scrape.add_argument('--location', default="United%20States", help="Localisation (%%20 pour les espaces)")
+    scrape.add_argument('--full', action='store_true', help="Remplace le stockage au lieu de le compléter")
+    scrape.set_defaults(handler=run_scrape)
+    
+    reprocess = subparsers.add_parser('reprocess', help="Rejoue l'extraction sur l'archive HTML, sans réseau")
+    reprocess.add_argument('--workers', type=int, default=None, help="Nombre de processus (défaut : nombre de CPU)")
+    reprocess.set_defaults(handler=run_reprocess)
+    
+    export = subparsers.add_parser('export-csv', help="Exporte le stockage Parquet en CSV")
+    export.add_argument('--output', default=DATA_FILE, help="Chemin du fichier CSV")
+    export.set_defaults(handler=run_export_csv)
+    
+    worker = subparsers.add_parser('worker', help="Exécute les demandes de la file de scraping (SQLite)")
+    worker.add_argument('--poll-interval', type=float, default=SCRAPE_WORKER_POLL_SECONDS,
+                        help="Secondes entre deux consultations de la file vide")
+    worker.add_argument('--idle-timeout', type=float, default=None,
+                        help="Arrêt après autant de secondes sans demande (défaut : jamais)")
+    worker.add_argument('--once', action='store_true', help="Vide la file puis s'arrête")
+    # Le worker prend le verrou demande par demande, pas pour toute sa durée de vie
+    worker.set_defaults(handler=run_worker, global_lock=False)
+    return parser
+
+def main(argv=None):
+    """Point d'entrée de la ligne de commande ; retourne le code de sortie"""
+    args = build_arg_parser().parse_args(argv)
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JsonLogFormatter())
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    
+    global_lock = getattr(args, 'global_lock', True)
+    if global_lock and not acquire_pipeline_lock():
+        log_event('pipeline.locked', logging.WARNING, lock=PIPELINE_LOCK_FILE)
+        return EXIT_LOCKED
+    started = time.perf_counter()
+    log_event('pipeline.start', command=args.command)
+    try:
+        code = args.handler(args)
+    except Exception:
+        logger.exception('pipeline.failed', extra={'fields': {'command': args.command}})
+        code = EXIT_FAILURE
+    finally:
+        if global_lock:
+            release_pipeline_lock()
+    log_event('pipeline.end', command=args.command, exit_code=code,
+              duration_s=round(time.perf_counter() - started, 3))
+    return code
+
+if __name__ == "__main__":
+    sys.exit(main())
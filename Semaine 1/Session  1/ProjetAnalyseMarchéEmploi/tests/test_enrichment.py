@@ -0,0 +1,128 @@
+"""Parité des règles d'extraction : versions vectorisées (*_batch) et unitaires"""
+import json
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from generate_corpus import generate_jobs
+from pipeline_marche_emploi import (
+    TECH_ALIASES_FILE, detect_work_mode, detect_work_mode_batch, extract_experience_level,
+    extract_experience_level_batch, extract_salary_range, extract_salary_range_batch,
+    extract_tech_stack, extract_tech_stack_batch
+)
+
+with open(TECH_ALIASES_FILE, encoding='utf-8') as f:
+    TECH_ALIASES = json.load(f)
+
+MISSING_TEXTS = [None, '', np.nan, '   ']
+SALARY_TEXTS = [
+    'Salary: $120k-150k per year.',
+    'Salary: $120K - $150K.',
+    'Compensation: 120,000 - 150,000 USD.',
+    'We offer 45000 - 60000 EUR gross per year.',
+    '€50.000 - €70.000 brut annuel.',
+    'Pay range: 80 to 100 k plus equity.',
+    'Base salary of $95,000.',
+    'Salary: 130k.',
+    '$45/hour, full time.',
+    'Hourly rate: $30 - $45 per hour.',
+    'Join a team of 10 - 20 engineers.',
+    'No salary information.',
+]
+MODE_TEXTS = [
+    'This is a fully remote position.',
+    'Hybrid setup, 2-3 days in the office.',
+    'Remote-friendly but hybrid schedule, office in Paris.',
+    'Travail sur site, présentiel au bureau.',
+    'Work from home (wfh) or onsite.',
+    'Flexible hours.',
+]
+EXPERIENCE_TEXTS = [
+    'Junior developer, entry level, 0-2 years.',
+    'Mid-level engineer with 3-5 years of experience.',
+    'Senior engineer, 5+ years.',
+    'Lead / principal architect, 10+ years.',
+    'Staff engineer.',
+    'Profil expérimenté recherché.',
+    'Débutant accepté (debutant).',
+]
+TECH_TEXTS = [
+    *(f"We use {alias} every day." for aliases in TECH_ALIASES.values() for alias in aliases),
+    *(f"{alias.upper()}, {alias}/{alias} ({alias})." for aliases in TECH_ALIASES.values() for alias in aliases),
+    # Faux positifs attendus : alias inclus dans un mot plus long
+    'We are going to build an html page, not golang-free.',
+    'The mlops team uses html5, javascripts and mongoose.',
+    'Gitlab, reactive systems, rusty tools, javadoc, gopher.',
+    'c++/c# and node.js, k8s; postgres! ml? go.',
+]
+
+def corpus_texts():
+    """Descriptions représentatives (corpus synthétique) et cas limites"""
+    texts = generate_jobs(300, seed=7)['job_description'].tolist()
+    texts += MISSING_TEXTS + SALARY_TEXTS + MODE_TEXTS + EXPERIENCE_TEXTS + TECH_TEXTS
+    return pd.Series(texts, dtype=object)
+
+@pytest.fixture(scope='module')
+def texts():
+    return corpus_texts()
+
+def _same_salary(batch_value, scalar_value):
+    if scalar_value is None:
+        return math.isnan(batch_value)
+    return batch_value == scalar_value
+
+@pytest.mark.parametrize('batch, scalar', [
+    (detect_work_mode_batch, detect_work_mode),
+    (extract_experience_level_batch, extract_experience_level),
+    (extract_tech_stack_batch, extract_tech_stack),
+])
+def test_batch_matches_scalar(texts, batch, scalar):
+    result = batch(texts)
+    assert result.index.equals(texts.index)
+    mismatches = [
+        (text, batch_value, scalar(text))
+        for text, batch_value in zip(texts, result)
+        if batch_value != scalar(text)
+    ]
+    assert mismatches == []
+
+def test_salary_batch_matches_scalar(texts):
+    result = extract_salary_range_batch(texts)
+    assert result.index.equals(texts.index)
+    mismatches = []
+    for text, (batch_min, batch_max) in zip(texts, result[['salary_min', 'salary_max']].itertuples(index=False)):
+        scalar_min, scalar_max = extract_salary_range(text)
+        if not (_same_salary(batch_min, scalar_min) and _same_salary(batch_max, scalar_max)):
+            mismatches.append((text, (batch_min, batch_max), (scalar_min, scalar_max)))
+    assert mismatches == []
+
+@pytest.mark.parametrize('text', MISSING_TEXTS)
+def test_missing_texts(text):
+    assert detect_work_mode(text) == 'Non spécifié'
+    assert extract_experience_level(text) == 'Non spécifié'
+    assert extract_tech_stack(text) == []
+    assert extract_salary_range(text) == (None, None)
+
+@pytest.mark.parametrize('tech, alias', [
+    (tech, alias) for tech, aliases in TECH_ALIASES.items() for alias in aliases
+])
+def test_every_alias_is_detected(tech, alias):
+    text = f"Stack: {alias}."
+    assert extract_tech_stack(text) == [tech]
+    assert extract_tech_stack_batch(pd.Series([text])).iloc[0] == [tech]
+
+@pytest.mark.parametrize('text', ['We are going there.', 'Write html and css.', 'Our mlops platform.', 'Gitlab runners.'])
+def test_alias_word_boundaries(text):
+    assert extract_tech_stack(text) == []
+    assert extract_tech_stack_batch(pd.Series([text])).iloc[0] == []
+
+@pytest.mark.parametrize('text, expected', [
+    ('Salary: $120k-150k per year.', (120000, 150000)),
+    ('Pay range: 80 to 100 k plus equity.', (80000, 100000)),
+    ('We offer 45000 - 60000 EUR gross per year.', (45000, 60000)),
+])
+def test_salary_formats(text, expected):
+    assert extract_salary_range(text) == expected
+    assert tuple(extract_salary_range_batch(pd.Series([text])).iloc[0]) == expected
@@ -0,0 +1,66 @@
+"""Export à la demande : relecture des fichiers CSV gzip et Parquet écrits par blocs"""
+import gzip
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from pipeline_marche_emploi import export_frame, prepare_frame
+
+CHUNK_ROWS = 4  # Plusieurs blocs même sur un petit DataFrame
+
+def read_export(data, fmt):
+    if fmt == 'csv.gz':
+        return pd.read_csv(io.StringIO(gzip.decompress(data).decode('utf-8')))
+    return pq.read_table(io.BytesIO(data)).to_pandas()
+
+@pytest.fixture
+def jobs():
+    n = 10
+    return prepare_frame(pd.DataFrame({
+        'job_title': [f"Data Engineer {i}" for i in range(n)],
+        'company_name': ['Acme', 'Globex'] * (n // 2),
+        'work_mode': ['Remote', 'Hybrid', 'On-site', 'Remote', 'Hybrid'] * 2,
+        'avg_salary': [np.nan] * CHUNK_ROWS + [float(50_000 + 1000 * i) for i in range(n - CHUNK_ROWS)],
+        'tech_stack_str': ['Python, SQL', '', 'Java', 'Python', 'Go, Rust'] * 2,
+        'job_url': [f"https://example.com/job/{i}" for i in range(n)],
+    }))
+
+@pytest.mark.parametrize('fmt', ['csv.gz', 'parquet'])
+def test_round_trip(jobs, fmt):
+    result = read_export(export_frame(jobs, fmt, chunk_rows=CHUNK_ROWS), fmt)
+    assert list(result.columns) == list(jobs.columns)
+    assert len(result) == len(jobs)
+    assert result['job_url'].tolist() == jobs['job_url'].tolist()
+    assert result['company_name'].astype(str).tolist() == jobs['company_name'].astype(str).tolist()
+    np.testing.assert_allclose(result['avg_salary'].to_numpy(float), jobs['avg_salary'].to_numpy(float))
+    assert result['tech_count'].tolist() == jobs['tech_count'].tolist()
+
+@pytest.mark.parametrize('fmt', ['csv.gz', 'parquet'])
+def test_column_missing_in_first_chunk(jobs, fmt):
+    # Premier bloc entièrement vide (colonne objet, comme avec pandas 2) : le schéma
+    # Parquet ne doit pas en déduire le type null
+    descriptions = pd.Series(
+        [None] * CHUNK_ROWS + ['Build pipelines'] * (len(jobs) - CHUNK_ROWS), index=jobs.index, dtype=object
+    )
+    df = jobs.assign(job_description=descriptions)
+    assert df['job_description'].dtype == object
+    result = read_export(export_frame(df, fmt, chunk_rows=CHUNK_ROWS), fmt)
+    assert result['job_description'].isna().sum() == CHUNK_ROWS
+    assert result['job_description'].iloc[CHUNK_ROWS:].tolist() == ['Build pipelines'] * (len(jobs) - CHUNK_ROWS)
+
+@pytest.mark.parametrize('fmt', ['csv.gz', 'parquet'])
+def test_selected_columns(jobs, fmt):
+    result = read_export(export_frame(jobs, fmt, columns=['job_url', 'avg_salary'], chunk_rows=CHUNK_ROWS), fmt)
+    assert list(result.columns) == ['job_url', 'avg_salary']
+
+def test_empty_frame_keeps_columns(jobs):
+    result = read_export(export_frame(jobs.iloc[:0], 'parquet', chunk_rows=CHUNK_ROWS), 'parquet')
+    assert list(result.columns) == list(jobs.columns)
+    assert len(result) == 0
+
+def test_unknown_format(jobs):
+    with pytest.raises(ValueError):
+        export_frame(jobs, 'xlsx')
@@ -0,0 +1,105 @@
+"""Moteur de filtres et recherche du dashboard comparés à une référence pandas (masques booléens)"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from generate_corpus import generate_jobs
+from pipeline_marche_emploi import prepare_frame
+import Partie2_tableau_bord_marche_emploi as app
+
+@pytest.fixture(scope='module')
+def jobs():
+    df = generate_jobs(600, seed=11)
+    # Valeurs manquantes dans les colonnes filtrées
+    df.loc[df.index % 37 == 0, 'work_mode'] = None
+    df.loc[df.index % 41 == 0, 'location'] = None
+    return prepare_frame(df)
+
+@pytest.fixture(scope='module')
+def filter_index(jobs):
+    return app.build_filter_index(jobs)
+
+@pytest.fixture(scope='module')
+def tech_matrix(jobs):
+    return app.build_tech_matrix(jobs['tech_stack_str'])
+
+def reference_mask(df, equals=None, ranges=None):
+    """Filtres du dashboard exprimés en masques pandas (salaire manquant conservé)"""
+    mask = pd.Series(True, index=df.index)
+    for col, value in (equals or {}).items():
+        mask &= df[col].astype(object) == value
+    for col, (low, high) in (ranges or {}).items():
+        in_range = df[col].astype(float).between(low, high)
+        mask &= in_range | df[col].isna() if app.FILTER_NUMERIC_COLUMNS[col] else in_range
+    return mask.to_numpy()
+
+def reference_techs(df, selected_techs):
+    techs = df['tech_stack_str'].fillna('').map(lambda s: {t.strip() for t in s.split(',') if t.strip()})
+    return techs.map(lambda row: bool(row & set(selected_techs))).to_numpy()
+
+def reference_search(df, query):
+    texts = (df['job_title'].astype(str) + ' ' + df['company_name'].astype(str) + ' '
+             + df['job_description'].fillna('').astype(str)).str.lower()
+    words = texts.map(lambda text: set(app.SEARCH_TOKEN_RE.findall(text)))
+    terms = app.SEARCH_TOKEN_RE.findall(query.lower())
+    return words.map(lambda row: all(any(word.startswith(term) for word in row) for term in terms)).to_numpy()
+
+def salary_quantiles(jobs):
+    return tuple(float(q) for q in jobs['avg_salary'].quantile([0.25, 0.75]))
+
+FILTER_CASES = [
+    ({}, {}),
+    ({'work_mode': 'Remote'}, {}),
+    ({'work_mode': 'Remote', 'experience_level': 'Senior'}, {}),
+    ({'work_mode': 'Unknown value'}, {}),
+    ({}, {'tech_count': (2, 4)}),
+    ({}, {'tech_count': (0, 0)}),
+    ({'experience_level': 'Junior'}, {'tech_count': (1, 8)}),
+]
+
+@pytest.mark.parametrize('equals, ranges', FILTER_CASES)
+def test_filters_match_pandas(jobs, filter_index, equals, ranges):
+    positions = app.filter_positions(filter_index, equals, ranges)
+    assert positions.tolist() == np.flatnonzero(reference_mask(jobs, equals, ranges)).tolist()
+
+def test_salary_range_keeps_missing_salaries(jobs, filter_index):
+    low, high = salary_quantiles(jobs)
+    ranges = {'avg_salary': (low, high)}
+    positions = app.filter_positions(filter_index, {'work_mode': 'Hybrid'}, ranges)
+    assert positions.tolist() == np.flatnonzero(reference_mask(jobs, {'work_mode': 'Hybrid'}, ranges)).tolist()
+    assert jobs['avg_salary'].iloc[positions].isna().any()
+
+def test_range_bounds_are_inclusive(jobs, filter_index):
+    value = float(jobs['avg_salary'].dropna().iloc[0])
+    positions = app.filter_positions(filter_index, ranges={'avg_salary': (value, value)})
+    assert (jobs['avg_salary'].iloc[positions].fillna(value) == value).all()
+    assert positions.tolist() == np.flatnonzero(reference_mask(jobs, ranges={'avg_salary': (value, value)})).tolist()
+
+@pytest.mark.parametrize('selected_techs', [['Python'], ['Python', 'AWS'], ['Not a tech']])
+def test_tech_mask_matches_pandas(jobs, tech_matrix, filter_index, selected_techs):
+    mask = app.jobs_with_any_tech(tech_matrix, selected_techs)
+    assert mask.tolist() == reference_techs(jobs, selected_techs).tolist()
+    positions = app.filter_positions(filter_index, {'work_mode': 'Remote'}, masks=[mask])
+    expected = reference_mask(jobs, {'work_mode': 'Remote'}) & reference_techs(jobs, selected_techs)
+    assert positions.tolist() == np.flatnonzero(expected).tolist()
+
+@pytest.mark.parametrize('query', ['engineer', 'Data Engin', 'senior eng', 'zzz-absent', '  '])
+def test_search_matches_pandas(jobs, query):
+    index = app.build_search_index(jobs)
+    positions = app.search_index_lookup(index, query)
+    assert positions.tolist() == np.flatnonzero(reference_search(jobs, query)).tolist()
+
+def test_all_filters_combined(jobs, filter_index, tech_matrix):
+    index = app.build_search_index(jobs)
+    low, high = salary_quantiles(jobs)
+    equals = {'experience_level': 'Mid-level'}
+    ranges = {'avg_salary': (low, high), 'tech_count': (1, 6)}
+    mask = app.jobs_with_any_tech(tech_matrix, ['Python', 'SQL'])
+    positions = app.filter_positions(
+        filter_index, equals, ranges, app.search_index_lookup(index, 'engineer'), [mask]
+    )
+    expected = (
+        reference_mask(jobs, equals, ranges) & reference_techs(jobs, ['Python', 'SQL'])
+        & reference_search(jobs, 'engineer')
+    )
+    assert positions.tolist() == np.flatnonzero(expected).tolist()
@@ -0,0 +1,64 @@
+"""Fusion incrémentale dans le stockage Parquet : compteurs nouvelles / modifiées / inchangées"""
+import pandas as pd
+import pytest
+
+from pipeline_marche_emploi import merge_into_store, read_dataset, read_dataset_with_descriptions
+
+def offer(n, description='Python and SQL.', scraped_at='2025-01-01'):
+    return {
+        'job_title': f"Data Engineer {n}", 'company_name': 'Acme', 'location': 'Paris',
+        'job_description': description, 'job_url': f"https://aijobs.ai/job/{n}", 'scraped_at': scraped_at,
+    }
+
+@pytest.fixture
+def dataset_dir(tmp_path):
+    path = str(tmp_path / 'dataset')
+    merge_into_store(pd.DataFrame([offer(1), offer(2), offer(3)]), path)
+    return path
+
+def stored(dataset_dir):
+    df = read_dataset(['job_url', 'job_description', 'scraped_at'], dataset_dir)
+    return df.sort_values('job_url').set_index('job_url')
+
+def test_first_merge_counts_everything_new(tmp_path):
+    path = str(tmp_path / 'dataset')
+    stats = merge_into_store(pd.DataFrame([offer(1), offer(2)]), path)
+    assert stats == {'new': 2, 'changed': 0, 'unchanged': 0}
+    assert len(stored(path)) == 2
+
+def test_new_changed_and_unchanged(dataset_dir):
+    new_df = pd.DataFrame([
+        offer(1),  # Identique
+        offer(2, description='Python, SQL and Spark.'),  # Contenu modifié
+        offer(4),  # Nouvelle
+    ])
+    assert merge_into_store(new_df, dataset_dir) == {'new': 1, 'changed': 1, 'unchanged': 1}
+    store = stored(dataset_dir)
+    assert len(store) == 4
+    assert store.loc['https://aijobs.ai/job/2', 'job_description'] == 'Python, SQL and Spark.'
+
+def test_known_offers_absent_from_new_rows_are_not_counted(dataset_dir):
+    # Collecte incrémentale : les offres déjà connues ne sont pas retéléchargées
+    assert merge_into_store(pd.DataFrame([offer(5)]), dataset_dir) == {'new': 1, 'changed': 0, 'unchanged': 0}
+    assert len(stored(dataset_dir)) == 4
+
+def test_duplicate_urls_counted_once(dataset_dir):
+    new_df = pd.DataFrame([offer(6, description='First.'), offer(6, description='Second.'), offer(1), offer(1)])
+    assert merge_into_store(new_df, dataset_dir) == {'new': 1, 'changed': 0, 'unchanged': 1}
+    assert stored(dataset_dir).loc['https://aijobs.ai/job/6', 'job_description'] == 'Second.'
+
+def test_offer_moves_to_its_latest_partition(dataset_dir):
+    new_df = pd.DataFrame([offer(3, description='Updated.', scraped_at='2025-02-01')])
+    assert merge_into_store(new_df, dataset_dir) == {'new': 0, 'changed': 1, 'unchanged': 0}
+    store = stored(dataset_dir)
+    assert len(store) == 3
+    assert store.loc['https://aijobs.ai/job/3', 'scraped_at'] == '2025-02-01'
+
+def test_description_file_follows_the_merge(dataset_dir):
+    merge_into_store(pd.DataFrame([offer(2, description='Changed.'), offer(7, scraped_at='2025-03-01')]), dataset_dir)
+    df, _, descriptions = read_dataset_with_descriptions(['job_url'], dataset_dir)
+    try:
+        expected = stored(dataset_dir)['job_description']
+        assert descriptions.get(range(len(df))) == [expected[url] for url in df['job_url']]
+    finally:
+        descriptions.close()
@@ -0,0 +1,76 @@
+"""Cube OLAP du dashboard : effectifs et statistiques de salaire comparés à pandas / numpy"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from generate_corpus import generate_jobs
+from pipeline_marche_emploi import prepare_frame
+import Partie2_tableau_bord_marche_emploi as app
+
+@pytest.fixture(scope='module')
+def jobs():
+    return prepare_frame(generate_jobs(800, seed=21))
+
+def reference_stats(salaries):
+    """Statistiques de boîte à moustaches calculées sur les valeurs brutes (quantiles linéaires de numpy)"""
+    values = np.sort(salaries.dropna().to_numpy(dtype=float))
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    within = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    return {
+        'count': len(values), 'mean': values.mean(), 'sd': values.std(), 'q1': q1, 'median': median, 'q3': q3,
+        'lowerfence': within.min(), 'upperfence': within.max(),
+    }
+
+def assert_stats_equal(stats, expected):
+    assert int(stats['count']) == expected['count']
+    for key in ('mean', 'sd', 'q1', 'median', 'q3', 'lowerfence', 'upperfence'):
+        assert stats[key] == pytest.approx(expected[key], rel=1e-9), key
+
+def test_global_salary_stats(jobs):
+    stats = app.cube_salary_stats(app.build_olap_cube(jobs))
+    assert len(stats) == 1
+    assert_stats_equal(stats.iloc[0], reference_stats(jobs['avg_salary']))
+
+@pytest.mark.parametrize('dim', ['work_mode', 'experience_level'])
+def test_salary_stats_by_dimension(jobs, dim):
+    stats = app.cube_salary_stats(app.build_olap_cube(jobs), dim)
+    groups = {value: group['avg_salary'] for value, group in jobs.groupby(dim, observed=True)}
+    groups = {value: salaries for value, salaries in groups.items() if salaries.notna().any()}
+    assert set(stats.index) == set(groups)
+    for value, salaries in groups.items():
+        assert_stats_equal(stats.loc[value], reference_stats(salaries))
+
+@pytest.mark.parametrize('values', [[50_000.0], [40_000.0, 60_000.0], [1.0, 2.0, 2.0, 3.0, 100.0]])
+def test_quantiles_of_small_groups(values):
+    salaries = pd.Series(values, dtype='float32')
+    df = prepare_frame(pd.DataFrame({
+        'work_mode': 'Remote', 'experience_level': 'Senior', 'location': 'Paris', 'avg_salary': salaries,
+    }))
+    stats = app.cube_salary_stats(app.build_olap_cube(df)).iloc[0]
+    assert_stats_equal(stats, reference_stats(salaries))
+
+def test_no_salary_gives_empty_stats(jobs):
+    df = jobs.assign(avg_salary=np.nan)
+    assert app.cube_salary_stats(app.build_olap_cube(df)).empty
+
+@pytest.mark.parametrize('dim', app.CUBE_DIMENSIONS)
+def test_counts_match_value_counts(jobs, dim):
+    counts = app.cube_counts(app.build_olap_cube(jobs), dim)
+    expected = jobs[dim].value_counts()
+    expected = expected[expected > 0]
+    assert counts.to_dict() == expected.to_dict()
+    assert counts.is_monotonic_decreasing
+
+@pytest.mark.parametrize('equals', [{'work_mode': 'Remote'}, {'work_mode': 'Hybrid', 'experience_level': 'Senior'}])
+def test_rollup_matches_cube_of_filtered_rows(jobs, equals):
+    mask = np.ones(len(jobs), dtype=bool)
+    for col, value in equals.items():
+        mask &= (jobs[col] == value).to_numpy()
+    rolled = app.rollup_cube(app.build_olap_cube(jobs), equals)
+    direct = app.build_olap_cube(jobs[mask])
+    assert app.cube_counts(rolled, 'location').to_dict() == app.cube_counts(direct, 'location').to_dict()
+    pd.testing.assert_frame_equal(
+        app.cube_salary_stats(rolled, 'experience_level').sort_index(),
+        app.cube_salary_stats(direct, 'experience_level').sort_index()
+    )
@@ -0,0 +1,90 @@
+"""Parité des backends de parsing HTML (BeautifulSoup de référence et lxml)"""
+import pytest
+
+pytest.importorskip('bs4')
+pytest.importorskip('lxml')
+
+from generate_corpus import generate_jobs, render_job_page, render_listing_page
+from pipeline_marche_emploi import compare_parser_backends, extract_job_details_from_aijobs, parse_job_listing
+
+JOB_URL = 'https://aijobs.ai/job/test-offer'
+
+EDGE_JOB_PAGES = [
+    # Sans bloc salaire ni conteneur de description : la description vient de <body>
+    '<html><body><div class="post-main-title2">Data Engineer</div>'
+    '<span>at</span><span>Acme</span><p>Remote role, Python and SQL.</p></body></html>',
+    # Bloc salaire isolé, hors de la description
+    '<html><body><div class="post-main-title2">ML Engineer</div>'
+    '<div class="job-description-container"><p>Senior role with PyTorch.</p></div>'
+    '<div>Salary: $120k - $150k</div></body></html>',
+    # Balises imbriquées dans le titre, l'entreprise et le lieu
+    '<html><body><div class="post-main-title2"><b>Senior</b> <i>Data</i> Scientist</div>'
+    '<a href="/company/acme"><span class="tw-card-title"><em>Acme</em> Labs</span></a>'
+    '<div class="remote"><p class="tw-mb-0"><span>Paris</span>, <span>France</span></p></div>'
+    '<div class="job-description-container"><ul><li>Python <b>and</b> Spark</li>'
+    '<li>Hybrid, <a href="#">2 days</a> on site</li></ul>'
+    '<script>var salary = "$1k";</script></div></body></html>',
+    # Entités HTML et caractères non ASCII
+    '<html><body><div class="post-main-title2">R&amp;D Engineer &ndash; C++ &amp; CUDA</div>'
+    '<span>at</span><span>Caf&eacute; &lt;Labs&gt;</span>'
+    '<div class="remote"><p class="tw-mb-0">Z&uuml;rich</p></div>'
+    '<div class="job-description-container"><p>Salaire : 60&nbsp;000 - 80&nbsp;000 &euro;</p>'
+    '<p>Travail en pr&eacute;sentiel, &laquo;&nbsp;junior&nbsp;&raquo; accept&eacute;.</p></div>'
+    '</body></html>',
+    # Classes proches (préfixe) qui ne doivent pas correspondre
+    '<html><body><div class="post-main-title2-extra">Not a title</div>'
+    '<div class="post-main-title2 tw-bold">Backend Engineer</div>'
+    '<div class="remote-hint"><p class="tw-mb-0">Nowhere</p></div></body></html>',
+    # Documents vides ou sans <body>
+    '',
+    '<div class="job-description-container">Fragment only</div>',
+]
+
+EDGE_LISTING_PAGES = [
+    render_listing_page([]),
+    '<html><body><div class="tw-grid"></div></body></html>',
+    # Cartes sans href, classe voisine et liens imbriqués
+    '<html><body><a class="jobcardStyle1">No link</a>'
+    '<a class="jobcardStyle10" href="/job/ignored">Other</a>'
+    '<a class="tw-block jobcardStyle1" href="/job/a&amp;b"><div><span>Offre</span></div></a>'
+    '<a class="jobcardStyle1" href="https://aijobs.ai/job/c">C</a></body></html>',
+]
+
+@pytest.fixture(scope='module')
+def corpus():
+    return generate_jobs(100, seed=3)
+
+@pytest.fixture(scope='module')
+def job_pages(corpus):
+    return [render_job_page(job) for job in corpus.to_dict('records')] + EDGE_JOB_PAGES
+
+@pytest.fixture(scope='module')
+def listing_pages(corpus):
+    urls = corpus['job_url'].tolist()
+    return [render_listing_page(urls[start:start + 20]) for start in range(0, len(urls), 20)] + EDGE_LISTING_PAGES
+
+def test_job_pages_parity(job_pages):
+    assert compare_parser_backends(job_pages) == []
+
+def test_listing_pages_parity(listing_pages):
+    assert compare_parser_backends(listing_pages) == []
+
+def test_listing_urls(corpus):
+    urls = corpus['job_url'].tolist()[:20]
+    for backend in ('bs4', 'lxml'):
+        assert parse_job_listing(render_listing_page(urls), backend=backend) == urls
+        assert parse_job_listing(render_listing_page([]), backend=backend) == []
+
+def test_extracted_records_parity(job_pages):
+    for html in job_pages:
+        reference = extract_job_details_from_aijobs(JOB_URL, html=html, backend='bs4')
+        assert extract_job_details_from_aijobs(JOB_URL, html=html, backend='lxml') == reference
+
+def test_extracted_record_fields(corpus):
+    job = corpus.iloc[0]
+    for backend in ('bs4', 'lxml'):
+        record = extract_job_details_from_aijobs(JOB_URL, html=render_job_page(job), backend=backend)
+        assert record['job_title'] == job['job_title']
+        assert record['company_name'] == job['company_name']
+        assert record['location'] == job['location']
+        assert record['job_url'] == JOB_URL
@@ -0,0 +1,53 @@
+"""Verrou d'exécution du pipeline : exclusion et libération à la mort du détenteur"""
+import json
+import os
+import signal
+import subprocess
+import sys
+
+import pytest
+
+from pipeline_marche_emploi import acquire_pipeline_lock, release_pipeline_lock
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def lock_path(tmp_path):
+    path = str(tmp_path / 'pipeline.lock')
+    yield path
+    release_pipeline_lock(path)
+
+def hold_lock_in_subprocess(lock_path):
+    """Lance un processus qui prend le verrou puis attend ; retourne le processus une fois le verrou pris"""
+    code = (
+        "import sys, time; from pipeline_marche_emploi import acquire_pipeline_lock; "
+        f"print(acquire_pipeline_lock({lock_path!r}), flush=True); time.sleep(60)"
+    )
+    process = subprocess.Popen([sys.executable, '-c', code], cwd=PROJECT_DIR, stdout=subprocess.PIPE, text=True)
+    assert process.stdout.readline().strip() == 'True'
+    return process
+
+def test_lock_is_exclusive_within_a_process(lock_path):
+    assert acquire_pipeline_lock(lock_path)
+    assert not acquire_pipeline_lock(lock_path)
+    with open(lock_path, encoding='utf-8') as f:
+        assert json.load(f)['pid'] == os.getpid()
+    release_pipeline_lock(lock_path)
+    assert acquire_pipeline_lock(lock_path)
+
+def test_lock_held_by_another_process(lock_path):
+    process = hold_lock_in_subprocess(lock_path)
+    try:
+        assert not acquire_pipeline_lock(lock_path)
+    finally:
+        process.terminate()
+        process.wait()
+    assert acquire_pipeline_lock(lock_path)
+
+@pytest.mark.skipif(not hasattr(signal, 'SIGKILL'), reason="SIGKILL indisponible")
+def test_lock_released_when_holder_is_killed(lock_path):
+    process = hold_lock_in_subprocess(lock_path)
+    process.send_signal(signal.SIGKILL)
+    process.wait()
+    assert os.path.exists(lock_path)  # Le fichier reste, mais le verrou est libéré par le système
+    assert acquire_pipeline_lock(lock_path)
@@ -0,0 +1,158 @@
+"""Nouvelles tentatives et disjoncteur de request_with_retries (session HTTP et horloge simulées)"""
+import time
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+import pipeline_marche_emploi as pipeline
+from pipeline_marche_emploi import CircuitOpenError, HostController, request_with_retries
+
+URL = 'https://aijobs.ai/job/1'
+
+class FakeClock:
+    """Horloge simulée : sleep() avance monotonic() sans attendre"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    perf_counter = monotonic
+
+    def time(self):
+        return time.time()
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += max(0.0, seconds)
+
+class FakeSession:
+    """Session qui rejoue une liste de réponses (statut, en-têtes) ou d'exceptions"""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = 0
+
+    def get(self, url, headers=None, timeout=None):
+        self.calls += 1
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        status, reply_headers = reply if isinstance(reply, tuple) else (reply, {})
+        return SimpleNamespace(status_code=status, headers=reply_headers)
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(pipeline, 'time', clock)
+    return clock
+
+@pytest.fixture
+def controller(monkeypatch, clock):
+    controller = HostController('aijobs.ai')
+    monkeypatch.setattr(controller.bucket, 'acquire', lambda: None)  # Débit hors sujet ici
+    monkeypatch.setattr(pipeline, 'get_host_controller', lambda url: controller)
+    return controller
+
+@pytest.fixture
+def serve(monkeypatch):
+    def serve(*replies):
+        session = FakeSession(replies)
+        monkeypatch.setattr(pipeline, 'get_http_session', lambda: session)
+        return session
+    return serve
+
+def test_parse_retry_after():
+    assert pipeline.parse_retry_after('12') == 12.0
+    assert pipeline.parse_retry_after('-3') == 0.0
+    assert pipeline.parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0  # Date passée
+    assert pipeline.parse_retry_after('soon') is None
+    assert pipeline.parse_retry_after(None) is None
+
+@pytest.mark.parametrize('attempt', [0, 3, 10])
+def test_retry_after_is_never_shortened(attempt):
+    for _ in range(50):
+        delay = pipeline.retry_delay(attempt, retry_after=45.0)
+        assert delay >= 45.0
+        assert delay <= max(45.0, pipeline.RETRY_BACKOFF_MAX)
+
+def test_retry_after_is_honoured(controller, clock, serve):
+    session = serve((429, {'Retry-After': '30'}), 200)
+    started_at = clock.now
+    assert request_with_retries(URL).status_code == 200
+    assert session.calls == 2
+    assert clock.now - started_at >= 30.0
+    assert controller.failures == 0
+
+def test_retry_after_pauses_the_whole_host(controller, clock, serve):
+    serve((503, {'Retry-After': '20'}), 200)
+    started_at = clock.now
+    request_with_retries(URL)
+    assert controller.resume_at == pytest.approx(started_at + 20.0)
+    # Une autre requête vers l'hôte, partie pendant la pause, attend sa fin
+    clock.now = started_at + 5.0
+    controller.acquire()
+    assert clock.now == pytest.approx(started_at + 20.0)
+
+def test_long_retry_after_aborts_and_opens_the_circuit(controller, clock, serve):
+    session = serve((429, {'Retry-After': str(pipeline.RETRY_AFTER_MAX_SECONDS + 100)}))
+    with pytest.raises(CircuitOpenError):
+        request_with_retries(URL)
+    assert session.calls == 1
+    assert clock.sleeps == []  # Pas d'attente : la requête est abandonnée
+    assert controller.failures == 1
+    assert controller.cooldown == pipeline.RETRY_AFTER_MAX_SECONDS + 100
+    with pytest.raises(CircuitOpenError):
+        controller.acquire()
+
+def test_non_retryable_status_is_returned(controller, serve):
+    session = serve(404)
+    assert request_with_retries(URL).status_code == 404
+    assert session.calls == 1
+
+def test_exhausted_request_counts_one_breaker_failure(controller, serve):
+    session = serve(*[500] * (pipeline.FETCH_MAX_RETRIES + 1))
+    with pytest.raises(requests.HTTPError):
+        request_with_retries(URL)
+    assert session.calls == pipeline.FETCH_MAX_RETRIES + 1
+    assert controller.failures == 1  # Une requête abandonnée, pas une par tentative
+
+def test_network_errors_are_retried(controller, serve):
+    session = serve(requests.ConnectionError('reset'), requests.Timeout('slow'), 200)
+    assert request_with_retries(URL).status_code == 200
+    assert session.calls == 3
+
+def test_invalid_url_is_not_retried(controller, serve):
+    session = serve(requests.exceptions.MissingSchema('no scheme'))
+    with pytest.raises(requests.exceptions.MissingSchema):
+        request_with_retries(URL)
+    assert session.calls == 1
+    assert controller.failures == 0
+
+def test_breaker_opens_after_threshold_and_resets_on_success(controller, clock, serve, monkeypatch):
+    monkeypatch.setattr(pipeline, 'FETCH_MAX_RETRIES', 0)
+    for _ in range(pipeline.CIRCUIT_FAILURE_THRESHOLD - 1):
+        serve(502)
+        with pytest.raises(requests.HTTPError):
+            request_with_retries(URL)
+    serve(200)
+    request_with_retries(URL)
+    assert controller.failures == 0  # Un succès remet le compteur à zéro
+
+    for _ in range(pipeline.CIRCUIT_FAILURE_THRESHOLD):
+        serve(502)
+        with pytest.raises(requests.HTTPError):
+            request_with_retries(URL)
+    session = serve(200)
+    with pytest.raises(CircuitOpenError):
+        request_with_retries(URL)
+    assert session.calls == 0
+
+    # Après le délai, une requête d'essai réussie referme le disjoncteur
+    clock.sleep(pipeline.CIRCUIT_COOLDOWN_SECONDS)
+    assert request_with_retries(URL).status_code == 200
+    assert controller.opened_at is None
+    assert controller.failures == 0
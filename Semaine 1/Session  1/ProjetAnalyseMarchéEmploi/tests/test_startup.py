@@ -0,0 +1,22 @@
+"""Budget de démarrage : temps d'import à froid et modules différés (voir benchmarks/bench_startup.py)"""
+import os
+import statistics
+
+import pytest
+
+from bench_startup import DEFERRED_MODULES, STARTUP_BUDGETS_MS, measure_import
+
+STARTUP_RUNS = 3  # Interpréteurs lancés par module (médiane)
+# Machine d'intégration plus lente que la référence : STARTUP_BUDGET_SCALE=1.5 pytest
+BUDGET_SCALE = float(os.environ.get('STARTUP_BUDGET_SCALE', '1'))
+
+@pytest.mark.slow
+@pytest.mark.parametrize('module', sorted(STARTUP_BUDGETS_MS))
+def test_import_within_budget(module):
+    timings = []
+    for _ in range(STARTUP_RUNS):
+        elapsed_ms, _, loaded = measure_import(module, DEFERRED_MODULES[module])
+        assert loaded == [], f"{module} charge des modules différés : {', '.join(loaded)}"
+        timings.append(elapsed_ms)
+    budget_ms = STARTUP_BUDGETS_MS[module] * BUDGET_SCALE
+    assert statistics.median(timings) <= budget_ms